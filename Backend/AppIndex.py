@@ -0,0 +1,298 @@
+# Backend/AppIndex.py
+"""
+Persistent installed-application index
+--------------------------------------
+Maps normalized app names (and a few aliases) to executable paths so that
+"open X" is a dictionary lookup instead of an os.walk over Program Files.
+The index is built on a background thread, saved to Data/AppIndex.json and
+refreshed incrementally: only directories whose mtime changed are re-listed.
+A lookup miss never scans on the caller's thread; it schedules a background
+refresh (at most one per REFRESH_COOLDOWN seconds) for the next command.
+If the first build is still running after READY_TIMEOUT, find() falls back
+to a shallow search of the roots' top-level app folders instead of waiting.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INDEX_PATH = os.path.join(ROOT_DIR, "Data", "AppIndex.json")
+EXECUTABLE_EXTS = (".exe",)
+REFRESH_COOLDOWN = 30.0   # seconds between miss-triggered background refreshes
+READY_TIMEOUT = 3.0       # longest find() waits for the first build
+
+# Spoken name -> executable stem
+ALIASES = {
+    "word": "winword",
+    "powerpoint": "powerpnt",
+    "ppt": "powerpnt",
+    "edge": "msedge",
+    "microsoft edge": "msedge",
+    "google chrome": "chrome",
+    "vs code": "code",
+    "vscode": "code",
+    "visual studio code": "code",
+}
+
+def default_roots():
+    """Scan roots: AppIndexRoots (os.pathsep-separated) or the Windows install dirs."""
+    configured = os.environ.get("AppIndexRoots")
+    if configured:
+        return [p for p in configured.split(os.pathsep) if p]
+    roots = [
+        os.environ.get("ProgramFiles"),
+        os.environ.get("ProgramFiles(x86)"),
+        os.path.join(os.environ.get("LOCALAPPDATA", ""), "WhatsApp"),
+    ]
+    return [r for r in roots if r and os.path.isdir(r)]
+
+def normalize(name: str) -> str:
+    name = name.lower().strip()
+    for ext in EXECUTABLE_EXTS:
+        if name.endswith(ext):
+            name = name[: -len(ext)]
+    name = re.sub(r"[^a-z0-9+]+", " ", name)
+    return re.sub(r"\s+", " ", name).strip()
+
+# -------------------- Index --------------------
+
+class AppIndex:
+    def __init__(self, roots=None, path=INDEX_PATH, exts=EXECUTABLE_EXTS):
+        self.roots = [os.path.abspath(r) for r in (roots if roots is not None else default_roots())]
+        self.path = path
+        self.exts = tuple(e.lower() for e in exts)
+        self._dirs = {}    # dir -> {"mtime", "exes", "subdirs"}
+        self._names = {}   # normalized stem -> executable path
+        self._keys = []    # sorted stems for substring matching
+        self._ready = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._spawn_lock = threading.Lock()   # run_plan steps call find() concurrently
+        self._started = False
+        self._thread = None
+        self._last_refresh = 0.0
+
+    # ---------- Scanning ----------
+    def _list_dir(self, path, mtime):
+        exes, subdirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.name.lower().endswith(self.exts):
+                            exes.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return {"mtime": mtime, "exes": exes, "subdirs": subdirs}
+
+    def refresh(self):
+        """
+        Walk the tree, re-listing only directories whose mtime changed since
+        the last pass. A first run (empty index) lists everything.
+        Returns the number of directories that had to be re-listed.
+        """
+        with self._refresh_lock:
+            old = self._dirs
+            new = {}
+            relisted = 0
+            stack = list(self.roots)
+            while stack:
+                path = stack.pop()
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                entry = old.get(path)
+                if entry is None or entry["mtime"] != mtime:
+                    entry = self._list_dir(path, mtime)
+                    relisted += 1
+                    if entry is None:
+                        continue
+                new[path] = entry
+                stack.extend(os.path.join(path, d) for d in entry["subdirs"])
+            self._dirs = new
+            self._rebuild_names()
+            return relisted
+
+    def _rebuild_names(self):
+        names = {}
+        for path, entry in self._dirs.items():
+            for exe in entry["exes"]:
+                key = normalize(exe)
+                full = os.path.join(path, exe)
+                # Prefer the shallowest copy (e.g. chrome.exe over an updater copy)
+                if key not in names or len(full) < len(names[key]):
+                    names[key] = full
+        self._names = names
+        self._keys = sorted(names)
+
+    # ---------- Persistence ----------
+    def load(self) -> bool:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return False
+        if data.get("roots") != self.roots:
+            return False  # scan roots changed: start over
+        self._dirs = data.get("dirs", {})
+        self._rebuild_names()
+        return True
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"roots": self.roots, "dirs": self._dirs}, f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"⚠️ Could not save app index: {e}")
+
+    # ---------- Background build ----------
+    def start(self):
+        """Load the saved index (usable at once), then refresh it in the background."""
+        with self._spawn_lock:
+            if self._started:
+                return
+            self._started = True
+            if self.load():
+                self._ready.set()
+            self._spawn_refresh()
+
+    def refresh_async(self) -> bool:
+        """Refresh in the background unless one is running or ran within the cooldown."""
+        with self._spawn_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            if time.monotonic() - self._last_refresh < REFRESH_COOLDOWN:
+                return False
+            self._spawn_refresh()
+            return True
+
+    def _spawn_refresh(self):
+        # Caller holds _spawn_lock
+        self._last_refresh = time.monotonic()
+        self._thread = threading.Thread(target=self._build, name="app-index", daemon=True)
+        self._thread.start()
+
+    def _build(self):
+        try:
+            if self.refresh():
+                self.save()
+        except Exception as e:
+            print(f"⚠️ App index error: {e}")
+        finally:
+            self._ready.set()
+
+    def wait_ready(self, timeout=None) -> bool:
+        return self._ready.wait(timeout)
+
+    # ---------- Lookup ----------
+    def lookup(self, app_name: str):
+        """Exact name, then alias, then the shortest name containing the query."""
+        query = normalize(app_name)
+        if not query:
+            return None
+        names = self._names
+        for key in (query, ALIASES.get(query), query.replace(" ", "")):
+            if key and key in names:
+                return names[key]
+        matches = [k for k in self._keys if query in k]
+        if matches:
+            return names[min(matches, key=len)]
+        return None
+
+    def direct_lookup(self, app_name: str):
+        """Shallow search for before the index is ready: <root>/<exe> and <root>/<dir>/<exe>."""
+        query = normalize(app_name)
+        if not query:
+            return None
+        wanted = {k for k in (query, ALIASES.get(query), query.replace(" ", "")) if k}
+        for root in self.roots:
+            dirs = [root]
+            try:
+                with os.scandir(root) as it:
+                    dirs += [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            except OSError:
+                continue
+            for folder in dirs:
+                entry = self._list_dir(folder, 0)
+                for exe in (entry or {}).get("exes", ()):
+                    if normalize(exe) in wanted:
+                        return os.path.join(folder, exe)
+        return None
+
+    def find(self, app_name: str, wait=True):
+        """
+        Lookup with self-healing: a miss or a vanished path schedules a
+        background refresh (see refresh_async) and returns None right away,
+        so a newly installed app is found from the next command on.
+        """
+        self.start()
+        if wait and not self.wait_ready(READY_TIMEOUT):
+            return self.direct_lookup(app_name)  # first build still running
+        path = self.lookup(app_name)
+        if path and os.path.exists(path):
+            return path
+        self.refresh_async()
+        return None
+
+# -------------- CLI (synthetic benchmark) --------------
+if __name__ == "__main__":
+    import sys
+    import random
+    import tempfile
+
+    def _walk_lookup(roots, app_name):
+        """The old os.walk search, for comparison."""
+        for folder in roots:
+            for root, dirs, files in os.walk(folder):
+                for file in files:
+                    if app_name.lower() in file.lower() and file.endswith(".exe"):
+                        return os.path.join(root, file)
+        return None
+
+    n_apps = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "Program Files")
+        rnd = random.Random(7)
+        for i in range(n_apps):
+            app_dir = os.path.join(root, f"Vendor{i % 40}", f"App{i}")
+            for depth in range(rnd.randint(1, 4)):
+                sub = os.path.join(app_dir, *[f"lib{d}" for d in range(depth + 1)])
+                os.makedirs(sub, exist_ok=True)
+                for j in range(20):
+                    open(os.path.join(sub, f"data{j}.dll"), "w").close()
+            open(os.path.join(app_dir, f"app{i}.exe"), "w").close()
+        open(os.path.join(root, "Vendor0", "spotify.exe"), "w").close()
+
+        index = AppIndex(roots=[root], path=os.path.join(tmp, "index.json"))
+        t = time.perf_counter(); index.refresh(); index.save(); build = time.perf_counter() - t
+        t = time.perf_counter(); index.refresh(); warm = time.perf_counter() - t
+        os.makedirs(os.path.join(root, "Vendor3", "NewApp"))
+        open(os.path.join(root, "Vendor3", "NewApp", "newapp.exe"), "w").close()
+        t = time.perf_counter(); relisted = index.refresh(); incr = time.perf_counter() - t
+
+        queries = ["spotify", f"app{n_apps - 1}", "newapp", "missing"]
+        t = time.perf_counter()
+        for _ in range(1000):
+            for q in queries:
+                index.lookup(q)
+        lookup = (time.perf_counter() - t) / (1000 * len(queries))
+        t = time.perf_counter()
+        for q in queries:
+            _walk_lookup([root], q)
+        walk = (time.perf_counter() - t) / len(queries)
+
+        print(f"📁 {len(index._dirs)} dirs, {len(index._names)} executables")
+        print(f"⏱ Full build: {build * 1000:.1f} ms | no-change refresh: {warm * 1000:.1f} ms | "
+              f"refresh after install: {incr * 1000:.1f} ms ({relisted} dirs re-listed)")
+        print(f"⏱ Lookup: {lookup * 1e6:.1f} µs vs os.walk: {walk * 1000:.1f} ms per command")
+        print(f"🔎 newapp -> {index.lookup('newapp')}")
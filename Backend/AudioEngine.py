@@ -0,0 +1,384 @@
+# Backend/AudioEngine.py
+"""
+Single audio output engine
+--------------------------
+One thread owns pygame's music stream and plays a priority queue of items
+(alerts before acknowledgements before answers). Each item is a sequence of
+clips, e.g. sentences synthesized ahead by a ClipPrefetcher. Instead of
+polling get_busy(), the thread sleeps in pygame.event.wait() and is woken
+by the mixer's end-of-music event or by a wake event posted from other
+threads (enqueue, cancel, pause, a clip finishing synthesis).
+
+SDL expects the video subsystem (and so the event queue) to be initialized
+and pumped by one thread. The engine thread does both and nothing else in
+the app touches pygame.display or pygame.event, so on Windows and Linux
+that thread can own it. macOS only allows it on the main thread, so there
+the engine falls back to polling the mixer every FALLBACK_POLL seconds.
+
+Higher-priority items start at the next clip (sentence) boundary and the
+interrupted item carries on afterwards. pause()/resume() pause the stream
+at its current position; item.cancel() drops one item, cancel_all() all.
+"""
+
+import sys
+import time
+import heapq
+import atexit
+import itertools
+import threading
+from collections import deque
+from io import BytesIO
+
+import pygame
+
+try:
+    from Backend.SpeechPipeline import ClipPrefetcher
+except ImportError:  # run as a script from Backend/
+    from SpeechPipeline import ClipPrefetcher
+
+# ---------- Priorities (lower plays first) ----------
+ALERT = 0
+ACK = 1
+ANSWER = 2
+
+END_EVENT = pygame.USEREVENT + 1
+WAKE_EVENT = pygame.USEREVENT + 2
+AUDIO_FORMAT = "mp3"   # edge-tts output; the mixer's decoder hint for plain bytes
+FALLBACK_POLL = 0.05   # only used when pygame's event queue can't be started
+EVENTS_OFF_MAIN_THREAD = sys.platform != "darwin"   # Cocoa: video/events on the main thread only
+
+
+class _ClipList:
+    """ClipPrefetcher-compatible wrapper around ready-made clips."""
+
+    def __init__(self, clips):
+        self._clips = deque(clips)
+
+    def get(self, timeout=None):
+        if not self._clips:
+            raise StopIteration
+        return self._clips.popleft()
+
+    def close(self):
+        self._clips.clear()
+
+
+class PlaybackItem:
+    _ids = itertools.count(1)
+
+    def __init__(self, engine, clips, priority, label="", on_done=None):
+        self.id = next(self._ids)
+        self.engine = engine
+        self.clips = clips
+        self.priority = priority
+        self.label = label
+        self.state = "queued"   # queued | playing | done | cancelled
+        self.cancelled = False
+        self.timings = {"chunks": 0}
+        self.done = threading.Event()
+        self._on_done = on_done
+        self._created = time.perf_counter()
+
+    @property
+    def completed(self) -> bool:
+        return self.state == "done"
+
+    def cancel(self):
+        self.engine.cancel(self)
+
+    def wait(self, timeout=None) -> bool:
+        return self.done.wait(timeout)
+
+    def _finish(self, state):
+        if self.done.is_set():
+            return
+        self.state = state
+        self.timings["total"] = time.perf_counter() - self._created
+        self.clips.close()
+        self.done.set()
+        if self._on_done:
+            try:
+                self._on_done(self)
+            except Exception as e:
+                print(f"⚠️ Playback callback error: {e}")
+
+
+class AudioEngine:
+    def __init__(self, audio_format=AUDIO_FORMAT):
+        self.audio_format = audio_format
+        self._lock = threading.Lock()
+        self._heap = []                 # (priority, seq, item)
+        self._seq = itertools.count()
+        self._playing = None            # item whose clip is in the mixer
+        self._paused = False
+        self._closing = False
+        self._events = False            # pygame event queue available?
+        self._fallback_wake = threading.Event()
+        self._thread = None
+        self._started = threading.Event()
+        self.played = deque(maxlen=100)  # (item label, clip number) log
+
+    # ---------- Thread ----------
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return self
+            self._closing = False
+            self._thread = threading.Thread(target=self._run, name="audio-engine", daemon=True)
+            self._thread.start()
+        self._started.wait()
+        return self
+
+    def _init_audio(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        if not EVENTS_OFF_MAIN_THREAD:
+            self._events = False
+            return
+        try:
+            # The event queue needs the video subsystem (no window is opened)
+            if not pygame.display.get_init():
+                pygame.display.init()
+            pygame.event.set_allowed([END_EVENT, WAKE_EVENT])
+            pygame.mixer.music.set_endevent(END_EVENT)
+            self._events = True
+        except pygame.error as e:
+            print(f"⚠️ Audio events unavailable, polling instead: {e}")
+            self._events = False
+
+    def _wake(self):
+        if self._events:
+            try:
+                pygame.event.post(pygame.event.Event(WAKE_EVENT))
+                return
+            except pygame.error:
+                pass
+        self._fallback_wake.set()
+
+    def _wait(self):
+        """Block until the clip ends ("end") or something else happened ("wake")."""
+        if self._events:
+            event = pygame.event.wait()
+            if event.type == END_EVENT and not pygame.mixer.music.get_busy():
+                return "end"
+            return "wake"
+        woke = self._fallback_wake.wait(FALLBACK_POLL)
+        self._fallback_wake.clear()
+        if not woke and self._playing and not self._paused and not pygame.mixer.music.get_busy():
+            return "end"
+        return "wake"
+
+    def _run(self):
+        self._init_audio()
+        self._started.set()
+        while not self._closing:
+            item = self._next_item()
+            if item is None or self._paused:
+                self._wait()
+                continue
+            try:
+                audio = item.clips.get(timeout=0)
+            except StopIteration:
+                self._drop(item, "done")
+                continue
+            if audio is None:
+                self._wait()  # next sentence still synthesizing; on_ready wakes us
+                continue
+            self._play_clip(item, audio)
+
+    def _next_item(self):
+        with self._lock:
+            while self._heap and self._heap[0][2].done.is_set():
+                heapq.heappop(self._heap)
+            return self._heap[0][2] if self._heap else None
+
+    def _drop(self, item, state):
+        with self._lock:
+            self._heap = [entry for entry in self._heap if entry[2] is not item]
+            heapq.heapify(self._heap)
+        item._finish(state)
+
+    def _play_clip(self, item, audio):
+        buf = BytesIO(audio)
+        try:
+            # SynthesizedAudio carries its own format (the offline engine makes WAV)
+            pygame.mixer.music.load(buf, getattr(audio, "format", self.audio_format))
+            pygame.mixer.music.play()
+        except Exception as e:
+            print(f"⚠️ Audio play error: {e}")
+            return
+        if item.timings["chunks"] == 0:
+            item.timings["first_audio"] = time.perf_counter() - item._created
+        item.timings["chunks"] += 1
+        item.state = "playing"
+        self._playing = item
+        self.played.append((item.label, item.timings["chunks"]))
+        try:
+            while True:
+                if item.cancelled or self._closing:
+                    pygame.mixer.music.stop()
+                    if self._events:
+                        pygame.event.clear(END_EVENT)  # the stop's own end event
+                    break
+                if self._paused:
+                    pygame.mixer.music.pause()
+                    while self._paused and not item.cancelled and not self._closing:
+                        self._wait()
+                    if not item.cancelled:
+                        pygame.mixer.music.unpause()
+                    continue
+                if self._wait() == "end":
+                    break
+        finally:
+            self._playing = None
+            try:
+                pygame.mixer.music.unload()  # release the buffer
+            except Exception:
+                pass
+        if item.cancelled:
+            self._drop(item, "cancelled")
+        else:
+            item.state = "queued"  # back in line; a higher priority may go first
+
+    # ---------- Public API ----------
+    def enqueue(self, clips, priority=ANSWER, label="", on_done=None) -> PlaybackItem:
+        """Queue an item: a ClipPrefetcher or any iterable of ready audio clips."""
+        self.start()
+        if not hasattr(clips, "get"):
+            clips = _ClipList(clips)
+        item = PlaybackItem(self, clips, priority, label, on_done)
+        with self._lock:
+            heapq.heappush(self._heap, (priority, next(self._seq), item))
+        self._wake()
+        return item
+
+    def speak(self, source, synth, priority=ANSWER, label="", on_done=None, lookahead=None) -> PlaybackItem:
+        """Queue text (or streamed deltas); sentences are synthesized ahead of playback."""
+        holder = {}
+        should_stop = lambda: holder["item"].cancelled if "item" in holder else False
+        kwargs = {"lookahead": lookahead} if lookahead else {}
+        clips = ClipPrefetcher(source, synth, should_stop, on_ready=self._wake, **kwargs)
+        holder["item"] = item = self.enqueue(clips, priority, label, on_done)
+        return item
+
+    def cancel(self, item):
+        item.cancelled = True
+        if item is not self._playing:
+            self._drop(item, "cancelled")
+        self._wake()
+
+    def cancel_all(self, priority=None):
+        with self._lock:
+            items = [entry[2] for entry in self._heap]
+        for item in items:
+            if priority is None or item.priority == priority:
+                self.cancel(item)
+
+    def pause(self):
+        self._paused = True
+        self._wake()
+
+    def resume(self):
+        self._paused = False
+        self._wake()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def busy(self) -> bool:
+        return self._next_item() is not None
+
+    def shutdown(self):
+        self._closing = True
+        self.cancel_all()
+        self._wake()
+        if self._thread:
+            self._thread.join(2)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_audio_engine() -> AudioEngine:
+    """The one engine every TTS front-end plays through."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioEngine()
+            # The engine thread sits in pygame.event.wait(): wake and join it
+            # before the interpreter tears pygame down
+            atexit.register(_engine.shutdown)
+        return _engine
+
+# -------------- CLI (behaviour + idle CPU while playing) --------------
+def _wav(seconds, rate=22050):
+    import wave
+    buf = BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\0\0" * int(rate * seconds))
+    return buf.getvalue()
+
+def _cpu_while(run, seconds):
+    wall, cpu = time.perf_counter(), time.process_time()
+    run()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return cpu / wall * 100 if wall else 0.0
+
+if __name__ == "__main__":
+    import sys
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    engine = AudioEngine(audio_format="wav").start()
+
+    # Priority: an alert queued behind an answer plays at the next sentence boundary
+    answer = engine.enqueue([_wav(0.3)] * 3, ANSWER, "answer")
+    time.sleep(0.1)
+    alert = engine.enqueue([_wav(0.2)], ALERT, "alert")
+    answer.wait(5)
+    print(f"🔀 Play order: {[label for label, _ in engine.played]}")
+
+    # Pause keeps the position: a 1.0 s clip paused for 0.5 s ends after ~1.5 s
+    item = engine.enqueue([_wav(1.0)], ANSWER, "paused")
+    time.sleep(0.3); engine.pause(); time.sleep(0.5); engine.resume()
+    item.wait(5)
+    print(f"⏸ Paused clip finished after {item.timings['total']:.2f}s (1.0 s audio + 0.5 s pause)")
+
+    # Cancel one queued item, keep the other
+    keep = engine.enqueue([_wav(0.2)], ANSWER, "keep")
+    drop = engine.enqueue([_wav(0.2)], ANSWER, "drop")
+    drop.cancel()
+    keep.wait(5)
+    print(f"🛑 Cancelled: {drop.state}, other item: {keep.state}")
+
+    # Idle CPU while one long clip plays
+    clip = _wav(seconds)
+
+    def play_and(wait):
+        pygame.mixer.music.load(BytesIO(clip), "wav")
+        pygame.mixer.music.play()
+        wait()
+
+    def sleep_only():
+        # Baseline: the mixer's own cost, nobody watching for the end
+        time.sleep(seconds)
+
+    def poll(fps, new_clock):
+        # The previous playback threads: poll get_busy() at `fps`
+        clock = pygame.time.Clock()
+        while pygame.mixer.music.get_busy():
+            (pygame.time.Clock() if new_clock else clock).tick(fps)
+
+    base = _cpu_while(lambda: play_and(sleep_only), seconds)
+    results = [
+        ("poll 20 Hz, new Clock", _cpu_while(lambda: play_and(lambda: poll(20, True)), seconds)),
+        ("poll 100 Hz", _cpu_while(lambda: play_and(lambda: poll(100, False)), seconds)),
+        ("event-driven engine", _cpu_while(lambda: engine.enqueue([clip], ANSWER, "cpu").wait(), seconds)),
+    ]
+    print(f"⏱ CPU while playing {seconds:.0f}s of audio (mixer alone: {base:.2f}%):")
+    for label, cpu in results:
+        print(f"   {label:>22}: {cpu:.2f}% (+{max(0.0, cpu - base):.2f}% over the mixer)")
+    engine.shutdown()
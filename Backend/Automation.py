@@ -5,30 +5,54 @@ import os
 import pyautogui
 import time
 import requests
+import json
+import hashlib
 from io import BytesIO
-from pptx import Presentation
-from pptx.util import Inches
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from groq import Groq
 from PIL import Image
 import speech_recognition as sr
-import pyttsx3
 import re  # ✅ added for normalization
+import tempfile
+import threading
+from dotenv import dotenv_values
+from collections import OrderedDict
+
+try:
+    from Backend.AppIndex import AppIndex
+    from Backend.ProcessTable import ProcessTable
+    from Backend.ImageCache import get_image_cache
+    from Backend.SpeechToSpeech import TTS, ACK
+    from Backend.CpuPool import run_cpu, build_pdf, build_pptx, worth_offloading
+    from Backend.UiDriver import whatsapp_send, ReadinessTimeout
+except ImportError:  # run as a script from Backend/
+    from AppIndex import AppIndex
+    from ProcessTable import ProcessTable
+    from ImageCache import get_image_cache
+    from SpeechToSpeech import TTS, ACK
+    from CpuPool import run_cpu, build_pdf, build_pptx, worth_offloading
+    from UiDriver import whatsapp_send, ReadinessTimeout
 
 # ------------------ Groq client setup ------------------
 GROQ_API_KEY = ""
 client = Groq(api_key=GROQ_API_KEY)
 
-# ------------------ TTS Engine (Female Voice) ------------------
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
-# Usually female voice is at index 1
-engine.setProperty('voice', voices[1].id)
-engine.setProperty('rate', 160)  # optional: adjust speed
-engine.setProperty('volume', 1.0)
+env_vars = dotenv_values(".env")
+DebugTimings = (env_vars.get("DebugTimings") or os.environ.get("DebugTimings") or "false").lower() == "true"
+
+# ------------------ TTS (the one AudioEngine, acknowledgement priority) ------------------
+# Acks play ahead of answers at the next sentence boundary on the same device
+ACKNOWLEDGE = True  # speak "Okay, I will ..." while commands run
 
 def speak(text):
-    engine.say(text)
-    engine.runAndWait()
+    """Speak and wait until done."""
+    item = TTS(text, priority=ACK)
+    if item is not None:
+        item.wait()
+
+def acknowledge(text):
+    """Queue speech without waiting; returns the PlaybackItem (wait() blocks until spoken)."""
+    return TTS(text, priority=ACK)
 
 # ------------------ Voice Recognition ------------------
 recognizer = sr.Recognizer()
@@ -76,28 +100,171 @@ def fetch_image_url(query):
         return None
 
 # ------------------ PPT Creation ------------------
-def create_ppt(topic, slides_count=10):
+PPT_WORKERS = 5          # bound for concurrent LLM calls / image downloads
+PPT_IMAGE_TIMEOUT = 8    # seconds per image
+PPT_IMAGE_DEADLINE = 15  # seconds for all images together
+PPT_IMAGE_WIDTH_IN = 4   # display width of slide pictures (inches)
+PPT_IMAGE_DPI = 150      # pixels per displayed inch to keep
+PPT_JPEG_QUALITY = 80
+PPT_NORMALIZED_CACHE_BYTES = 32 * 1024 * 1024   # normalized slide images kept in memory (LRU)
+
+def write_slide_outline(topic, slides_count, write=write_content):
+    """
+    Ask for every slide in one LLM round-trip as a JSON outline.
+    Returns [{"title": str, "bullets": [str]}] or None if the reply isn't usable.
+    """
+    raw = write(
+        f"Create a {slides_count}-slide presentation on {topic}. "
+        f"Reply with JSON only: a list of exactly {slides_count} objects, each with "
+        f"a short \"title\" and \"bullets\" (a list of 4 concise bullet points).",
+        max_tokens=250 * slides_count,
+    )
+    match = re.search(r"\[.*\]", raw, re.S)
+    if not match:
+        return None
     try:
-        prs = Presentation()
-        for i in range(slides_count):
-            slide_layout = prs.slide_layouts[1]
-            slide = prs.slides.add_slide(slide_layout)
-            slide.shapes.title.text = f"{topic} - Slide {i+1}"
+        outline = json.loads(match.group(0))
+    except ValueError:
+        return None
+    slides = []
+    for item in outline[:slides_count]:
+        if not isinstance(item, dict) or not isinstance(item.get("bullets"), list):
+            return None
+        slides.append({"title": str(item.get("title", "")).strip(),
+                       "bullets": [str(b).strip() for b in item["bullets"] if str(b).strip()]})
+    return slides if len(slides) == slides_count else None
+
+def _slide_contents(topic, slides_count, write=write_content):
+    """One structured call; if that fails, one call per slide with a bounded pool."""
+    outline = write_slide_outline(topic, slides_count, write)
+    if outline:
+        return [(s["title"], "\n".join(s["bullets"])) for s in outline]
+
+    def one(i):
+        return "", write(f"Write 4 concise bullet points for slide {i+1} of a presentation on {topic}.")
+    with ThreadPoolExecutor(max_workers=PPT_WORKERS) as pool:
+        return list(pool.map(one, range(slides_count)))
+
+def _download_image_bytes(url, timeout=PPT_IMAGE_TIMEOUT):
+    # Shared on-disk cache: repeated decks don't touch the network
+    return get_image_cache().get_bytes(url, timeout=timeout)
+
+class NormalizedImageCache:
+    """LRU of sha256(source bytes) -> normalized bytes, bounded by total size."""
+
+    def __init__(self, max_bytes=PPT_NORMALIZED_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        return None
 
-            slide_text = write_content(f"Write 4 concise bullet points for slide {i+1} of a presentation on {topic}.")
-            slide.placeholders[1].text = slide_text
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.bytes -= len(self._items.pop(key))
+            self._items[key] = data
+            self.bytes += len(data)
+            while self.bytes > self.max_bytes:
+                self.bytes -= len(self._items.popitem(last=False)[1])
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+_normalized_images = NormalizedImageCache()
+
+def normalize_slide_image(data, width_in=PPT_IMAGE_WIDTH_IN, dpi=PPT_IMAGE_DPI, quality=PPT_JPEG_QUALITY):
+    """
+    Downscale to the picture's display size at `dpi` and re-encode compactly
+    (JPEG, or PNG when there is transparency). Identical sources always give
+    identical bytes, which python-pptx then stores only once in the package.
+    """
+    key = hashlib.sha256(data).hexdigest()
+    cached = _normalized_images.get(key)
+    if cached is not None:
+        return cached
+
+    img = Image.open(BytesIO(data))
+    max_w = int(width_in * dpi)
+    if img.format == "JPEG" and img.width <= max_w:
+        out = data  # already small JPEG: re-encoding would only lose quality
+    else:
+        if img.width > max_w:
+            max_h = max(1, img.height * max_w // img.width)
+            img.draft("RGB", (max_w, max_h))  # fast JPEG DCT scaling
+            img.thumbnail((max_w, max_h), Image.LANCZOS)
+        buf = BytesIO()
+        if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+            img.save(buf, format="PNG", optimize=True)
+        else:
+            img.convert("RGB").save(buf, format="JPEG", quality=quality, optimize=True)
+        out = buf.getvalue()
+    _normalized_images.put(key, out)
+    return out
 
+def create_ppt(topic, slides_count=10, write=None, download=None, open_file=True, normalize_images=True):
+    """
+    Content and images are fetched concurrently and the deck is assembled
+    once everything has arrived (late images are skipped).
+    `write`/`download` can be swapped for local stand-ins.
+    """
+    try:
+        write = write or write_content
+        download = download or _download_image_bytes
+        t0 = time.perf_counter()
+
+        # Images don't depend on the text, so start them right away
+        def get_image(url):
+            data = download(url)
+            return normalize_slide_image(data) if normalize_images else data
+
+        image_pool = ThreadPoolExecutor(max_workers=PPT_WORKERS)
+        image_jobs = []
+        for i in range(slides_count):
             img_url = fetch_image_url(f"{topic} slide {i+1}")
-            if img_url:
-                try:
-                    img_data = requests.get(img_url).content
-                    slide.shapes.add_picture(BytesIO(img_data), Inches(5), Inches(1.5), width=Inches(4))
-                except:
-                    pass
+            image_jobs.append(image_pool.submit(get_image, img_url) if img_url else None)
+
+        contents = _slide_contents(topic, slides_count, write)
+        t_content = time.perf_counter()
 
+        pending = [job for job in image_jobs if job]
+        wait(pending, timeout=max(0, PPT_IMAGE_DEADLINE - (t_content - t0)))
+        image_pool.shutdown(wait=False, cancel_futures=True)
+        t_images = time.perf_counter()
+
+        # Slides are assembled in a worker process (python-pptx holds the GIL)
+        # once there is enough image data to pay for the hop; images go over
+        # as temp files
         filename = f"{topic.replace(' ', '_')}_{int(time.time())}.pptx"
-        prs.save(filename)
-        os.startfile(os.path.abspath(filename))
+        with tempfile.TemporaryDirectory() as tmp:
+            image_paths = []
+            for i, job in enumerate(image_jobs):
+                path = None
+                if job and job.done() and not job.cancelled() and job.exception() is None:
+                    path = os.path.join(tmp, f"slide_{i+1}.img")
+                    with open(path, "wb") as f:
+                        f.write(job.result())
+                image_paths.append(path)
+            t_save = time.perf_counter()
+            run_cpu(build_pptx, topic, contents, image_paths, filename, PPT_IMAGE_WIDTH_IN,
+                    inline=not worth_offloading(image_paths)).result()
+        t_end = time.perf_counter()
+        if DebugTimings:
+            print(f"⏱ PPT build: content {t_content - t0:.2f}s | images ready {t_images - t0:.2f}s | "
+                  f"assemble+save {t_end - t_save:.2f}s | total {t_end - t0:.2f}s | "
+                  f"{os.path.getsize(filename) / 1024:.0f} KB")
+        if open_file:
+            os.startfile(os.path.abspath(filename))
         return f"✅ PowerPoint created & opened: {filename}"
     except:
         return "⚠️ Failed to create PPT. Make sure python-pptx is installed."
@@ -121,19 +288,12 @@ APP_STORE_LINKS = {
     "whatsapp": "https://web.whatsapp.com/"
 }
 
+# Installed apps are indexed in the background (Data/AppIndex.json); main
+# starts the index at launch, otherwise the first lookup does
+app_index = AppIndex()
+
 def find_installed_app(app_name):
-    paths_to_check = [
-        os.environ.get("ProgramFiles"),
-        os.environ.get("ProgramFiles(x86)"),
-        os.path.join(os.environ.get("LOCALAPPDATA", ""), "WhatsApp")
-    ]
-    for folder in paths_to_check:
-        if folder:
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if app_name.lower() in file.lower() and file.endswith(".exe"):
-                        return os.path.join(root, file)
-    return None
+    return app_index.find(app_name)
 
 def open_application(app_name):
     app_path = find_installed_app(app_name)
@@ -170,12 +330,8 @@ def _normalize_app_name(s: str) -> str:
     s = re.sub(r"\s+", " ", s).strip()
     return s
 
-def _is_running(proc_name: str) -> bool:
-    try:
-        out = subprocess.check_output(["tasklist"], creationflags=subprocess.CREATE_NO_WINDOW).decode(errors="ignore")
-        return proc_name.lower() in out.lower()
-    except Exception:
-        return False
+# One process snapshot per command, shared by every candidate name
+process_table = ProcessTable()
 
 def close_application(app_name):
     try:
@@ -221,24 +377,12 @@ def close_application(app_name):
             guess = app_name.replace(" ", "") + ".exe"
             proc_list = [guess]
 
-        killed_any = False
-        errs = []
-
-        for proc in proc_list:
-            if _is_running(proc):
-                try:
-                    # Kill the whole process tree
-                    subprocess.run(
-                        ["taskkill", "/F", "/T", "/IM", proc],
-                        check=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    killed_any = True
-                except subprocess.CalledProcessError as e:
-                    errs.append(f"{proc}: {e}")
-
-        if killed_any:
-            return f"✅ Closed: {', '.join(proc_list)}"
+        # Match every candidate against one fresh snapshot, then kill whole trees
+        process_table.snapshot(fresh=True)
+        killed, errs = process_table.kill_all(proc_list)
+
+        if killed:
+            return f"✅ Closed: {', '.join(killed)}"
         else:
             if errs:
                 return "⚠️ Tried to close but failed: " + "; ".join(errs)
@@ -248,23 +392,16 @@ def close_application(app_name):
         return f"⚠️ Close error: {e}"
 
 # ------------------ WhatsApp Automation ------------------
-def open_whatsapp_and_send(contact_name, message="", call_type=None):
+def open_whatsapp_and_send(contact_name, message="", call_type=None, driver=None):
+    # Waits only as long as WhatsApp needs: window up, focused, then type
     try:
-        subprocess.Popen(["start", "whatsapp:"], shell=True)
-    except:
+        timings = whatsapp_send(contact_name, message, driver=driver)
+    except ReadinessTimeout as e:
+        return f"⚠️ WhatsApp not ready: {e}"
+    except Exception:
         return "⚠️ Could not open WhatsApp"
-
-    time.sleep(8)
-    pyautogui.hotkey('alt', 'tab')
-    time.sleep(1)
-    pyautogui.hotkey('ctrl', 'f')
-    pyautogui.write(contact_name)
-    pyautogui.press('enter')
-    time.sleep(2)
-
-    if message:
-        pyautogui.write(message)
-        pyautogui.press('enter')
+    if DebugTimings:
+        print("⏱ WhatsApp: " + " | ".join(f"{k} {v:.1f}s" for k, v in timings.items()))
     return f"✅ WhatsApp action completed for {contact_name}"
 
 # ------------------ Folder Creation ------------------
@@ -278,7 +415,13 @@ def create_folder(folder_name="New Folder"):
         return f"⚠️ Failed to create folder: {e}"
 
 # ------------------ PDF from Recent Downloads ------------------
-def create_pdf_from_recent_downloads(minutes=5, folder_path=None):
+PDF_PAGE_DPI = None  # e.g. 150 to scale big photos down to an A4-wide page
+
+def _pdf_progress(done, total):
+    if done == total or done % 10 == 0:
+        print(f"📄 PDF: {done}/{total} pages")
+
+def create_pdf_from_recent_downloads(minutes=5, folder_path=None, dpi=PDF_PAGE_DPI):
     try:
         if not folder_path:
             folder_path = os.path.join(os.path.expanduser("~"), "Downloads")
@@ -286,24 +429,25 @@ def create_pdf_from_recent_downloads(minutes=5, folder_path=None):
         now = time.time()
         cutoff = now - (minutes * 60)
 
-        images = [f for f in os.listdir(folder_path)
-                  if f.lower().endswith(('.png', '.jpg', '.jpeg'))
-                  and os.path.getctime(os.path.join(folder_path, f)) >= cutoff]
+        # One directory pass; each file is stat'ed once
+        images = []
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(('.png', '.jpg', '.jpeg')) and entry.is_file():
+                    ctime = entry.stat().st_ctime
+                    if ctime >= cutoff:
+                        images.append((ctime, entry.path))
 
         if not images:
             return f"⚠️ No images found in Downloads from the last {minutes} minutes."
 
-        images.sort(key=lambda x: os.path.getctime(os.path.join(folder_path, x)))
-
-        pil_images = []
-        for img in images:
-            im = Image.open(os.path.join(folder_path, img))
-            if im.mode == "RGBA":
-                im = im.convert("RGB")
-            pil_images.append(im)
+        images.sort()
 
+        # Pages are encoded and written one at a time, so memory stays ~one image,
+        # in a worker process so speech and the GUI keep running meanwhile
         pdf_path = os.path.join(folder_path, f"RecentDownloadsPDF_{int(time.time())}.pdf")
-        pil_images[0].save(pdf_path, save_all=True, append_images=pil_images[1:])
+        job = run_cpu(build_pdf, [path for _, path in images], pdf_path, dpi, progress=_pdf_progress)
+        job.result()
         os.startfile(pdf_path)
         return f"✅ PDF created from {len(images)} recent images: {pdf_path}"
 
@@ -311,21 +455,56 @@ def create_pdf_from_recent_downloads(minutes=5, folder_path=None):
         return f"⚠️ Failed to create PDF: {str(e)}"
 
 # ------------------ Command Handling ------------------
-def automation_commands(cmd):
+CONTENT_KINDS = ["application","essay","letter","story","report","speech","email"]
+
+def automation_commands(cmd, ack=ACKNOWLEDGE, dry_run=False):
     cmd = cmd.lower()
+    start = time.perf_counter()
 
-    # Speak the command acknowledgement
-    speak(f"Okay, I will {cmd}")
+    # "open chrome and spotify, then create a folder reports" -> several steps
+    steps = plan_commands(cmd)
+    if dry_run:
+        return run_plan(steps, dry_run=True)
 
+    # The acknowledgement plays on the audio engine while the command runs
+    if ack:
+        acknowledge(f"Okay, I will {cmd}")
+
+    result = run_plan(steps) if len(steps) > 1 else _run_command(cmd)
+    if DebugTimings:
+        print(f"⏱ Automation '{cmd}': {(time.perf_counter() - start) * 1000:.0f} ms")
+    return result
+
+def _command_action(cmd):
+    """Which handler _run_command would pick for cmd (None if none)."""
     if "create a folder" in cmd:
+        return "folder"
+    if "create pdf from recent downloads" in cmd:
+        return "pdf"
+    if "close" in cmd or "exit" in cmd or "shut" in cmd:
+        return "close"
+    if any(key in cmd for key in CONTENT_KINDS):
+        return "write"
+    if "ppt" in cmd or "presentation" in cmd:
+        return "ppt"
+    if "whatsapp" in cmd:
+        return "whatsapp"
+    if any(x in cmd for x in ["open", "launch"]):
+        return "open"
+    return None
+
+def _run_command(cmd):
+    action = _command_action(cmd)
+
+    if action == "folder":
         folder_name = cmd.replace("create a folder", "").strip()
         return create_folder(folder_name if folder_name else "New Folder")
 
-    if "create pdf from recent downloads" in cmd:
+    if action == "pdf":
         return create_pdf_from_recent_downloads()
 
     # Close apps  ✅ normalized + resilient
-    if "close" in cmd or "exit" in cmd or "shut" in cmd:
+    if action == "close":
         app_name = cmd
         for v in ["close", "exit", "shut", "turn off", "kill", "stop"]:
             app_name = app_name.replace(v, " ")
@@ -333,37 +512,247 @@ def automation_commands(cmd):
         return close_application(app_name if app_name else "")
 
     # AI content
-    for key in ["application","essay","letter","story","report","speech","email"]:
-        if key in cmd:
-            topic = cmd.replace(f"write {key}", "").strip()
-            content = write_content(f"Write a {key} about {topic}")
-            open_notepad_with_content(content)
-            return f"✅ {key.capitalize()} opened in Notepad."
+    if action == "write":
+        key = next(k for k in CONTENT_KINDS if k in cmd)
+        topic = cmd.replace(f"write {key}", "").strip()
+        content = write_content(f"Write a {key} about {topic}")
+        open_notepad_with_content(content)
+        return f"✅ {key.capitalize()} opened in Notepad."
 
     # PPT
-    if "ppt" in cmd or "presentation" in cmd:
+    if action == "ppt":
         topic = cmd.replace("ppt", "").replace("presentation", "").strip()
         return create_ppt(topic if topic else "Topic")
 
     # WhatsApp
-    if "whatsapp" in cmd:
+    if action == "whatsapp":
         message = ""
         contact_name = cmd.replace("whatsapp", "").replace("send message to", "").strip()
-        if "message" in contact_name:
-            parts = contact_name.split("message", 1)
-            contact_name = parts[0].strip()
+        parts = re.split(r"\b(?:message|saying)\b", contact_name, 1)
+        if len(parts) == 2:
+            contact_name = re.sub(r"^(?:send\s+)?(?:to\s+)?", "", parts[0].strip())
             message = parts[1].strip()
         return open_whatsapp_and_send(contact_name, message)
 
     # Open apps
-    if any(x in cmd for x in ["open", "launch"]):
+    if action == "open":
         app_name = cmd.replace("open", "").replace("launch", "").strip()
         return open_application(app_name if app_name else "")
 
     return "⚠️ Command not recognized."
 
+# ------------------ Multi-step Plans ------------------
+# "then" / "after that" / ";" start a new stage that waits for the previous one;
+# "and" / "," inside a stage are independent steps that run concurrently.
+# Either only splits when the next fragment starts with an action verb, and
+# never inside a message ("whatsapp mom message ...", "... saying ...").
+_STAGE_SPLIT = re.compile(r"\s*(?:,?\s*\b(?:and then|then|after that|afterwards)\b|;)\s*")
+_STEP_SPLIT = re.compile(r"(\s*,\s*|\s+and\s+)")
+_PAYLOAD = re.compile(r"\b(?:whatsapp|send message to|" + "|".join(CONTENT_KINDS) + r")\b.*?"
+                      r"(?:\bmessage\b|\bsaying\b|\bthat says\b|:)")
+ACTION_VERBS = {"open", "launch", "close", "exit", "shut", "create", "make", "write", "send", "whatsapp"}
+CARRY_VERBS = {"open": "open", "close": "close"}   # "open chrome and spotify"
+EXCLUSIVE_ACTIONS = {"whatsapp"}                    # drives the keyboard: runs alone
+PLAN_WORKERS = 4
+
+def _starts_action(frag):
+    """True if frag reads as a new command ("open chrome"), not a continuation."""
+    words = frag.split()
+    return bool(words) and words[0] in ACTION_VERBS and _command_action(frag) is not None
+
+def _split_stages(cmd):
+    """Stage texts; a separator followed by a non-command stays part of the text."""
+    stages, start = [], 0
+    for m in _STAGE_SPLIT.finditer(cmd):
+        if _starts_action(cmd[m.end():]):
+            stages.append(cmd[start:m.start()])
+            start = m.end()
+    stages.append(cmd[start:])
+    return stages
+
+def plan_commands(cmd):
+    """
+    Parse an utterance into steps: [{"id", "command", "action", "after": [ids]}].
+    Steps only depend on the stage before them, so each stage runs in parallel.
+    """
+    # The message/content of a whatsapp or write command is never split
+    payload = ""
+    m = _PAYLOAD.search(cmd)
+    if m:
+        cmd, payload = cmd[:m.end()], cmd[m.end():]
+
+    stages = []
+    for stage_text in _split_stages(cmd):
+        if not stage_text.strip():
+            continue
+        stage = []
+        parts = _STEP_SPLIT.split(stage_text)
+        fragments, seps = parts[0::2], [""] + parts[1::2]
+        for frag, sep in zip(fragments, seps):
+            frag = frag.strip()
+            if not frag:
+                continue
+            action = _command_action(frag) if _starts_action(frag) or not stage else None
+            if action is None and stage:
+                last = stage[-1]
+                if last["action"] in CARRY_VERBS:
+                    # "... and spotify" -> "open spotify"
+                    frag, action = f"{CARRY_VERBS[last['action']]} {frag}", last["action"]
+                else:
+                    # Part of the previous step's text ("essay about salt and pepper")
+                    last["command"] += sep + frag
+                    continue
+            step = {"command": frag, "action": action}
+            if action in EXCLUSIVE_ACTIONS:
+                if stage:
+                    stages.append(stage)
+                stages.append([step])
+                stage = []
+            else:
+                stage.append(step)
+        if stage:
+            stages.append(stage)
+    if payload and stages:
+        stages[-1][-1]["command"] += payload
+
+    steps, previous = [], []
+    for stage in stages:
+        for step in stage:
+            step["id"] = len(steps) + 1
+            step["after"] = [s["id"] for s in previous]
+            steps.append(step)
+        previous = stage
+    cmd += payload
+    return steps or [{"id": 1, "command": cmd, "action": _command_action(cmd), "after": []}]
+
+def _timed_step(step):
+    start = time.perf_counter()
+    try:
+        result = _run_command(step["command"])
+    except Exception as e:
+        result = f"⚠️ {e}"
+    return result, time.perf_counter() - start
+
+def run_plan(steps, dry_run=False):
+    """Run steps as soon as their dependencies finish; report in the user's order."""
+    if dry_run:
+        lines = [f"📝 Plan ({len(steps)} steps):"]
+        for step in steps:
+            after = ", ".join(str(i) for i in step["after"]) or "start"
+            lines.append(f"{step['id']}. [{step['action'] or '?'}] {step['command']}  (after: {after})")
+        return "\n".join(lines)
+
+    start = time.perf_counter()
+    results = {}
+    remaining = list(steps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=PLAN_WORKERS) as pool:
+        while remaining or running:
+            for step in [s for s in remaining if all(d in results for d in s["after"])]:
+                running[pool.submit(_timed_step, step)] = step
+                remaining.remove(step)
+            if not running:
+                break  # unreachable dependency; report what ran
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[running.pop(fut)["id"]] = fut.result()
+
+    lines = [f"✅ Ran {len(results)} of {len(steps)} steps in {time.perf_counter() - start:.1f}s:"]
+    for step in steps:
+        result, secs = results.get(step["id"], ("⚠️ Skipped", 0.0))
+        lines.append(f"{step['id']}. {step['command']} → {result} ({secs:.1f}s)")
+    return "\n".join(lines)
+
+def _bench_ppt(slides_count=10, llm_delay=1.5, image_delay=0.8):
+    """Deck build time and size against local stand-ins for Groq and Unsplash."""
+    photos = []
+    for _ in range(3):
+        buf = BytesIO()
+        # Camera-sized photos, like the ones Unsplash returns
+        Image.effect_noise((3000, 2000), 40).convert("RGB").save(buf, format="JPEG", quality=95)
+        photos.append(buf.getvalue())
+
+    def fake_write(prompt, max_tokens=500):
+        time.sleep(llm_delay)
+        slides = [{"title": f"Part {i+1}", "bullets": [f"Point {j+1}" for j in range(4)]}
+                  for i in range(slides_count)]
+        return json.dumps(slides)
+
+    def fake_download(url, timeout=PPT_IMAGE_TIMEOUT):
+        time.sleep(image_delay)
+        return photos[hash(url) % len(photos)]
+
+    for normalize in (False, True):
+        _normalized_images.clear()
+        t = time.perf_counter()
+        result = create_ppt("Benchmark", slides_count, write=fake_write, download=fake_download,
+                            open_file=False, normalize_images=normalize)
+        label = "normalized" if normalize else "raw images"
+        print(f"[{label}] {result}\n⏱ End-to-end {time.perf_counter() - t:.2f}s "
+              f"(old serial path: ~{slides_count * (llm_delay + image_delay):.1f}s)")
+
+# Utterance -> expected step commands (checked with --plan-check)
+PLAN_CASES = [
+    ("open chrome and spotify then create a folder reports",
+     ["open chrome", "open spotify", "create a folder reports"]),
+    ("send whatsapp to mom message i'll eat then sleep",
+     ["send whatsapp to mom message i'll eat then sleep"]),
+    ("whatsapp dad message open the door and close the gate then call me",
+     ["whatsapp dad message open the door and close the gate then call me"]),
+    ("write an essay on climate change; include recent data",
+     ["write an essay on climate change; include recent data"]),
+    ("write an essay about salt and pepper then open notepad",
+     ["write an essay about salt and pepper", "open notepad"]),
+    ("send whatsapp to mom saying i'll eat then sleep", ["send whatsapp to mom saying i'll eat then sleep"]),
+    ("open chrome and then write an essay on dogs and cats",
+     ["open chrome", "write an essay on dogs and cats"]),
+]
+
+def _check_plans():
+    failures = 0
+    for utterance, expected in PLAN_CASES:
+        got = [step["command"] for step in plan_commands(utterance)]
+        ok = got == expected
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {utterance!r} -> {got}")
+    return failures
+
+def _bench_ack(cmd="report automation timing"):
+    """Command latency: blocking acknowledgement (old) vs queued vs none."""
+    t = time.perf_counter()
+    speak(f"Okay, I will {cmd}")
+    _run_command(cmd)
+    blocking = time.perf_counter() - t
+
+    t = time.perf_counter()
+    done = acknowledge(f"Okay, I will {cmd}")
+    _run_command(cmd)
+    queued = time.perf_counter() - t
+    done.wait()
+
+    t = time.perf_counter()
+    _run_command(cmd)
+    silent = time.perf_counter() - t
+    print(f"⏱ Blocking ack: {blocking * 1000:.0f} ms | queued ack: {queued * 1000:.1f} ms | "
+          f"no ack: {silent * 1000:.1f} ms")
+
 # ------------------ Run ------------------
 if __name__ == "__main__":
+    import sys
+    if "--bench-ppt" in sys.argv:
+        DebugTimings = True   # the per-stage PPT breakdown is the point of the benchmark
+        _bench_ppt()
+        sys.exit(0)
+    if "--bench-ack" in sys.argv:
+        _bench_ack()
+        sys.exit(0)
+    if "--plan-check" in sys.argv:
+        sys.exit(1 if _check_plans() else 0)
+    if "--plan" in sys.argv:
+        # Dry run: show how an utterance would be split and ordered
+        print(automation_commands(" ".join(a for a in sys.argv[1:] if a != "--plan"), dry_run=True))
+        sys.exit(0)
+
     speak("Automation module is ready. Say 'exit' to quit.")
     print("🎛 Automation Ready. Listening for voice commands...")
 
@@ -0,0 +1,332 @@
+# Backend/CpuPool.py
+"""
+Process pool for CPU-heavy automation work
+------------------------------------------
+PDF encoding, pptx assembly and PNG re-encoding hold the GIL for seconds at
+a time, which stalls speech playback and the GUI. These jobs run in a small
+pool of worker processes instead; inputs and outputs travel as file paths,
+progress comes back over a manager queue and a manager event lets callers
+cancel a job between pages/slides.
+
+    job = run_cpu(build_pdf, paths, pdf_path, progress=print)
+    job.cancel()          # optional, from any thread
+    job.result()          # raises JobCancelled if it was cancelled
+
+The worker functions live in this module and import PIL, python-pptx and
+PdfWriter lazily. Under spawn (Windows) each worker also re-imports the
+entry script as __mp_main__, which is safe because main.py keeps its start-up
+code behind `if __name__ == "__main__"`; main calls warm_up() at launch so
+that import cost is paid once, in the background, and not by the first PDF.
+Small jobs (a PNG copy, a deck with little image data) run inline: a
+process hop costs more than the work.
+"""
+
+import os
+import shutil
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+CPU_WORKERS = max(1, min(2, (os.cpu_count() or 2) - 1))
+CPU_OFFLOAD = True   # False runs jobs inline (same API, no worker processes)
+INLINE_BYTES = 1536 * 1024   # inputs smaller than this aren't worth a process hop
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """Handed to every worker function: report progress, check for cancel."""
+
+    def __init__(self, progress_queue=None, cancel_event=None):
+        self._queue = progress_queue
+        self._cancel = cancel_event
+
+    def report(self, done, total):
+        if self._queue is not None:
+            self._queue.put((done, total))
+
+    def cancelled(self) -> bool:
+        return self._cancel is not None and self._cancel.is_set()
+
+    def check(self):
+        if self.cancelled():
+            raise JobCancelled()
+
+
+class CpuJob:
+    def __init__(self, future, ctx, progress=None):
+        self.future = future
+        self.ctx = ctx
+        self.progress = (0, 0)
+        self._on_progress = progress
+        self._pump = None
+        if ctx._queue is not None:
+            self._pump = threading.Thread(target=self._pump_progress, name="cpu-progress", daemon=True)
+            self._pump.start()
+
+    def _pump_progress(self):
+        import queue
+        while True:
+            try:
+                self._set_progress(*self.ctx._queue.get(timeout=0.1))
+            except queue.Empty:
+                if self.future.done():
+                    break
+            except (EOFError, OSError):
+                break  # manager went away (shutdown)
+
+    def _set_progress(self, done, total):
+        self.progress = (done, total)
+        if self._on_progress:
+            try:
+                self._on_progress(done, total)
+            except Exception:
+                pass
+
+    def cancel(self):
+        """Drop the job if it hasn't started, otherwise ask it to stop."""
+        if self.ctx._cancel is not None:
+            self.ctx._cancel.set()
+        self.future.cancel()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout=None):
+        try:
+            value = self.future.result(timeout)
+        except CancelledError:
+            raise JobCancelled()
+        if self._pump is not None:
+            self._pump.join(0.5)  # deliver the last progress update first
+        return value
+
+
+class _InlineFuture:
+    """Future-alike for CPU_OFFLOAD=False and for a pool that failed to start."""
+
+    def __init__(self, fn, args, kwargs):
+        self._exc = None
+        self._value = None
+        try:
+            self._value = fn(*args, **kwargs)
+        except BaseException as e:
+            self._exc = e
+
+    def result(self, timeout=None):
+        if self._exc is not None:
+            raise self._exc
+        return self._value
+
+    def done(self):
+        return True
+
+    def cancel(self):
+        return False
+
+
+# ---------- Shared pool ----------
+_pool = None
+_manager = None
+_pool_lock = threading.Lock()
+_active = set()
+
+def get_cpu_pool():
+    """(executor, manager), started on first use and kept warm."""
+    global _pool, _manager
+    with _pool_lock:
+        if _pool is None:
+            _manager = multiprocessing.Manager()
+            _pool = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+        return _pool, _manager
+
+def _noop(ctx):
+    return None
+
+def warm_up():
+    """Start the manager and every worker now (blocks; run it off the GUI thread)."""
+    if not CPU_OFFLOAD:
+        return
+    try:
+        pool, _ = get_cpu_pool()
+        for future in [pool.submit(_noop, None) for _ in range(CPU_WORKERS)]:
+            future.result()
+    except Exception as e:
+        print(f"⚠️ Process pool failed to start: {e}")
+
+def worth_offloading(paths, min_bytes=INLINE_BYTES) -> bool:
+    """True when the input files are big enough to pay for a process hop."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path) if path else 0
+        except OSError:
+            pass
+    return total >= min_bytes
+
+def is_png(path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(8) == b"\x89PNG\r\n\x1a\n"
+    except OSError:
+        return False
+
+def run_cpu(fn, *args, progress=None, inline=False, **kwargs) -> CpuJob:
+    """
+    Run fn(ctx, *args, **kwargs) in a worker process (or here, when inline=True);
+    progress(done, total) is optional.
+    """
+    if CPU_OFFLOAD and not inline:
+        try:
+            pool, manager = get_cpu_pool()
+            ctx = JobContext(manager.Queue() if progress else None, manager.Event())
+            job = CpuJob(pool.submit(fn, ctx, *args, **kwargs), ctx, progress)
+            _active.add(job)
+            job.future.add_done_callback(lambda _: _active.discard(job))
+            return job
+        except Exception as e:
+            print(f"⚠️ Process pool unavailable, running inline: {e}")
+    ctx = JobContext()
+    job = CpuJob(_InlineFuture(fn, (ctx,) + args, kwargs), ctx)
+    return job
+
+def cancel_all():
+    """Cancel every running/queued job (e.g. on a 'stop' command)."""
+    for job in list(_active):
+        job.cancel()
+
+def shutdown():
+    global _pool, _manager
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _manager.shutdown()
+            _pool = _manager = None
+
+# -------------------- Worker functions --------------------
+# Module-level so they pickle; everything in and out is a path or plain data.
+
+def build_pdf(ctx, paths, pdf_path, dpi=None):
+    """images_to_pdf with progress and cancellation between pages."""
+    try:
+        from Backend.PdfWriter import images_to_pdf
+    except ImportError:
+        from PdfWriter import images_to_pdf
+
+    def on_page(done, total):
+        ctx.report(done, total)
+        ctx.check()  # raising here removes the half-written PDF
+
+    return images_to_pdf(paths, pdf_path, dpi=dpi, progress=on_page)
+
+def build_pptx(ctx, topic, contents, image_paths, filename, image_width_in=4):
+    """
+    Assemble and save a deck. contents = [(title, text)], image_paths[i] is a
+    file path or None for each slide.
+    """
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    total = len(contents)
+    for i, (title, slide_text) in enumerate(contents):
+        ctx.check()
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"{topic} - {title}" if title else f"{topic} - Slide {i+1}"
+        slide.placeholders[1].text = slide_text
+        image = image_paths[i] if i < len(image_paths) else None
+        if image:
+            try:
+                slide.shapes.add_picture(image, Inches(5), Inches(1.5), width=Inches(image_width_in))
+            except Exception:
+                pass
+        ctx.report(i + 1, total)
+    ctx.check()
+    prs.save(filename)
+    return filename
+
+def save_as_png(ctx, src_path, out_path):
+    """Copy PNGs byte-for-byte; decode and re-encode anything else."""
+    from PIL import Image
+
+    with Image.open(src_path) as img:
+        if img.format == "PNG":
+            shutil.copyfile(src_path, out_path)
+        else:
+            img.save(out_path, format="PNG")
+    ctx.report(1, 1)
+    return out_path
+
+# -------------- CLI (frame-latency benchmark) --------------
+def _frame_latencies(stop, fps=60):
+    """A stand-in GUI/audio loop: late frames = time the GIL wasn't ours."""
+    import time
+    frame = 1.0 / fps
+    lat = []
+    nxt = time.perf_counter() + frame
+    while not stop.is_set():
+        sum(range(2000))  # a little per-frame Python work
+        delay = nxt - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        lat.append(max(0.0, time.perf_counter() - nxt) * 1000)
+        nxt += frame
+        if nxt < time.perf_counter():
+            nxt = time.perf_counter() + frame  # skip missed frames
+    return lat
+
+def _report(label, lat, secs):
+    lat = sorted(lat) or [0.0]
+    pick = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))]
+    print(f"{label:>14}: {secs:5.2f}s | frame lateness p50 {pick(.5):5.1f} ms  "
+          f"p99 {pick(.99):6.1f} ms  max {lat[-1]:6.1f} ms  ({len(lat)} frames)")
+
+if __name__ == "__main__":
+    import sys
+    import time
+    import tempfile
+    from PIL import Image
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(count):
+            path = os.path.join(tmp, f"shot_{i:03d}.png")
+            Image.effect_noise((2000, 1500), 30 + i % 20).convert("RGB").save(path)
+            paths.append(path)
+        print(f"📷 {count} PNG screenshots of 2000x1500")
+
+        get_cpu_pool()
+        run_cpu(save_as_png, paths[0], os.path.join(tmp, "warm.png")).result()  # workers up
+
+        for label, offload in (("same process", False), ("process pool", True)):
+            CPU_OFFLOAD = offload
+            stop = threading.Event()
+            out = {}
+            ticker = threading.Thread(target=lambda: out.setdefault("lat", _frame_latencies(stop)))
+            ticker.start()
+            t = time.perf_counter()
+            if offload:
+                run_cpu(build_pdf, paths, os.path.join(tmp, "pool.pdf")).result()
+            else:
+                build_pdf(JobContext(), paths, os.path.join(tmp, "inline.pdf"))
+            secs = time.perf_counter() - t
+            stop.set()
+            ticker.join()
+            _report(label, out["lat"], secs)
+
+        CPU_OFFLOAD = True
+        seen = []
+        pdf_path = os.path.join(tmp, "cancelled.pdf")
+        job = run_cpu(build_pdf, paths, pdf_path, progress=lambda d, n: seen.append(d))
+        while job.progress[0] < count // 4:
+            time.sleep(0.01)
+        job.cancel()
+        try:
+            job.result()
+            print("⚠️ Job finished before it could be cancelled")
+        except JobCancelled:
+            print(f"🛑 Cancelled after {max(seen)}/{count} pages; partial PDF removed: {not os.path.exists(pdf_path)}")
+        shutdown()
@@ -0,0 +1,194 @@
+# Backend/ImageCache.py
+"""
+Content-addressed disk cache for downloaded images
+--------------------------------------------------
+Image bytes are stored once per SHA-256 under Data/ImageCache/objects and
+URLs point at those hashes. Fresh entries are served with no network I/O,
+stale ones are revalidated with If-None-Match / If-Modified-Since, and the
+store is kept under MAX_BYTES by evicting the least recently used objects.
+Bytes are handed back as-is; images are only decoded when a resize is asked for.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from io import BytesIO
+import requests
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.path.join(ROOT_DIR, "Data", "ImageCache")
+
+# ---------- Defaults ----------
+MAX_BYTES = 256 * 1024 * 1024   # on-disk budget
+FRESH_FOR = 24 * 3600           # seconds before a URL is revalidated
+TIMEOUT   = 15
+
+
+class ImageCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES, fresh_for=FRESH_FOR, session=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for
+        self.session = session or requests.Session()
+        self._lock = threading.RLock()
+        self._index_path = os.path.join(root, "index.json")
+        self._index = self._load_index()
+        self.stats = {"hits": 0, "revalidated": 0, "downloads": 0}
+
+    # ---------- Index ----------
+    def _load_index(self):
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except Exception:
+            index = {}
+        index.setdefault("urls", {})     # url -> {sha, etag, last_modified, checked}
+        index.setdefault("objects", {})  # sha -> {size, used}
+        return index
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self._index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._index_path)
+
+    def _object_path(self, sha):
+        return os.path.join(self.root, "objects", sha[:2], sha)
+
+    # ---------- Objects ----------
+    def put_bytes(self, data: bytes) -> str:
+        """Store bytes under their content hash (once) and return the hash."""
+        sha = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            path = self._object_path(sha)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            self._index["objects"][sha] = {"size": len(data), "used": time.time()}
+        return sha
+
+    def _read(self, sha):
+        try:
+            with open(self._object_path(sha), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._index["objects"].setdefault(sha, {"size": len(data)})["used"] = time.time()
+        return data
+
+    def _evict(self):
+        objects = self._index["objects"]
+        total = sum(o["size"] for o in objects.values())
+        if total <= self.max_bytes:
+            return
+        for sha, meta in sorted(objects.items(), key=lambda kv: kv[1].get("used", 0)):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._object_path(sha))
+            except OSError:
+                pass
+            total -= meta["size"]
+            del objects[sha]
+        live = set(objects)
+        self._index["urls"] = {u: e for u, e in self._index["urls"].items() if e["sha"] in live}
+
+    # ---------- URLs ----------
+    def get_bytes(self, url: str, timeout=TIMEOUT) -> bytes:
+        """Raw image bytes for url, from disk when fresh, revalidated when stale."""
+        return self._get(url, timeout)[1]
+
+    def _get(self, url, timeout):
+        with self._lock:
+            entry = self._index["urls"].get(url)
+            if entry and time.time() - entry.get("checked", 0) < self.fresh_for:
+                data = self._read(entry["sha"])
+                if data is not None:
+                    self.stats["hits"] += 1
+                    return entry["sha"], data
+                entry = None  # object was evicted or deleted
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            r = self.session.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            with self._lock:
+                stale = self._read(entry["sha"]) if entry else None
+            if stale is not None:
+                return entry["sha"], stale  # offline: a stale image beats none
+            raise
+
+        with self._lock:
+            if r.status_code == 304 and entry:
+                data = self._read(entry["sha"])
+                if data is not None:
+                    entry["checked"] = time.time()
+                    self.stats["revalidated"] += 1
+                    self._save_index()
+                    return entry["sha"], data
+            r.raise_for_status()
+            data = r.content
+            sha = self.put_bytes(data)
+            self._index["urls"][url] = {
+                "sha": sha,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "checked": time.time(),
+            }
+            self.stats["downloads"] += 1
+            self._evict()
+            self._save_index()
+            return sha, data
+
+    def get_path(self, url: str, timeout=TIMEOUT) -> str:
+        """Path of the cached object for url (downloading it if needed)."""
+        return self._object_path(self._get(url, timeout)[0])
+
+    def get_resized(self, url: str, max_size, timeout=TIMEOUT) -> bytes:
+        """Bytes scaled down to fit max_size (w, h); decoded only when too large."""
+        from PIL import Image
+
+        data = self.get_bytes(url, timeout)
+        img = Image.open(BytesIO(data))  # lazy: reads the header only
+        if img.width <= max_size[0] and img.height <= max_size[1]:
+            return data
+        fmt = img.format or "PNG"
+        img.thumbnail(max_size)
+        out = BytesIO()
+        img.save(out, format=fmt)
+        return out.getvalue()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_image_cache() -> ImageCache:
+    """Process-wide cache shared by PPT creation and image generation."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ImageCache()
+        return _shared
+
+# -------------- CLI --------------
+if __name__ == "__main__":
+    import sys
+    cache = get_image_cache()
+    for url in sys.argv[1:]:
+        for attempt in (1, 2):
+            t = time.perf_counter()
+            data = cache.get_bytes(url)
+            print(f"#{attempt} {len(data)} bytes in {(time.perf_counter() - t) * 1000:.1f} ms  {url}")
+    print(f"📦 {cache.stats}")
@@ -6,6 +6,13 @@ from io import BytesIO
 from dotenv import load_dotenv
 import time
 
+try:
+    from Backend.ImageCache import get_image_cache
+    from Backend.CpuPool import run_cpu, save_as_png, is_png
+except ImportError:  # run as a script from Backend/
+    from ImageCache import get_image_cache
+    from CpuPool import run_cpu, save_as_png, is_png
+
 # ---------- Load .env from project root ----------
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ENV_PATH = os.path.join(ROOT_DIR, ".env")
@@ -42,9 +49,16 @@ def _normalize_ratio(r: str) -> str:
     return r if r in ALLOWED_RATIOS else "1x1"
 
 def _download_image(url: str) -> Image.Image:
-    r = requests.get(url, timeout=TIMEOUT)
-    r.raise_for_status()
-    return Image.open(BytesIO(r.content))
+    # Shared on-disk cache: a URL is only fetched (or revalidated) once
+    data = get_image_cache().get_bytes(url, timeout=TIMEOUT)
+    return Image.open(BytesIO(data))
+
+def _show_image(path: str, title: str = None):
+    """Open the saved file directly; Image.show() would re-encode it first."""
+    if hasattr(os, "startfile"):
+        os.startfile(path)
+    else:
+        Image.open(path).show(title=title)
 
 def _ideogram_v3_generate(prompt: str, num_images: int):
     """Call Ideogram v3 generate with JSON body."""
@@ -79,16 +93,16 @@ def generate_one(prompt: str, out_dir: str, idx: int) -> str | None:
             print(f"⚠️ API returned no image URLs. Raw: {str(result)[:200]}")
             return None
 
-        img = _download_image(urls[0])
+        src = get_image_cache().get_path(urls[0], timeout=TIMEOUT)
 
-        # ✅ Save image
+        # ✅ Save image (a PNG is just copied here; a re-encode runs in a worker process, off the GIL)
         safe_prefix = (prompt[:10].strip().replace(" ", "_") or "img")
         fname = f"{safe_prefix}_{idx+1}.png"
         path = os.path.join(out_dir, fname)
-        img.save(path)
+        run_cpu(save_as_png, src, path, inline=is_png(src)).result()
 
         # ✅ Show image on screen
-        img.show(title=f"{prompt} #{idx+1}")
+        _show_image(path, title=f"{prompt} #{idx+1}")
 
         print(f"✅ Saved and displayed: {path}")
         return path
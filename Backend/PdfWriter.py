@@ -0,0 +1,176 @@
+# Backend/PdfWriter.py
+"""
+Streaming image-to-PDF writer
+-----------------------------
+Writes one page per image straight to disk, so only the image currently
+being encoded is held in memory. JPEGs that need no scaling are embedded
+as-is without being decoded; everything else is decoded, optionally scaled
+down to the page DPI and stored as a JPEG page (as Pillow's PDF writer does).
+"""
+
+import os
+from io import BytesIO
+from PIL import Image
+
+PAGE_WIDTH_IN = 8.27     # A4 width, used when a page DPI is given
+JPEG_QUALITY = 90
+
+
+class StreamingPdfWriter:
+    """
+    with StreamingPdfWriter(path, dpi=150) as pdf:
+        for p in paths:
+            pdf.add_image(p)
+
+    dpi=None keeps every image at full size (one pixel per point, like
+    Pillow's default); with a dpi, images are scaled down to fit a
+    PAGE_WIDTH_IN-wide page at that resolution.
+    """
+
+    def __init__(self, path, dpi=None, quality=JPEG_QUALITY):
+        self.path = path
+        self.dpi = dpi
+        self.quality = quality
+        self._f = open(path, "wb")
+        self._offsets = {}
+        self._pages = []
+        self._next_id = 3  # 1 = catalog, 2 = page tree (written last)
+        self._f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    # ---------- Low-level objects ----------
+    def _new_id(self):
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write_obj(self, obj_id, body: bytes, stream: bytes = None):
+        self._offsets[obj_id] = self._f.tell()
+        self._f.write(f"{obj_id} 0 obj\n".encode())
+        self._f.write(body)
+        if stream is not None:
+            self._f.write(b"\nstream\n")
+            self._f.write(stream)
+            self._f.write(b"\nendstream")
+        self._f.write(b"\nendobj\n")
+
+    # ---------- Pages ----------
+    def _jpeg_for(self, path):
+        """(jpeg_bytes, width, height, colorspace) for one image file."""
+        with Image.open(path) as im:
+            max_w = int(PAGE_WIDTH_IN * self.dpi) if self.dpi else None
+            if (im.format == "JPEG" and im.mode in ("RGB", "L")
+                    and (max_w is None or im.width <= max_w)):
+                with open(path, "rb") as f:
+                    data = f.read()  # pass-through: no decode, no re-encode
+                return data, im.width, im.height, im.mode
+
+            if max_w and im.width > max_w:
+                max_h = max(1, im.height * max_w // im.width)
+                im.draft("RGB", (max_w, max_h))
+                im.thumbnail((max_w, max_h), Image.LANCZOS)
+            mode = "L" if im.mode in ("L", "1") else "RGB"
+            frame = im.convert(mode)
+            buf = BytesIO()
+            frame.save(buf, format="JPEG", quality=self.quality)
+            return buf.getvalue(), frame.width, frame.height, mode
+
+    def add_image(self, path):
+        data, w, h, mode = self._jpeg_for(path)
+        scale = 72.0 / self.dpi if self.dpi else 1.0
+        pw, ph = w * scale, h * scale
+
+        img_id, content_id, page_id = self._new_id(), self._new_id(), self._new_id()
+        colorspace = "/DeviceGray" if mode == "L" else "/DeviceRGB"
+        self._write_obj(img_id, (
+            f"<< /Type /XObject /Subtype /Image /Width {w} /Height {h} "
+            f"/ColorSpace {colorspace} /BitsPerComponent 8 /Filter /DCTDecode "
+            f"/Length {len(data)} >>").encode(), data)
+        del data
+
+        content = f"q {pw:.2f} 0 0 {ph:.2f} 0 0 cm /Im0 Do Q".encode()
+        self._write_obj(content_id, f"<< /Length {len(content)} >>".encode(), content)
+        self._write_obj(page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pw:.2f} {ph:.2f}] "
+            f"/Resources << /XObject << /Im0 {img_id} 0 R >> >> "
+            f"/Contents {content_id} 0 R >>").encode())
+        self._pages.append(page_id)
+
+    @property
+    def page_count(self):
+        return len(self._pages)
+
+    def close(self):
+        if self._f.closed:
+            return
+        kids = " ".join(f"{p} 0 R" for p in self._pages)
+        self._write_obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>".encode())
+        self._write_obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref_at = self._f.tell()
+        size = self._next_id
+        self._f.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        for obj_id in range(1, size):
+            self._f.write(f"{self._offsets.get(obj_id, 0):010d} 00000 n \n".encode())
+        self._f.write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode())
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if exc_type is not None:
+            try:
+                os.remove(self.path)  # don't leave half-written PDFs behind
+            except OSError:
+                pass
+
+
+def images_to_pdf(paths, pdf_path, dpi=None, progress=None):
+    """Write paths (in order) to pdf_path; progress(done, total) after each page."""
+    total = len(paths)
+    with StreamingPdfWriter(pdf_path, dpi=dpi) as pdf:
+        for i, path in enumerate(paths):
+            pdf.add_image(path)
+            if progress:
+                progress(i + 1, total)
+    return pdf_path
+
+# -------------- CLI (peak-RSS benchmark) --------------
+def _peak_rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+def _bench_child(mode, paths, out):
+    import time
+    t = time.perf_counter()
+    if mode == "pillow":
+        # The old path: every decoded bitmap held in a list until save
+        ims = [Image.open(p).convert("RGB") for p in paths]
+        ims[0].save(out, save_all=True, append_images=ims[1:])
+    else:
+        images_to_pdf(paths, out, dpi=150 if mode == "streaming-150dpi" else None)
+    print(f"{mode:>17}: {time.perf_counter() - t:6.2f}s  peak RSS {_peak_rss_mb():7.1f} MB  "
+          f"{os.path.getsize(out) / 1e6:6.1f} MB pdf")
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import multiprocessing
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(count):
+            path = os.path.join(tmp, f"photo_{i:03d}.png" if i % 4 == 0 else f"photo_{i:03d}.jpg")
+            Image.effect_noise((2400, 1800), 30 + i % 20).convert("RGB").save(path)
+            paths.append(path)
+        print(f"📷 {count} images of 2400x1800")
+        for mode in ("pillow", "streaming", "streaming-150dpi"):
+            proc = multiprocessing.Process(target=_bench_child, args=(mode, paths, os.path.join(tmp, f"{mode}.pdf")))
+            proc.start()
+            proc.join()
@@ -0,0 +1,285 @@
+# Backend/Prefetch.py
+"""
+Background prefetch for realtime answers
+----------------------------------------
+Keeps watched realtime answers (weather, tickers, crypto, news) warm in
+memory so the realtime path can answer them without an upstream call.
+The watchlist comes from Data/Watchlist.json and/or is learned from the
+queries users keep repeating.
+
+Data/Watchlist.json:
+    {"items": ["weather in Pune", "stock price of tesla", "bitcoin price", "news about AI"]}
+"""
+
+import os
+import json
+import time
+import threading
+import ctypes
+
+try:
+    import psutil
+except ImportError:  # battery checks are skipped without psutil
+    psutil = None
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(ROOT_DIR, "Data")
+WATCHLIST_PATH = os.path.join(DATA_DIR, "Watchlist.json")
+QUERY_STATS_PATH = os.path.join(DATA_DIR, "QueryStats.json")
+
+# ---------- Defaults ----------
+# How long an answer stays fresh, per source (seconds)
+FRESH_FOR = {"weather": 600, "crypto": 60, "stock": 60, "news": 900}
+# Upstream budgets: at most `calls` per `per` seconds, per source
+RATE_LIMITS = {
+    "weather": {"calls": 50, "per": 60},     # OpenWeatherMap free tier: 60/min
+    "crypto":  {"calls": 10, "per": 60},     # CoinGecko public API
+    "stock":   {"calls": 30, "per": 60},
+    "news":    {"calls": 4,  "per": 3600},   # NewsAPI developer: 100/day
+}
+LEARN_MIN_COUNT = 3      # repeats before a query is auto-watched
+LEARN_MAX_ITEMS = 8
+IDLE_AFTER = 15 * 60     # seconds without input before we slow down
+IDLE_BACKOFF = 6         # interval multiplier when idle
+BATTERY_BACKOFF = 4      # interval multiplier on battery
+
+# -------------------- Cache --------------------
+
+class PrefetchCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (answer, fetched_at, fresh_for)
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+        if not item:
+            return None
+        answer, fetched_at, fresh_for = item
+        if time.time() - fetched_at > fresh_for:
+            return None
+        return answer
+
+    def put(self, key, answer, fresh_for):
+        with self._lock:
+            self._data[key] = (answer, time.time(), fresh_for)
+
+# -------------------- Rate Limiting --------------------
+
+class RateLimiter:
+    """Sliding-window limiter per source."""
+
+    def __init__(self, limits=None):
+        self.limits = limits or RATE_LIMITS
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def try_acquire(self, source) -> bool:
+        limit = self.limits.get(source)
+        if not limit:
+            return True
+        now = time.time()
+        with self._lock:
+            calls = [t for t in self._calls.get(source, []) if now - t < limit["per"]]
+            if len(calls) >= limit["calls"]:
+                self._calls[source] = calls
+                return False
+            calls.append(now)
+            self._calls[source] = calls
+            return True
+
+# -------------------- Power / Idle --------------------
+
+def _idle_seconds() -> float:
+    """Seconds since the last keyboard/mouse input (Windows only, else 0)."""
+    if os.name != "nt":
+        return 0.0
+    try:
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info))
+        return (ctypes.windll.kernel32.GetTickCount() - info.dwTime) / 1000.0
+    except Exception:
+        return 0.0
+
+def _on_battery() -> bool:
+    if psutil is None:
+        return False
+    try:
+        battery = psutil.sensors_battery()
+        return bool(battery and not battery.power_plugged)
+    except Exception:
+        return False
+
+def backoff_factor() -> float:
+    factor = 1.0
+    if _on_battery():
+        factor *= BATTERY_BACKOFF
+    if _idle_seconds() > IDLE_AFTER:
+        factor *= IDLE_BACKOFF
+    return factor
+
+# -------------------- Scheduler --------------------
+
+class Prefetcher:
+    """
+    resolve(query) -> (key, source, fetch) or None, where fetch() returns the
+    answer string. The same resolver is used by the realtime path, so a
+    prefetched answer is found under the same key the user's query maps to.
+    """
+
+    def __init__(self, resolve, watchlist_path=WATCHLIST_PATH, stats_path=QUERY_STATS_PATH):
+        self.resolve = resolve
+        self.watchlist_path = watchlist_path
+        self.stats_path = stats_path
+        self.cache = PrefetchCache()
+        self.limiter = RateLimiter()
+        self._counts = self._load_counts()
+        self._counts_dirty = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_due = {}  # query -> timestamp
+        self._routes = {}    # query -> resolved route, so refreshes skip lookups
+        self.stats = {"hits": 0, "misses": 0, "hit_time": 0.0, "miss_time": 0.0}
+
+    # ---------- Watchlist ----------
+    def _load_counts(self):
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _configured(self):
+        try:
+            with open(self.watchlist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return []
+        items = data.get("items", []) if isinstance(data, dict) else data
+        return [item if isinstance(item, str) else item.get("query", "") for item in items]
+
+    def watchlist(self):
+        with self._lock:
+            learned = sorted(self._counts.items(), key=lambda kv: kv[1], reverse=True)
+        learned = [q for q, n in learned if n >= LEARN_MIN_COUNT][:LEARN_MAX_ITEMS]
+        seen, items = set(), []
+        for query in self._configured() + learned:
+            if query and query not in seen:
+                seen.add(query)
+                items.append(query)
+        return items
+
+    def record(self, query):
+        """Count a realtime query so frequent ones get watched automatically."""
+        query = query.strip().lower().rstrip("?.!")
+        with self._lock:
+            self._counts[query] = self._counts.get(query, 0) + 1
+            self._counts_dirty = True
+        self._wake.set()
+
+    def _save_counts(self):
+        with self._lock:
+            if not self._counts_dirty:
+                return
+            counts = dict(self._counts)
+            self._counts_dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.stats_path), exist_ok=True)
+            with open(self.stats_path, "w", encoding="utf-8") as f:
+                json.dump(counts, f, indent=2)
+        except Exception:
+            pass
+
+    # ---------- Realtime path ----------
+    def answer(self, query):
+        """Serve from memory when warm, else fetch upstream and keep the result."""
+        start = time.perf_counter()
+        route = self.resolve(query)
+        if route is None:
+            return None
+        key, source, fetch = route
+        self.record(query)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count("hit", time.perf_counter() - start)
+            return cached
+
+        answer = fetch()
+        self.limiter.try_acquire(source)  # user calls count against the budget too
+        if not answer.startswith("⚠️"):
+            self.cache.put(key, answer, FRESH_FOR.get(source, 60))
+        self._count("miss", time.perf_counter() - start)
+        return answer
+
+    def _count(self, kind, elapsed):
+        with self._lock:
+            self.stats["hits" if kind == "hit" else "misses"] += 1
+            self.stats[f"{kind}_time"] += elapsed
+
+    def report(self) -> str:
+        with self._lock:
+            s = dict(self.stats)
+        hit_ms = s["hit_time"] / s["hits"] * 1000 if s["hits"] else 0
+        miss_ms = s["miss_time"] / s["misses"] * 1000 if s["misses"] else 0
+        return (f"⚡ Prefetch: {s['hits']} hits (avg {hit_ms:.2f} ms), "
+                f"{s['misses']} upstream (avg {miss_ms:.0f} ms)")
+
+    # ---------- Background refresh ----------
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._save_counts()
+
+    def refresh_once(self):
+        """Refresh every watched item that is due. Returns seconds until the next one."""
+        now = time.time()
+        factor = backoff_factor()
+        next_wake = 300.0
+        for query in self.watchlist():
+            if query not in self._routes:
+                self._routes[query] = self.resolve(query)
+            route = self._routes[query]
+            if route is None:
+                continue
+            key, source, fetch = route
+            due = self._next_due.get(query, 0)
+            if due <= now:
+                if self.limiter.try_acquire(source):
+                    try:
+                        answer = fetch()
+                    except Exception:
+                        answer = "⚠️"
+                    fresh_for = FRESH_FOR.get(source, 60)
+                    if not answer.startswith("⚠️"):
+                        # Keep it valid until shortly after the next refresh
+                        self.cache.put(key, answer, fresh_for * factor + 30)
+                    due = now + fresh_for * 0.8 * factor
+                else:
+                    due = now + 5  # over budget: try again shortly
+                self._next_due[query] = due
+            next_wake = min(next_wake, due - now)
+        return max(1.0, next_wake)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._save_counts()
+                wait = self.refresh_once()
+            except Exception as e:
+                print(f"⚠️ Prefetch error: {e}")
+                wait = 60
+            self._wake.wait(wait)
+            self._wake.clear()
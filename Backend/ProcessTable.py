@@ -0,0 +1,177 @@
+# Backend/ProcessTable.py
+"""
+Process table snapshots for close_application
+---------------------------------------------
+Takes one snapshot of the running processes per command (or reuses one that
+is at most SNAPSHOT_TTL seconds old), matches every candidate name against
+it in memory and kills whole process trees through psutil, without
+spawning tasklist/taskkill for each candidate.
+"""
+
+import os
+import csv
+import io
+import time
+import threading
+import subprocess
+
+try:
+    import psutil
+except ImportError:  # falls back to one tasklist call per snapshot
+    psutil = None
+
+SNAPSHOT_TTL = 1.0  # seconds
+
+# -------------------- Providers --------------------
+
+def psutil_processes():
+    """[(pid, ppid, name)] for every visible process."""
+    procs = []
+    for p in psutil.process_iter(["pid", "ppid", "name"]):
+        info = p.info
+        procs.append((info["pid"], info.get("ppid") or 0, info.get("name") or ""))
+    return procs
+
+def tasklist_processes():
+    """Windows fallback without psutil: one tasklist call, no parent ids."""
+    flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    out = subprocess.check_output(["tasklist", "/FO", "CSV", "/NH"], creationflags=flags)
+    procs = []
+    for row in csv.reader(io.StringIO(out.decode(errors="ignore"))):
+        if len(row) >= 2 and row[1].isdigit():
+            procs.append((int(row[1]), 0, row[0]))
+    return procs
+
+def psutil_kill(pid):
+    psutil.Process(pid).kill()
+
+def taskkill_tree(pid):
+    flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], check=True, creationflags=flags)
+
+# -------------------- Table --------------------
+
+class ProcessTable:
+    """
+    provider() -> [(pid, ppid, name)], kill(pid) -> None.
+    Both are pluggable so the matching logic can run against a fake table.
+    """
+
+    def __init__(self, provider=None, kill=None, ttl=SNAPSHOT_TTL):
+        if provider is None:
+            provider = psutil_processes if psutil else tasklist_processes
+        if kill is None:
+            kill = psutil_kill if psutil else taskkill_tree
+        self.provider = provider
+        self.kill = kill
+        # taskkill /T already takes the children with it
+        self.kills_tree = kill is taskkill_tree
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._taken_at = 0.0
+
+    def snapshot(self, fresh=False):
+        with self._lock:
+            if fresh or self._snapshot is None or time.monotonic() - self._taken_at > self.ttl:
+                self._snapshot = self.provider()
+                self._taken_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def find(self, names):
+        """{candidate name: [pids]} for the candidates that are running."""
+        wanted = {n.lower(): n for n in names}
+        found = {}
+        for pid, _, name in self.snapshot():
+            original = wanted.get(name.lower())
+            if original:
+                found.setdefault(original, []).append(pid)
+        return found
+
+    def is_running(self, name) -> bool:
+        return bool(self.find([name]))
+
+    def descendants(self, pid):
+        children = {}
+        for child, parent, _ in self.snapshot():
+            children.setdefault(parent, []).append(child)
+        out, stack = [], [pid]
+        while stack:
+            for child in children.get(stack.pop(), []):
+                if child not in out and child != pid:
+                    out.append(child)
+                    stack.append(child)
+        return out
+
+    def kill_tree(self, pid):
+        """Kill pid and its descendants (children first). Returns error strings."""
+        victims = [pid] if self.kills_tree else list(reversed(self.descendants(pid))) + [pid]
+        errors = []
+        for victim in victims:
+            try:
+                self.kill(victim)
+            except Exception as e:
+                if psutil and isinstance(e, psutil.NoSuchProcess):
+                    continue  # already gone with its parent
+                errors.append(f"{victim}: {e}")
+        return errors
+
+    def kill_all(self, names):
+        """
+        Kill every running process tree matching `names` using one snapshot.
+        Returns (killed_names, errors).
+        """
+        running = self.find(names)
+        killed, errors = [], []
+        done = set()
+        for name, pids in running.items():
+            ok = False
+            for pid in pids:
+                if pid in done:
+                    continue
+                errs = self.kill_tree(pid)
+                done.add(pid)
+                done.update(self.descendants(pid))
+                if errs:
+                    errors.extend(f"{name}: {e}" for e in errs)
+                else:
+                    ok = True
+            if ok:
+                killed.append(name)
+        self.invalidate()
+        return killed, errors
+
+# -------------- CLI (benchmark) --------------
+if __name__ == "__main__":
+    import sys
+    candidates = ["msedge.exe", "chrome.exe", "firefox.exe"]
+
+    # Fake table: a browser with a renderer tree, killed in memory
+    fake = [(1, 0, "explorer.exe"), (10, 1, "chrome.exe"), (11, 10, "chrome.exe"),
+            (12, 11, "chrome.exe"), (20, 1, "notepad.exe")]
+    killed_pids = []
+    table = ProcessTable(provider=lambda: list(fake), kill=killed_pids.append)
+    result = table.kill_all(candidates)
+    print(f"🧪 Fake table: {result} killed pids {killed_pids}")
+    # The whole chrome tree goes, children before the parent; nothing else is touched
+    if result != (["chrome.exe"], []) or killed_pids != [12, 11, 10]:
+        print("❌ Expected (['chrome.exe'], []) and pids [12, 11, 10]")
+        sys.exit(1)
+
+    if psutil or os.name == "nt":
+        table = ProcessTable()
+        t = time.perf_counter()
+        table.snapshot(fresh=True)
+        table.find(candidates)
+        snap = time.perf_counter() - t
+        print(f"⏱ One snapshot + in-memory match of {len(candidates)} candidates: {snap * 1000:.1f} ms")
+        if os.name == "nt":
+            t = time.perf_counter()
+            for proc in candidates:
+                out = subprocess.check_output(["tasklist"], creationflags=subprocess.CREATE_NO_WINDOW)
+                proc.lower() in out.decode(errors="ignore").lower()
+            print(f"⏱ One tasklist per candidate (old path): {(time.perf_counter() - t) * 1000:.1f} ms")
@@ -0,0 +1,201 @@
+# Backend/QueryDecomposer.py
+"""
+Multi-intent query splitting
+----------------------------
+Splits compound requests ("weather in Pune and bitcoin price and news about AI")
+into sub-intents, answers them concurrently on the matching backends and
+merges the answers back in the order the user asked for them.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+DebugTimings = (env_vars.get("DebugTimings") or os.environ.get("DebugTimings") or "false").lower() == "true"
+
+# ---------- Routing keywords (priority: automation > realtime > chat) ----------
+AUTOMATION_TRIGGERS = (
+    "open", "launch", "close", "create a folder",
+    "create pdf from recent downloads", "whatsapp", "ppt", "presentation"
+)
+REALTIME_KEYWORDS = (
+    "weather", "news", "stock", "stock price", "crypto",
+    "bitcoin", "ethereum", "solana", "dogecoin"
+)
+# Fragments starting like this are questions of their own, not a continuation
+CHAT_STARTERS = (
+    "what", "who", "why", "how", "when", "where", "which", "tell me", "explain",
+    "define", "describe", "give me", "can you", "is ", "are ", "do ", "does "
+)
+KINDS = ("automation", "realtime", "chat")
+
+_SEPARATORS = re.compile(r"\s*(?:[,;]|\band then\b|\bthen\b|\balso\b|\band\b)\s*", re.IGNORECASE)
+# Automation payloads run to the end of the utterance ("... message hi and how are you",
+# "presentation on X and Y"); Automation.plan_commands splits them itself
+_PAYLOAD = re.compile(r"\b(?:whatsapp|send message|message to|write|ppt|presentation|essay|letter|application|email)\b"
+                      r"[^,;]*?(?:\bmessage\b|\bsaying\b|\bto say\b|\bthat says\b|\bon\b|\babout\b|\btopic\b|:)",
+                      re.IGNORECASE)
+# "between X and Y" / "compare X and Y" is one question, not two
+_PAIRED = re.compile(r"\b(?:between|compare|comparing)\b[^,;]*?\band\b", re.IGNORECASE)
+
+_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="intent")
+
+# -------------------- Classification --------------------
+
+def classify(text: str) -> str:
+    low = text.lower().strip()
+    if any(trig in low for trig in AUTOMATION_TRIGGERS):
+        return "automation"
+    if any(k in low for k in REALTIME_KEYWORDS):
+        return "realtime"
+    return "chat"
+
+def _has_own_intent(fragment: str) -> bool:
+    low = fragment.lower().strip()
+    return classify(low) != "chat" or low.startswith(CHAT_STARTERS)
+
+def _leads_with_intent(fragment: str) -> bool:
+    """True when the intent word opens the fragment ("news about AI", not "development news")."""
+    low = fragment.lower().strip()
+    return low.startswith(AUTOMATION_TRIGGERS + REALTIME_KEYWORDS + CHAT_STARTERS)
+
+# -------------------- Splitting --------------------
+
+def split_intents(text: str) -> list:
+    """
+    Return [(kind, sub_query)] in the order they were asked.
+    A fragment without an intent of its own stays glued to a neighbour: to
+    the one before it ("open chrome and spotify"), or to the one after it
+    when it opens the query or is "and"-ed onto a phrase whose intent word
+    comes last ("research and development news"). Neighbouring automation
+    steps stay together so Automation can plan them as one command, and
+    nothing after an automation payload marker ("message", "saying", "on",
+    "about" ...) or inside "between X and Y" is split off.
+    """
+    protected = [(m.end(), len(text)) for m in _PAYLOAD.finditer(text)
+                 if classify(text[:m.end()]) == "automation"]
+    protected += [m.span() for m in _PAIRED.finditer(text)]
+
+    pieces = []
+    pos = 0
+    for match in _SEPARATORS.finditer(text):
+        if any(start <= match.start() < end for start, end in protected):
+            continue
+        pieces.append((text[pos:match.start()], match.group(0)))
+        pos = match.end()
+    pieces.append((text[pos:], ""))
+
+    fragments = []  # [text, joiner-before-next]
+    carry = ""      # intent-less text waiting for the fragment after it
+    for i, (fragment, sep) in enumerate(pieces):
+        if not fragment.strip():
+            if carry:
+                carry += sep
+            elif fragments:
+                fragments[-1][1] += sep
+            continue
+        fragment, carry = carry + fragment, ""
+        if _has_own_intent(fragment):
+            fragments.append([fragment, sep])
+            continue
+        following = next((f for f, _ in pieces[i + 1:] if f.strip()), "")
+        glue_forward = following and (
+            not fragments
+            or (sep.strip().lower() == "and" and _has_own_intent(following) and not _leads_with_intent(following))
+        )
+        if glue_forward:
+            carry = fragment + sep
+        elif fragments:
+            fragments[-1][0] += fragments[-1][1] + fragment
+            fragments[-1][1] = sep
+        else:
+            fragments.append([fragment, sep])
+
+    intents = []
+    for i, (fragment, _) in enumerate(fragments):
+        kind = classify(fragment)
+        if intents and kind == "automation" and intents[-1][0] == "automation":
+            joiner = fragments[i - 1][1]
+            intents[-1] = (kind, intents[-1][1] + joiner + fragment.strip())
+        else:
+            intents.append((kind, fragment.strip()))
+    return intents or [(classify(text), text)]
+
+# -------------------- Fan-out --------------------
+
+def _timed(handler, query):
+    start = time.perf_counter()
+    try:
+        answer = handler(query)
+    except Exception as e:
+        answer = f"⚠️ Error: {e}"
+    return answer, time.perf_counter() - start
+
+def answer_query(text: str, handlers: dict) -> str:
+    """
+    Route `text` to handlers[kind] for every sub-intent. Sub-intents run
+    concurrently, so the total latency is the slowest one, not the sum.
+    """
+    intents = split_intents(text)
+    if len(intents) == 1:
+        kind, query = intents[0]
+        # Single intent: keep the user's exact wording
+        return handlers[kind](text)
+
+    start = time.perf_counter()
+    futures = [_pool.submit(_timed, handlers[kind], query) for kind, query in intents]
+    results = [f.result() for f in futures]
+    total = time.perf_counter() - start
+
+    if DebugTimings:
+        slowest = max(secs for _, secs in results)
+        print(f"⏱ {len(intents)} intents in {total * 1000:.0f} ms "
+              f"(slowest {slowest * 1000:.0f} ms, serial would be {sum(s for _, s in results) * 1000:.0f} ms)")
+    return "\n\n".join(str(answer).strip() for answer, _ in results)
+
+# Query -> expected [(kind, sub_query)] (checked with --check)
+SPLIT_CASES = [
+    ("weather in Pune and bitcoin price and news about AI",
+     [("realtime", "weather in Pune"), ("realtime", "bitcoin price"), ("realtime", "news about AI")]),
+    ("open chrome and spotify then what is a black hole",
+     [("automation", "open chrome and spotify"), ("chat", "what is a black hole")]),
+    ("research and development news", [("realtime", "research and development news")]),
+    ("weather in delhi, research and development news",
+     [("realtime", "weather in delhi"), ("realtime", "research and development news")]),
+    ("salt and pepper", [("chat", "salt and pepper")]),
+    ("tell me about salt and pepper", [("chat", "tell me about salt and pepper")]),
+    ("send whatsapp to dad message check the news and weather",
+     [("automation", "send whatsapp to dad message check the news and weather")]),
+    ("whatsapp message to mom hi and how are you", [("automation", "whatsapp message to mom hi and how are you")]),
+    ("create a presentation on the weather and news industry",
+     [("automation", "create a presentation on the weather and news industry")]),
+    ("what is the difference between news and weather",
+     [("realtime", "what is the difference between news and weather")]),
+    ("weather in pune and send whatsapp to mom message hi and bye",
+     [("realtime", "weather in pune"), ("automation", "send whatsapp to mom message hi and bye")]),
+]
+
+def _check_splits():
+    failures = 0
+    for text, expected in SPLIT_CASES:
+        got = split_intents(text)
+        ok = got == expected
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {text!r} -> {got}")
+    return failures
+
+# -------------- CLI --------------
+if __name__ == "__main__":
+    import sys
+
+    if "--check" in sys.argv:
+        sys.exit(1 if _check_splits() else 0)
+    while True:
+        text = input("Query: ").strip()
+        if text.lower() in ["exit", "quit", "bye"]:
+            break
+        for kind, query in split_intents(text):
+            print(f"  [{kind}] {query}")
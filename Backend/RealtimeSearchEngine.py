@@ -1,12 +1,21 @@
-from googlesearch import search
 from groq import Groq
-from json import load, dump
+from json import load, loads, dumps
 import datetime
+import os
+import time
+import threading
 from dotenv import dotenv_values
 import yfinance as yf
 import requests
 import re   # ✅ For city extraction
 
+try:
+    from Backend.WebSearch import search_and_extract, format_timings
+    from Backend.Prefetch import Prefetcher
+except ImportError:  # run as a script from Backend/
+    from WebSearch import search_and_extract, format_timings
+    from Prefetch import Prefetcher
+
 # 🔹 Load environment variables
 env_vars = dotenv_values(".env")
 Username = env_vars.get("Username")
@@ -14,6 +23,7 @@ Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 WeatherAPI = env_vars.get("WeatherAPI")   # OpenWeatherMap API key
 NewsAPI = env_vars.get("NewsAPI")         # NewsAPI key
+DebugTimings = (env_vars.get("DebugTimings") or "false").lower() == "true"   # print per-stage search latency
 
 client = Groq(api_key=GroqAPIKey)
 
@@ -22,12 +32,14 @@ System = f"""Hello, I am {Username}, You are a very accurate and advanced AI cha
 *** Provide answers in a professional way, with proper grammar. ***
 *** Use real-time data when available. ***"""
 
-try:
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-except:
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
+# 🔹 Chat history lives next to the other project data (works on any OS)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(ROOT_DIR, "Data")
+CHATLOG_PATH = os.path.join(DATA_DIR, "ChatLog.jsonl")
+LEGACY_CHATLOG_PATH = os.path.join(DATA_DIR, "ChatLog.json")
+MAX_HISTORY = 5         # messages sent to the LLM (incl. the new prompt)
+KEEP_IN_MEMORY = 20     # messages kept per session
+COMPACT_AFTER = 1000    # rewrite the log once it grows past this many lines
 
 # -------------------- Real-Time APIs --------------------
 
@@ -148,12 +160,18 @@ def get_news(topic: str = "technology") -> str:
 
 # -------------------- Location Detection --------------------
 
+_user_city = None
+
 def get_user_location() -> str:
-    """Detect user's city using IP address"""
+    """Detect user's city using IP address (looked up once per run)"""
+    global _user_city
+    if _user_city:
+        return _user_city
     try:
         res = requests.get("http://ip-api.com/json/").json()
         if res.get("status") == "success":
-            return res.get("city", "Delhi")
+            _user_city = res.get("city", "Delhi")
+            return _user_city
         return "Delhi"
     except:
         return "Delhi"
@@ -162,10 +180,16 @@ def get_user_location() -> str:
 
 def GoogleSearch(query):
     try:
-        results = search(query, num=5, stop=5, pause=2)
+        result = search_and_extract(query)
+        if DebugTimings:
+            print(f"⏱ Search stages: {format_timings(result['timings'])}")
         Answer = f"The search results for '{query}' are:\n[start]\n"
-        for url in results:
-            Answer += f"- {url}\n"
+        if result["digest"]:
+            Answer += result["digest"]
+        else:
+            # Nothing extracted in time: fall back to the bare links
+            for url in result["urls"]:
+                Answer += f"- {url}\n"
         Answer += "[end]"
         return Answer
     except Exception as e:
@@ -176,6 +200,63 @@ def AnswerModifier(Answer):
     non_empty_lines = [line for line in lines if line.strip()]
     return '\n'.join(non_empty_lines)
 
+class StreamingAnswerModifier:
+    """
+    Incremental AnswerModifier for streamed text: blank lines are dropped,
+    "</s>" is removed and outer whitespace is trimmed, while text is released
+    as soon as it can no longer change. Joining every feed()/flush() output
+    gives AnswerModifier(answer.replace("</s>", "").strip()). That is, "</s>"
+    is removed before trimming, so the whitespace next to a leading or
+    trailing "</s>" goes too. The old strip-then-replace order kept it.
+    """
+
+    EOS = "</s>"
+
+    def __init__(self):
+        self._tail = ""          # possible start of a split "</s>"
+        self._indent = ""        # leading whitespace of a line with no text yet
+        self._spaces = ""        # whitespace that may turn out to be trailing
+        self._line_has_text = False
+        self._newline_due = ""     # line break (plus trailing spaces) owed
+        self._started = False
+
+    def feed(self, delta, final=False):
+        text = (self._tail + delta).replace(self.EOS, "")
+        self._tail = ""
+        for n in range(len(self.EOS) - 1, 0, -1):
+            if not final and text.endswith(self.EOS[:n]):
+                text, self._tail = text[:-n], text[-n:]
+                break
+
+        out = []
+        for ch in text:
+            if ch == "\n":
+                if self._line_has_text:
+                    self._newline_due = self._spaces + "\n"
+                self._indent = self._spaces = ""
+                self._line_has_text = False
+            elif ch.isspace():
+                if self._line_has_text:
+                    self._spaces += ch
+                else:
+                    self._indent += ch
+            else:
+                if not self._line_has_text:
+                    if self._newline_due:
+                        out.append(self._newline_due)
+                        self._newline_due = ""
+                    if self._started:
+                        out.append(self._indent)
+                    self._indent = ""
+                    self._line_has_text = True
+                out.append(self._spaces + ch)
+                self._spaces = ""
+                self._started = True
+        return "".join(out)
+
+    def flush(self):
+        return self.feed("", final=True)
+
 def Information():
     now = datetime.datetime.now()
     return (
@@ -193,79 +274,314 @@ SystemChatBot = [
     {"role": "assistant", "content": "Hello, how can I help you?"}
 ]
 
-# -------------------- Main Search Engine --------------------
+# -------------------- Conversation Session --------------------
+
+class ChatLogStore:
+    """
+    Append-only JSON Lines chat log. Each finished exchange is appended as
+    one write, so concurrent sessions never rewrite each other's history.
+    """
+
+    def __init__(self, path=CHATLOG_PATH, legacy_path=LEGACY_CHATLOG_PATH):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._lock = threading.Lock()
+        self._lines = None
+
+    def load(self, limit=KEEP_IN_MEMORY):
+        with self._lock:
+            if not os.path.exists(self.path):
+                self._migrate_legacy()
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    lines = [line for line in f if line.strip()]
+            except FileNotFoundError:
+                lines = []
+            self._lines = len(lines)
+            history = []
+            for line in lines[-limit:]:
+                try:
+                    history.append(loads(line))
+                except ValueError:
+                    continue  # torn write from a crash; skip it
+            return history
+
+    def append(self, *entries):
+        data = "".join(dumps(e, ensure_ascii=False) + "\n" for e in entries)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+            if self._lines is not None:
+                self._lines += len(entries)
+                if self._lines > COMPACT_AFTER:
+                    self._compact()
+
+    def _compact(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            keep = [line for line in f if line.strip()][-KEEP_IN_MEMORY:]
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(keep)
+        os.replace(tmp, self.path)
+        self._lines = len(keep)
+
+    def _migrate_legacy(self):
+        """Seed the new log from the old ChatLog.json, if there is one."""
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                old = load(f)
+        except Exception:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            for entry in old[-KEEP_IN_MEMORY:]:
+                f.write(dumps(entry, ensure_ascii=False) + "\n")
+
+
+class RealtimeSession:
+    """
+    Owns the system prompt and message history for the Google + Groq fallback.
+    Every query builds its own prompt list, so concurrent calls from threads
+    or a server never see each other's search results.
+    """
+
+    def __init__(self, system_messages=None, store=None, llm=None, search=None):
+        self.system_messages = [dict(m) for m in (system_messages or SystemChatBot)]
+        self.store = store or ChatLogStore()
+        self.llm = llm or client
+        self.search = search or GoogleSearch
+        self._lock = threading.Lock()
+        self._history = self.store.load(KEEP_IN_MEMORY)
+
+    @property
+    def history(self):
+        with self._lock:
+            return list(self._history)
+
+    def build_messages(self, prompt, search_results):
+        with self._lock:
+            recent = self._history[-(MAX_HISTORY - 1):]
+        return (
+            self.system_messages
+            + [{"role": "system", "content": search_results}]
+            + [{"role": "system", "content": Information()}]
+            + recent
+            + [{"role": "user", "content": f"{prompt}"}]
+        )
+
+    def ask(self, prompt):
+        return "".join(self.ask_stream(prompt))
+
+    def ask_stream(self, prompt, timings=None):
+        """
+        Yield cleaned answer deltas as the LLM streams them. If `timings` is
+        a dict it receives first_delta and total (seconds since the call).
+        """
+        start = time.perf_counter()
+        messages = self.build_messages(prompt, self.search(prompt))
+
+        completion = self.llm.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=1024,
+            top_p=1,
+            stream=True
+        )
+
+        Answer = ""
+        cleaner = StreamingAnswerModifier()
+        for chunk in completion:
+            content = chunk.choices[0].delta.content
+            if not content:
+                continue
+            Answer += content
+            delta = cleaner.feed(content)
+            if delta:
+                if timings is not None and "first_delta" not in timings:
+                    timings["first_delta"] = time.perf_counter() - start
+                yield delta
+        delta = cleaner.flush()
+        if delta:
+            yield delta
+
+        if timings is not None:
+            timings["total"] = time.perf_counter() - start
+        self._record(prompt, Answer.replace("</s>", "").strip())
+
+    def _record(self, prompt, answer):
+        exchange = (
+            {"role": "user", "content": f"{prompt}"},
+            {"role": "assistant", "content": answer},
+        )
+        # The pair goes in together so history never interleaves two queries
+        with self._lock:
+            self._history.extend(exchange)
+            if len(self._history) > KEEP_IN_MEMORY:
+                del self._history[:-KEEP_IN_MEMORY]
+        self.store.append(*exchange)
+
+
+_default_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    global _default_session
+    with _session_lock:
+        if _default_session is None:
+            _default_session = RealtimeSession()
+        return _default_session
+
+# -------------------- Realtime Routing --------------------
+
+def route_realtime(prompt):
+    """
+    Map a prompt to (cache_key, source, fetch) for the direct realtime APIs,
+    or None when it should go to the Google + Groq fallback.
+    """
+    low = prompt.lower()
 
-def RealtimeSearchEngine(prompt):
-    global SystemChatBot, messages
-    
     # 🔎 Stock price queries
-    if "stock" in prompt.lower() or "price" in prompt.lower():
-        match = re.search(r"stock price of ([a-zA-Z\s]+)", prompt.lower())
+    if "stock" in low or "price" in low:
+        match = re.search(r"stock price of ([a-zA-Z\s]+)", low)
         company = match.group(1).strip() if match else prompt
-        ticker = find_ticker(company)
-        if ticker:
-            return get_stock_price(ticker)
-        else:
+        known = next((t for name, t in STOCK_TICKERS.items() if name in company.lower()), None)
+
+        def fetch_stock():
+            ticker = known or find_ticker(company)
+            if ticker:
+                return get_stock_price(ticker)
             return f"⚠️ Could not find stock ticker for {company}."
-    
+        return f"stock:{known or company.lower()}", "stock", fetch_stock
+
     # 🔎 Crypto queries
-    if "crypto" in prompt.lower() or "bitcoin" in prompt.lower() or "ethereum" in prompt.lower():
+    if "crypto" in low or "bitcoin" in low or "ethereum" in low:
         coin = find_crypto(prompt)
-        return get_crypto_price(coin)
-    
+        return f"crypto:{coin}", "crypto", lambda: get_crypto_price(coin)
+
     # 🔎 Weather queries
-    if "weather" in prompt.lower():
-        match = re.search(r"weather (?:in|of) ([a-zA-Z\s]+)", prompt.lower())
+    if "weather" in low:
+        match = re.search(r"weather (?:in|of) ([a-zA-Z\s]+)", low)
         if match:
             city = match.group(1).strip().title()
         else:
             city = get_user_location()
-        return get_weather(city)
-    
+        return f"weather:{city.lower()}", "weather", lambda: get_weather(city)
+
     # 🔎 News queries
-    if "news" in prompt.lower():
-        topic = prompt.split("news about")[-1].strip() if "news about" in prompt.lower() else "technology"
-        return get_news(topic)
-    
+    if "news" in low:
+        topic = prompt.split("news about")[-1].strip() if "news about" in low else "technology"
+        return f"news:{topic.lower()}", "news", lambda: get_news(topic)
+
+    return None
+
+
+prefetcher = Prefetcher(route_realtime)
+
+def start_prefetch():
+    """Start keeping watched realtime answers warm in the background."""
+    prefetcher.start()
+
+def stop_prefetch():
+    prefetcher.stop()
+
+# -------------------- Main Search Engine --------------------
+
+def RealtimeSearchEngine(prompt, session=None):
+    # 🔎 Stock / crypto / weather / news, served from memory when prefetched
+    answer = prefetcher.answer(prompt)
+    if answer is not None:
+        return answer
+
     # 🔹 Otherwise fall back to Google + Groq
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-    
-    messages.append({"role": "user", "content": f"{prompt}"})
-
-    MAX_HISTORY = 5
-    messages_to_send = messages[-MAX_HISTORY:]
-    SystemChatBot.append({"role": "system", "content": GoogleSearch(prompt)})
-
-    completion = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages_to_send,
-        temperature=0.7,
-        max_tokens=1024,
-        top_p=1,
-        stream=True
-    )
+    return (session or get_session()).ask(prompt)
+
+def RealtimeSearchEngineStream(prompt, session=None, timings=None):
+    """Like RealtimeSearchEngine, but yields the answer as cleaned deltas."""
+    start = time.perf_counter()
+    answer = prefetcher.answer(prompt)
+    if answer is not None:
+        if timings is not None:
+            timings["first_delta"] = timings["total"] = time.perf_counter() - start
+        yield answer
+        return
+    yield from (session or get_session()).ask_stream(prompt, timings)
+
+# -------------------- Stress Check --------------------
+
+def _stress_check(n=300, workers=32):
+    """
+    Fire n concurrent fallback queries at one session backed by a fake Groq
+    and verify every prompt carried only its own search results, and that
+    the log reads back every exchange from disk.
+    """
+    import tempfile
+    from types import SimpleNamespace
+    from concurrent.futures import ThreadPoolExecutor
+
+    class FakeGroq:
+        def __init__(self):
+            self.chat = SimpleNamespace(completions=self)
+            self.bad = []
+
+        def create(self, messages, **kwargs):
+            query = messages[-1]["content"]
+            searches = [m["content"] for m in messages if m["content"].startswith("[search:")]
+            if searches != [f"[search:{query}]"]:
+                self.bad.append(query)
+            time.sleep(0.001)  # let other threads interleave
+            for piece in ("answer ", f"for {query}"):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    fake = FakeGroq()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChatLogStore(os.path.join(tmp, "log.jsonl"), os.path.join(tmp, "missing.json"))
+        session = RealtimeSession(store=store, llm=fake, search=lambda q: f"[search:{q}]")
+        queries = [f"q{i}" for i in range(n)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            answers = list(pool.map(session.ask, queries))
+
+        wrong = [q for q, a in zip(queries, answers) if a != f"answer for {q}"]
+        pairs = store.load(limit=2 * n)
+        torn = [i for i in range(0, len(pairs), 2)
+                if f"for {pairs[i]['content']}" not in pairs[i + 1]["content"]]
+        # A fresh store on the same file must read back exactly what was asked
+        reloaded = ChatLogStore(store.path, store.legacy_path).load(limit=2 * n)
+        expected = {(q, f"answer for {q}") for q in queries}
+        got = {(reloaded[i]["content"], reloaded[i + 1]["content"]) for i in range(0, len(reloaded) - 1, 2)}
+        round_trip = len(reloaded) == 2 * n and got == expected
 
-    Answer = ""
-    for chunk in completion:
-        if chunk.choices[0].delta.content:
-            Answer += chunk.choices[0].delta.content
-    
-    Answer = Answer.strip().replace("</s>", "")
-    messages.append({"role": "assistant", "content": Answer})
-    
-    if len(messages) > 20:
-        messages = messages[-20:]
-    
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump(messages, f, indent=4)
-    
-    SystemChatBot.pop()
-    return AnswerModifier(Answer)
+    print(f"🧪 {n} concurrent queries: {len(fake.bad)} contaminated prompts, "
+          f"{len(wrong)} wrong answers, {len(torn)} interleaved log entries, "
+          f"log round trip {'ok' if round_trip else 'FAILED'} ({len(reloaded)}/{2 * n} entries)")
+    return not (fake.bad or wrong or torn) and round_trip
+
+def _ttft_check(prompt):
+    """Time-to-first-token: full-buffer answer vs the streamed one."""
+    start = time.perf_counter()
+    get_session().ask(prompt)
+    buffered = time.perf_counter() - start
+
+    timings = {}
+    for _ in get_session().ask_stream(prompt, timings):
+        pass
+    print(f"⏱ Full buffer: first text after {buffered * 1000:.0f} ms")
+    print(f"⏱ Streaming:   first text after {timings.get('first_delta', 0) * 1000:.0f} ms "
+          f"(done after {timings.get('total', 0) * 1000:.0f} ms)")
 
 # -------------------- Run --------------------
 if __name__ == "__main__":
+    import sys
+    if "--stress" in sys.argv:
+        sys.exit(0 if _stress_check() else 1)
+    if "--ttft" in sys.argv:
+        _ttft_check(input("Enter your query: "))
+        sys.exit(0)
+
+    start_prefetch()
     while True:
         prompt = input("Enter your query: ")
         print(f"\n📝 Query: {prompt}\n")
         print(f"💡 Answer:\n{RealtimeSearchEngine(prompt)}\n")
+        print(prefetcher.report())
@@ -7,8 +7,15 @@ import datetime  # ✅ for time-based greeting
 # ✅ Ensure Backend folder is in sys.path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from Backend.SpeechToSpeech import SpeechToText, TTS, TTS_STOP_FLAG, stop_tts
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
+from Backend.SpeechToSpeech import (
+    SpeechToText, TTS, TTS_STOP_FLAG, stop_tts, pause_tts, resume_tts, is_pause_command
+)
+from Backend.RealtimeSearchEngine import (
+    RealtimeSearchEngine, RealtimeSearchEngineStream, start_prefetch, prefetcher
+)
+from Backend.QueryDecomposer import answer_query, split_intents, KINDS
+from Backend.SpeechPipeline import TextFeed
+from Backend.SpeechBudget import condense_for_speech, format_savings, within_budget
 
 # ✅ Greeting config
 USERNAME = "Harsh"
@@ -34,11 +41,14 @@ def voice_search_loop():
     recognizer = sr.Recognizer()
     microphone = sr.Microphone()
     exit_keywords = ["exit", "quit", "bye"]
-    stop_keywords = ["stop", "pause", "be quiet", "chup", "mute"]
+    stop_keywords = ["stop", "be quiet", "chup", "mute"]
     resume_keywords = ["resume", "continue", "bol", "speak"]
     last_text = ""
     last_answer = ""   # ✅ always holds the latest answer
 
+    # ✅ Warm up watched realtime answers while the greeting plays
+    start_prefetch()
+
     # ✅ Speak greeting first
     greet_user()
 
@@ -58,21 +68,29 @@ def voice_search_loop():
             if any(word in lower_query for word in exit_keywords):
                 print("Exiting voice search...")
                 TTS_STOP_FLAG = True
-                stop_tts()
+                stop_tts(everything=True)
                 break
 
-            # Pause TTS
+            # Pause TTS where it is
+            if is_pause_command(lower_query):
+                print("⏸ TTS paused. Say 'resume' to continue.")
+                pause_tts()
+                continue
+
+            # Stop TTS
             if any(word in lower_query for word in stop_keywords):
-                print("⏸ TTS paused. Say 'resume' to continue speaking the latest answer.")
+                print("⏹ TTS stopped. Say 'resume' to continue speaking the latest answer.")
                 TTS_STOP_FLAG = True
-                stop_tts()
+                stop_tts(everything=True)
                 continue
 
             # Resume TTS → continue speaking the latest answer
             if any(word in lower_query for word in resume_keywords):
                 print("▶️ Resuming TTS with the latest answer.")
                 TTS_STOP_FLAG = False
-                if last_answer:
+                if resume_tts():
+                    pass  # picked up mid-sentence
+                elif last_answer:
                     stop_tts()
                     TTS(last_answer)  # ✅ continue speaking the newest answer
                 else:
@@ -85,18 +103,43 @@ def voice_search_loop():
             last_text = query
 
             print(f"🔍 Searching for: {query}")
+            spoken = False
             try:
-                answer = RealtimeSearchEngine(query)
+                if len(split_intents(query)) > 1:
+                    # Every sub-intent goes to the realtime engine here
+                    answer = answer_query(query, dict.fromkeys(KINDS, RealtimeSearchEngine))
+                    print(f"💡 Answer:\n{answer}")
+                else:
+                    # Print the answer as it streams in, speaking each finished sentence
+                    # until the speech budget is used up (the rest stays on screen)
+                    print("💡 Answer:")
+                    answer = ""
+                    feed = TextFeed()
+                    if not TTS_STOP_FLAG:
+                        TTS(within_budget(feed))
+                        spoken = True
+                    try:
+                        for delta in RealtimeSearchEngineStream(query):
+                            print(delta, end="", flush=True)
+                            answer += delta
+                            feed.put(delta)
+                    finally:
+                        feed.close()
+                    print()
             except Exception as e:
                 answer = f"⚠️ Error fetching result: {str(e)}"
+                spoken = False
+                print(f"💡 Answer:\n{answer}")
 
-            print(f"💡 Answer:\n{answer}")
+            print(prefetcher.report())
             last_answer = answer  # ✅ always update with latest result
 
-            # Speak only if TTS is not paused
-            if not TTS_STOP_FLAG:
+            # Speak only if TTS is not paused (and not already speaking the stream)
+            if not TTS_STOP_FLAG and not spoken:
+                speech, info = condense_for_speech(answer)
+                print(format_savings(info))
                 stop_tts()
-                TTS(answer)
+                TTS(speech)
 
 # -------------------- Run --------------------
 if __name__ == "__main__":
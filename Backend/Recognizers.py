@@ -0,0 +1,405 @@
+# Backend/Recognizers.py
+"""
+Speech-recognition backends
+---------------------------
+SpeechToText and the GUI's STTWorker ask a backend for text instead of
+calling recognize_google() directly:
+
+    google   Google Web Speech (network; the old behaviour and the default)
+    vosk     Vosk/Kaldi model on the CPU (offline; model loaded lazily or at startup)
+    sphinx   PocketSphinx through speech_recognition (offline, no model download)
+    hybrid   local engine for short commands, Google for long dictation; the
+             local engine when Google can't be reached and Google when the
+             local engine fails, or hears nothing in audio that has speech in it
+
+Pick one with SpeechRecognizer=<name> in .env. Every backend takes 16-bit
+mono PCM and returns "" when nothing was understood. Failures raise
+sr.RequestError. Each backend records its real-time factor (processing time
+/ audio length).
+"""
+
+import os
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from dotenv import dotenv_values
+
+import speech_recognition as sr
+
+env_vars = dotenv_values(".env")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# ---------- Settings ----------
+BACKEND = (env_vars.get("SpeechRecognizer") or "google").lower()
+LANGUAGE = env_vars.get("SpeechLanguage") or "en-US"
+VOSK_MODEL_PATH = env_vars.get("VoskModelPath") or os.path.join(ROOT_DIR, "Data", "Models", "vosk-model-small-en-us-0.15")
+PRELOAD = (env_vars.get("PreloadRecognizer") or "false").lower() == "true"
+HYBRID_SHORT_SECONDS = float(env_vars.get("HybridShortSeconds") or 3.0)
+HYBRID_MIN_VOICED = float(env_vars.get("HybridMinVoicedSeconds") or 0.3)   # speech worth a second listen
+SAMPLE_RATE = 16000
+
+
+class RecognizerBackend(ABC):
+    name = "backend"
+    local = False
+
+    def __init__(self):
+        self._load_lock = threading.Lock()
+        self.loaded = False
+        self.load_seconds = 0.0
+        self.stats = {"utterances": 0, "audio_s": 0.0, "busy_s": 0.0, "failed": 0}
+
+    # ---------- Subclass hooks ----------
+    def _load(self):
+        """Load models (called once, lazily or from preload())."""
+
+    @abstractmethod
+    def _recognize(self, pcm, rate) -> str:
+        """Transcribe 16-bit mono PCM; '' when nothing was understood."""
+
+    def available(self) -> bool:
+        return True
+
+    # ---------- Public API ----------
+    def load(self):
+        with self._load_lock:
+            if not self.loaded:
+                start = time.perf_counter()
+                self._load()
+                self.load_seconds = time.perf_counter() - start
+                self.loaded = True
+        return self
+
+    def preload(self):
+        """Load in the background so the first utterance doesn't pay for it."""
+        def run():
+            try:
+                self.load()
+            except Exception as e:
+                print(f"⚠️ {self.name} model failed to load: {e}")
+        threading.Thread(target=run, name=f"load-{self.name}", daemon=True).start()
+        return self
+
+    def recognize(self, pcm, rate=SAMPLE_RATE) -> str:
+        self.load()
+        start = time.perf_counter()
+        try:
+            text = self._recognize(pcm, rate)
+        except sr.UnknownValueError:
+            text = ""
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        self.stats["utterances"] += 1
+        self.stats["audio_s"] += len(pcm) / 2 / rate
+        self.stats["busy_s"] += time.perf_counter() - start
+        return text.strip()
+
+    def recognize_audio(self, audio: sr.AudioData) -> str:
+        """Same for an AudioData from recognizer.listen()."""
+        return self.recognize(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2), SAMPLE_RATE)
+
+    @property
+    def rtf(self) -> float:
+        return self.stats["busy_s"] / self.stats["audio_s"] if self.stats["audio_s"] else 0.0
+
+    def report(self) -> str:
+        load = f", model load {self.load_seconds:.1f}s" if self.local and self.loaded else ""
+        return (f"{self.name}: {self.stats['utterances']} utterances, RTF {self.rtf:.2f}, "
+                f"{self.stats['failed']} failed{load}")
+
+
+class GoogleBackend(RecognizerBackend):
+    name = "google"
+
+    def __init__(self, language=LANGUAGE):
+        super().__init__()
+        self.language = language
+        self._recognizer = sr.Recognizer()
+
+    def _recognize(self, pcm, rate):
+        return self._recognizer.recognize_google(sr.AudioData(pcm, rate, 2), language=self.language)
+
+
+class VoskBackend(RecognizerBackend):
+    name = "vosk"
+    local = True
+
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        super().__init__()
+        self.model_path = model_path
+        self._model = None
+
+    def available(self) -> bool:
+        try:
+            import vosk  # noqa: F401
+        except ImportError:
+            return False
+        return os.path.isdir(self.model_path)
+
+    def _load(self):
+        try:
+            import vosk
+        except ImportError:
+            raise sr.RequestError("vosk is not installed (pip install vosk)")
+        if not os.path.isdir(self.model_path):
+            raise sr.RequestError(f"Vosk model not found at {self.model_path} (set VoskModelPath)")
+        vosk.SetLogLevel(-1)
+        self._model = vosk.Model(self.model_path)
+
+    def _recognize(self, pcm, rate):
+        import vosk
+        # A recognizer per utterance: cheap next to the model, and thread-safe
+        recognizer = vosk.KaldiRecognizer(self._model, rate)
+        recognizer.AcceptWaveform(pcm)
+        return json.loads(recognizer.FinalResult()).get("text", "")
+
+
+class SphinxBackend(RecognizerBackend):
+    name = "sphinx"
+    local = True
+
+    def __init__(self):
+        super().__init__()
+        self._recognizer = sr.Recognizer()
+
+    def available(self) -> bool:
+        try:
+            import pocketsphinx  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _recognize(self, pcm, rate):
+        return self._recognizer.recognize_sphinx(sr.AudioData(pcm, rate, 2))
+
+
+def voiced_seconds(pcm, rate):
+    """Seconds of the segment the streaming VAD calls speech."""
+    try:
+        from Backend.StreamingSTT import make_vad, frame_bytes, FRAME_MS
+    except ImportError:
+        from StreamingSTT import make_vad, frame_bytes, FRAME_MS
+    vad, size = make_vad(), frame_bytes(rate)
+    voiced = sum(vad.is_speech(pcm[i:i + size], rate) for i in range(0, len(pcm) - size + 1, size))
+    return voiced * FRAME_MS / 1000
+
+
+class HybridBackend(RecognizerBackend):
+    name = "hybrid"
+
+    def __init__(self, local=None, remote=None, short_seconds=HYBRID_SHORT_SECONDS,
+                 min_voiced=HYBRID_MIN_VOICED):
+        super().__init__()
+        self.local_backend = local or make_local_backend()
+        self.remote = remote or GoogleBackend()
+        self.short_seconds = short_seconds
+        self.min_voiced = min_voiced
+        self.routed = {"local": 0, "remote": 0, "fallback": 0, "retried": 0}
+
+    def _load(self):
+        if self.local_backend is not None:
+            self.local_backend.load()
+
+    def _recognize(self, pcm, rate):
+        seconds = len(pcm) / 2 / rate
+        if self.local_backend is None:
+            self.routed["remote"] += 1
+            return self.remote.recognize(pcm, rate)
+        if seconds <= self.short_seconds:
+            local_error = None
+            try:
+                text = self.local_backend.recognize(pcm, rate)
+            except Exception as e:
+                print(f"⚠️ {self.local_backend.name} failed ({e}), using Google")
+                local_error, text = e, ""
+            if text:
+                self.routed["local"] += 1
+                return text
+            if local_error is None and voiced_seconds(pcm, rate) < self.min_voiced:
+                self.routed["local"] += 1
+                return ""   # a cough or a click: not worth a network round trip
+            # Local engine failed, or missed real speech: Google gets a second listen
+            self.routed["retried"] += 1
+            try:
+                return self.remote.recognize(pcm, rate)
+            except sr.RequestError:
+                if local_error is not None:
+                    raise
+                return ""
+        try:
+            text = self.remote.recognize(pcm, rate)
+            self.routed["remote"] += 1
+            return text
+        except sr.RequestError as e:
+            # Offline: long dictation goes to the local engine too
+            print(f"⚠️ Google unavailable ({e}), using {self.local_backend.name}")
+            self.routed["fallback"] += 1
+            return self.local_backend.recognize(pcm, rate)
+
+    def report(self) -> str:
+        parts = [super().report(), f"routed {self.routed}", self.remote.report()]
+        if self.local_backend is not None:
+            parts.append(self.local_backend.report())
+        return " | ".join(parts)
+
+
+def make_local_backend():
+    """Vosk if it and its model are installed, else PocketSphinx, else None."""
+    for backend in (VoskBackend(), SphinxBackend()):
+        if backend.available():
+            return backend
+    return None
+
+BACKENDS = {"google": GoogleBackend, "vosk": VoskBackend, "sphinx": SphinxBackend, "hybrid": HybridBackend}
+
+def make_backend(name):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"unknown speech recognizer {name!r} (choose from {', '.join(BACKENDS)})")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_recognizer_backend() -> RecognizerBackend:
+    """The configured backend; local models start loading now when PreloadRecognizer=true."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            try:
+                _backend = make_backend(BACKEND)
+            except ValueError as e:
+                print(f"⚠️ {e}; using google")
+                _backend = GoogleBackend()
+            if PRELOAD:
+                _backend.preload()
+        return _backend
+
+# ---------- Benchmark helpers ----------
+def _words(text):
+    return "".join(c if c.isalnum() or c == "'" else " " for c in text.lower()).split()
+
+def word_errors(reference, hypothesis):
+    """(edit distance in words, reference word count)."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1], len(ref)
+
+def load_fixtures(paths):
+    """[(name, pcm, transcript)] from WAVs with a sidecar .txt transcript (directories are scanned)."""
+    try:
+        from Backend.StreamingSTT import WavSource
+    except ImportError:
+        from StreamingSTT import WavSource
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(".wav"))
+        else:
+            files.append(path)
+    fixtures = []
+    for wav in files:
+        txt = os.path.splitext(wav)[0] + ".txt"
+        if not os.path.exists(txt):
+            print(f"⚠️ Skipping {wav}: no transcript {os.path.basename(txt)}")
+            continue
+        with open(txt, encoding="utf-8") as f:
+            fixtures.append((os.path.basename(wav), WavSource(wav, tail_silence=0).pcm(), f.read().strip()))
+    return fixtures
+
+def benchmark(backend, fixtures):
+    """
+    Word error rate and real-time factor over the fixtures. Fixtures with an
+    empty transcript (silence, noise) count the words invented from them.
+    """
+    errors = words = invented = 0
+    backend.load()
+    for name, pcm, reference in fixtures:
+        try:
+            hypothesis = backend.recognize(pcm, SAMPLE_RATE)
+        except sr.RequestError as e:
+            print(f"   ⚠️ {backend.name} / {name}: {e}")
+            hypothesis = ""
+        e, n = word_errors(reference, hypothesis)
+        if n:
+            errors += e
+            words += n
+        else:
+            invented += e
+    return {"wer": errors / words if words else None, "invented": invented, "rtf": backend.rtf,
+            "audio_s": backend.stats["audio_s"], "load_s": backend.load_seconds}
+
+def make_fixtures(out_dir, sentences, voice="en-US-JennyNeural"):
+    """Write 16 kHz mono WAV + .txt pairs with edge-tts (needs network)."""
+    import wave
+    import pygame
+    try:
+        from Backend.SpeechService import get_speech_service
+    except ImportError:
+        from SpeechService import get_speech_service
+    from io import BytesIO
+    pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1)
+    os.makedirs(out_dir, exist_ok=True)
+    for i, sentence in enumerate(sentences, 1):
+        mp3 = get_speech_service().synthesize(sentence, voice)
+        pcm = pygame.mixer.Sound(file=BytesIO(mp3)).get_raw()
+        base = os.path.join(out_dir, f"fixture_{i:02d}")
+        with wave.open(base + ".wav", "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            w.writeframes(pcm)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(sentence)
+    return out_dir
+
+# -------------- CLI --------------
+FIXTURE_DIR = os.path.join(ROOT_DIR, "Data", "STTFixtures")
+FIXTURE_SENTENCES = [
+    "open youtube", "what time is it", "close chrome", "play some music", "stop",
+    "send a message to my brother on whatsapp",
+    "write an application to my principal asking for two days of leave because I have a fever",
+    "create a presentation on climate change with five slides and some pictures of glaciers",
+]
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    names = next((a.split("=", 1)[1] for a in sys.argv if a.startswith("--backends=")), "google,vosk,sphinx,hybrid")
+
+    if "--make-fixtures" in sys.argv:
+        print(f"🎙 Writing fixtures to {make_fixtures(FIXTURE_DIR, FIXTURE_SENTENCES)}")
+
+    paths = args or ([FIXTURE_DIR] if os.path.isdir(FIXTURE_DIR) else [])
+    fixtures = load_fixtures(paths)
+    if not fixtures:
+        print(f"⚠️ No fixtures. Put name.wav + name.txt pairs in {FIXTURE_DIR} "
+              f"(or run with --make-fixtures, needs network) and pass paths to override.")
+        sys.exit(1)
+
+    total = sum(len(pcm) / 2 / SAMPLE_RATE for _, pcm, _ in fixtures)
+    print(f"🧪 {len(fixtures)} fixtures, {total:.1f}s of audio")
+    for name in names.split(","):
+        backend = make_backend(name.strip())
+        if not backend.available():
+            print(f"   {backend.name:>7}: not installed")
+            continue
+        try:
+            result = benchmark(backend, fixtures)
+        except sr.RequestError as e:
+            print(f"   {backend.name:>7}: unavailable ({e})")
+            continue
+        load = f" | model load {result['load_s']:.1f}s" if backend.local else ""
+        wer = "  n/a" if result["wer"] is None else f"{result['wer'] * 100:5.1f}%"
+        print(f"   {backend.name:>7}: WER {wer} | {result['invented']} words from non-speech | "
+              f"RTF {result['rtf']:.2f}{load}")
+        if isinstance(backend, HybridBackend):
+            print(f"            routed {backend.routed}")
@@ -0,0 +1,181 @@
+# Backend/SpeechBudget.py
+"""
+Speech-length budget
+--------------------
+Long answers are shown in full but spoken as a condensed version that fits
+SPEECH_BUDGET_SECONDS. The condensed text is built by a small local
+extractive summariser (sentence scoring by content-word frequency, first
+sentence always kept, original order preserved), so it costs a few
+milliseconds and no network call. A streamed answer can't be summarised
+before it is spoken, so within_budget() speaks it up to the budget instead,
+ending on a sentence boundary with the same pointer to the chat screen.
+"""
+
+import os
+import re
+import random
+from collections import Counter
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+
+# ---------- Budget ----------
+SPEECH_BUDGET_SECONDS = float(env_vars.get("SpeechBudgetSeconds") or os.environ.get("SpeechBudgetSeconds") or 20)
+CHARS_PER_SECOND = 15.0      # typical neural-voice speaking rate
+SYNTH_MS_PER_CHAR = 6.0      # edge-tts estimate when no measurements exist yet
+
+SCREEN_POINTERS = [
+    "The rest of the result has been printed to the chat screen, kindly check it out sir.",
+    "Please check the chat screen for the remaining text, sir.",
+    "You'll find the rest of the answer on the chat screen, sir.",
+    "The continuation of the text is available on the chat screen, sir.",
+]
+
+STOPWORDS = set("""
+a an the and or but if then than so to of in on at by for with from as is are was were be been being
+it its this that these those there here i you he she we they me him her us them my your his our their
+do does did have has had not no yes can could will would should may might must shall about into over
+also just very more most some any all each such only own same other which who whom what when where why how
+""".split())
+
+_URL = re.compile(r"https?://\S+|www\.\S+")
+_MARKUP = re.compile(r"[*_`#>|]+")
+_BULLET = re.compile(r"^\s*(?:[-•*]|\d+[.)])\s+", re.M)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9']+")
+_SENTENCE_END = re.compile(r"[.!?](?=\s)|\n")
+
+
+def budget_chars(seconds=None) -> int:
+    return int((SPEECH_BUDGET_SECONDS if seconds is None else seconds) * CHARS_PER_SECOND)
+
+def estimate_seconds(text) -> float:
+    return len(text) / CHARS_PER_SECOND
+
+def _speakable_sentences(text):
+    """Strip links and markdown; bullet lines become sentences."""
+    text = _URL.sub("", text)
+    text = _BULLET.sub("", text)
+    text = _MARKUP.sub("", text)
+    sentences = []
+    for part in _SENTENCE.split(text):
+        part = re.sub(r"\s+", " ", part).strip(" -:;,")
+        if len(part) < 2:
+            continue
+        if part[-1] not in ".!?":
+            part += "."
+        sentences.append(part)
+    return sentences
+
+def _trim_words(sentence, limit):
+    if len(sentence) <= limit:
+        return sentence
+    cut = sentence[:limit].rsplit(" ", 1)[0].rstrip(",;:")
+    return cut + "..."
+
+def summarize(text, max_chars) -> str:
+    """Extractive summary of at most max_chars (sentences kept in order)."""
+    sentences = _speakable_sentences(text)
+    if not sentences:
+        return ""
+    if sum(len(s) + 1 for s in sentences) <= max_chars:
+        return " ".join(sentences)
+
+    words = [[w for w in _WORD.findall(s.lower()) if w not in STOPWORDS] for s in sentences]
+    freq = Counter(w for ws in words for w in set(ws))
+    scores = []
+    for i, ws in enumerate(words):
+        score = sum(freq[w] for w in set(ws)) / (len(ws) ** 0.5 if ws else 1)
+        score *= 1.0 + 0.5 / (i + 1)  # earlier sentences carry the gist
+        scores.append(score)
+
+    first = _trim_words(sentences[0], max_chars)
+    chosen, used = {0}, len(first) + 1
+    for i in sorted(range(1, len(sentences)), key=lambda i: -scores[i]):
+        if used + len(sentences[i]) + 1 <= max_chars:
+            chosen.add(i)
+            used += len(sentences[i]) + 1
+    return " ".join(first if i == 0 else sentences[i] for i in sorted(chosen))
+
+def condense_for_speech(text, seconds=None, pointer=True):
+    """
+    (spoken_text, info). Within budget the text is spoken as-is (minus links
+    and markup); otherwise an extractive summary plus a pointer to the chat
+    screen. info: full_chars, spoken_chars, condensed, saved_seconds.
+    """
+    limit = budget_chars(seconds)
+    full = " ".join(_speakable_sentences(text)) or text
+    info = {"full_chars": len(full), "condensed": False}
+    if len(full) <= limit:
+        spoken = full
+    else:
+        suffix = random.choice(SCREEN_POINTERS) if pointer else ""
+        spoken = (summarize(text, max(60, limit - len(suffix) - 1)) + " " + suffix).strip()
+        info["condensed"] = True
+    info["spoken_chars"] = len(spoken)
+    info["saved_seconds"] = max(0.0, estimate_seconds(full) - estimate_seconds(spoken))
+    return spoken, info
+
+def within_budget(deltas, seconds=None, pointer=True):
+    """
+    Streamed deltas -> whole sentences until the budget is used up, then the
+    chat-screen pointer. The first sentence is always spoken. Stops reading
+    `deltas` once the budget is reached; the caller keeps feeding its own
+    copy of the answer for the screen.
+    """
+    suffix = " " + random.choice(SCREEN_POINTERS) if pointer else ""
+    limit = max(60, budget_chars(seconds) - len(suffix))   # room for the pointer, as in condense_for_speech
+    used, pending = 0, ""
+
+    def fits(sentence):
+        return not used or used + len(_URL.sub("", sentence).strip()) <= limit
+
+    for delta in deltas:
+        pending += delta
+        while True:
+            end = _SENTENCE_END.search(pending)
+            if not end:
+                break
+            sentence, pending = pending[:end.end()], pending[end.end():]
+            if not fits(sentence):
+                if suffix:
+                    yield suffix
+                return
+            used += len(_URL.sub("", sentence).strip())
+            yield sentence
+    if pending.strip():
+        if fits(pending):
+            yield pending
+        elif suffix:
+            yield suffix
+
+def format_savings(info, synth_ms_per_char=None) -> str:
+    """One-line per-turn report: audio and synthesis time saved."""
+    if not info.get("condensed"):
+        return f"🗣 Speech budget: spoke all {info['full_chars']} chars"
+    ms_per_char = synth_ms_per_char or SYNTH_MS_PER_CHAR
+    saved_chars = info["full_chars"] - info["spoken_chars"]
+    return (f"🗣 Speech budget: spoke {info['spoken_chars']}/{info['full_chars']} chars | "
+            f"~{info['saved_seconds']:.0f}s of audio and ~{saved_chars * ms_per_char / 1000:.1f}s "
+            f"of synthesis saved")
+
+# -------------- CLI --------------
+if __name__ == "__main__":
+    import sys
+    import time
+    piped = "" if sys.stdin.isatty() else sys.stdin.read()
+    sample = piped.strip() or (
+        "## Today's headlines\n"
+        "- The central bank kept interest rates unchanged at 6.5 percent on Thursday, citing sticky food inflation.\n"
+        "- Analysts had expected the bank to hold rates, although some predicted a cut later this year.\n"
+        "- Markets rose slightly after the decision, with the main index gaining 0.4 percent.\n"
+        "- In sports, the national cricket team won the series 2-1 after a close final match.\n"
+        "- Weather: heavy rain is expected in coastal regions through the weekend, see https://example.com/weather.\n"
+        "The bank said inflation should ease in the second half of the year as harvests improve. "
+        "It also raised its growth forecast to 7 percent, pointing to strong services demand."
+    )
+    t = time.perf_counter()
+    spoken, info = condense_for_speech(sample)
+    ms = (time.perf_counter() - t) * 1000
+    print(f"📝 Spoken ({ms:.1f} ms to condense):\n{spoken}\n")
+    print(format_savings(info))
@@ -0,0 +1,163 @@
+# Backend/SpeechCache.py
+"""
+Disk cache for synthesized speech
+---------------------------------
+Audio is stored under Data/SpeechCache keyed by SHA-256 of (text, voice,
+rate, pitch), so the startup greeting, canned replies and "check the chat
+screen" lines are synthesized once and then played with no network call.
+A file's mtime doubles as its last-used time; the least recently used
+files are dropped once the cache grows past MAX_BYTES. Audio is handed out
+as bytes for the mixer to play from memory.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.path.join(ROOT_DIR, "Data", "SpeechCache")
+
+MAX_BYTES = 64 * 1024 * 1024
+MAX_TEXT_CHARS = 400   # long one-off answers aren't worth keeping
+
+
+class SpeechCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES, ext=".mp3"):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ext = ext
+        self._lock = threading.Lock()
+        self._sizes = self._scan()
+        self.stats = {"hits": 0, "misses": 0, "hit_ms": [], "miss_ms": []}
+
+    def _scan(self):
+        sizes = {}
+        if os.path.isdir(self.root):
+            for sub in os.scandir(self.root):
+                if sub.is_dir():
+                    for entry in os.scandir(sub.path):
+                        if entry.name.endswith(self.ext):
+                            sizes[entry.path] = entry.stat().st_size
+        return sizes
+
+    @staticmethod
+    def key(text, voice, rate, pitch) -> str:
+        raw = json.dumps([text.strip(), voice, rate, pitch], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.root, key[:2], key + self.ext)
+
+    # ---------- Lookup / store ----------
+    def lookup(self, key):
+        """Cached audio for key (marked as just used) or None."""
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def store(self, key, data: bytes):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._sizes[path] = len(data)
+            self._evict()
+        return path
+
+    def _evict(self):
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+        def used(p):
+            try:
+                return os.path.getmtime(p)
+            except OSError:
+                return 0
+        for path in sorted(self._sizes, key=used):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= self._sizes.pop(path)
+
+    def _record(self, hit, start):
+        ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.stats["hits" if hit else "misses"] += 1
+            bucket = self.stats["hit_ms" if hit else "miss_ms"]
+            bucket.append(ms)
+            del bucket[:-200]  # recent samples only
+
+    # ---------- Main entry ----------
+    def get_bytes(self, text, voice, rate, pitch, synth) -> bytes:
+        """
+        Audio for this utterance. On a miss synth(text) -> bytes is called
+        (e.g. edge-tts) and the result stored; long texts and audio marked
+        cacheable=False (offline fallback voice) are passed through without
+        touching the disk.
+        """
+        start = time.perf_counter()
+        key = self.key(text, voice, rate, pitch)
+        data = self.lookup(key)
+        if data is not None:
+            self._record(True, start)
+            return data
+
+        data = synth(text)
+        if len(text) <= MAX_TEXT_CHARS and getattr(data, "cacheable", True):
+            self.store(key, data)
+        self._record(False, start)
+        return data
+
+    def report(self) -> str:
+        with self._lock:
+            hits, misses = self.stats["hits"], self.stats["misses"]
+            avg = lambda xs: sum(xs) / len(xs) if xs else 0.0
+            total = hits + misses
+            return (f"🔊 Speech cache: {hits} hits / {misses} misses "
+                    f"({(hits / total * 100) if total else 0:.0f}% hit rate) | time-to-audio "
+                    f"hit {avg(self.stats['hit_ms']):.1f} ms, miss {avg(self.stats['miss_ms']):.0f} ms | "
+                    f"{len(self._sizes)} clips, {sum(self._sizes.values()) / 1e6:.1f} MB")
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_speech_cache() -> SpeechCache:
+    """Process-wide cache shared by SpeechToSpeech and TextToSpeech."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SpeechCache()
+        return _shared
+
+# -------------- CLI (hit-rate check with a stand-in synthesizer) --------------
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    def fake_synth(text):
+        time.sleep(0.05)  # stand-in for one edge-tts round trip
+        return os.urandom(16 * 1024)
+
+    phrases = ["Good Morning Sir, what's your plan today?", "Okay, working on it.",
+               "Please check the chat screen for the remaining text, sir.", "Let me take care of that."]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SpeechCache(root=tmp, max_bytes=1024 * 1024)
+        rnd = random.Random(3)
+        for i in range(40):
+            text = rnd.choice(phrases) if rnd.random() < 0.8 else f"One-off answer number {i}."
+            cache.get_bytes(text, "en-US-JennyNeural", "-15%", "-2Hz", fake_synth)
+        print(cache.report())
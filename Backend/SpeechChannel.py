@@ -0,0 +1,94 @@
+# Backend/SpeechChannel.py
+"""
+Offline speech renderer (pyttsx3)
+---------------------------------
+One background thread owns a single pyttsx3 engine, created lazily on first
+use, and renders queued lines to WAV bytes in order. It is the offline
+backend of SpeechEngines; nothing here drives an audio device, all playback
+goes through the AudioEngine.
+"""
+
+import os
+import queue
+import tempfile
+import threading
+
+# ---------- Voice settings (female voice is usually index 1) ----------
+VOICE_INDEX = 1
+RATE = 160
+VOLUME = 1.0
+
+
+class SpeechChannel:
+    def __init__(self, voice_index=VOICE_INDEX, rate=RATE, volume=VOLUME):
+        self.voice_index = voice_index
+        self.rate = rate
+        self.volume = volume
+        self._queue = queue.Queue()
+        self._engine = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    # ---------- Engine (created once, on the speaking thread) ----------
+    def _get_engine(self):
+        if self._engine is None:
+            import pyttsx3
+            engine = pyttsx3.init()
+            voices = engine.getProperty('voices')
+            if voices:
+                engine.setProperty('voice', voices[min(self.voice_index, len(voices) - 1)].id)
+            engine.setProperty('rate', self.rate)
+            engine.setProperty('volume', self.volume)
+            self._engine = engine
+        return self._engine
+
+    def _ensure_thread(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="speech-channel", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            text, done, out_path = self._queue.get()
+            try:
+                engine = self._get_engine()
+                engine.save_to_file(text, out_path)
+                engine.runAndWait()
+            except Exception as e:
+                print(f"⚠️ Speech error: {e}")
+            finally:
+                done.set()
+
+    # ---------- Public API ----------
+    def render(self, text) -> bytes:
+        """Synthesize text to WAV bytes (blocking) without playing it."""
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            done = threading.Event()
+            self._ensure_thread()
+            self._queue.put((text, done, path))
+            done.wait()
+            with open(path, "rb") as f:
+                data = f.read()
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if not data:
+            raise RuntimeError("pyttsx3 produced no audio")
+        return data
+
+
+_channel = None
+_channel_lock = threading.Lock()
+
+def get_speech_channel() -> SpeechChannel:
+    """The process-wide renderer behind the offline speech engine."""
+    global _channel
+    with _channel_lock:
+        if _channel is None:
+            _channel = SpeechChannel()
+        return _channel
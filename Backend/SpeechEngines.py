@@ -0,0 +1,289 @@
+# Backend/SpeechEngines.py
+"""
+Speech engines with latency-based selection
+-------------------------------------------
+Two engines produce audio bytes for the AudioEngine: edge-tts (remote,
+through the SpeechService loop) and pyttsx3 (local, rendered to WAV on the
+shared SpeechChannel thread). Each engine keeps a moving average of its
+synthesis latency. The router uses the remote voice by default and switches
+to the local one when the remote misses its deadline or fails. After
+repeated failures the remote engine rests for RETRY_AFTER seconds.
+Acknowledgements (fastest=True) always go to the engine that is currently
+fastest.
+
+Audio comes back as SynthesizedAudio: bytes that also carry the engine name
+and format. Local audio is marked not cacheable so the speech cache keeps
+only the remote voice.
+"""
+
+import time
+import threading
+import concurrent.futures
+from abc import ABC, abstractmethod
+
+try:
+    from Backend.SpeechService import get_speech_service, SYNTH_TIMEOUT
+    from Backend.SpeechChannel import get_speech_channel
+except ImportError:  # run as a script from Backend/
+    from SpeechService import get_speech_service, SYNTH_TIMEOUT
+    from SpeechChannel import get_speech_channel
+
+# ---------- Selection settings ----------
+DEADLINE_BASE = 2.0        # seconds the remote engine gets per chunk ...
+DEADLINE_PER_CHAR = 0.01   # ... plus this much per character
+MAX_STRIKES = 2            # misses/failures in a row before the remote engine rests
+RETRY_AFTER = 30.0         # seconds before a resting engine is tried again
+EWMA_WEIGHT = 0.3          # weight of the newest latency sample
+
+PRIOR_MS = 500.0           # latency guess until real samples exist; equal for both
+                           # engines so the first acks tie and go to the remote voice
+
+
+class SynthesizedAudio(bytes):
+    """Audio bytes tagged with the engine that made them."""
+
+    def __new__(cls, data, engine, format, cacheable=True):
+        obj = super().__new__(cls, data)
+        obj.engine = engine
+        obj.format = format
+        obj.cacheable = cacheable
+        return obj
+
+
+class SpeechEngine(ABC):
+    name = "engine"
+    format = "mp3"
+    cacheable = True
+    prior_ms = PRIOR_MS
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency_ms = None        # moving average, None until measured
+        self.stats = {"jobs": 0, "failed": 0, "misses": 0}
+        self.strikes = 0
+        self.down_until = 0.0
+
+    # ---------- Subclass hooks ----------
+    @abstractmethod
+    def submit(self, text, voice, rate, pitch):
+        """Start synthesis; returns a concurrent.futures.Future of bytes."""
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    # ---------- Bookkeeping ----------
+    def expected_ms(self) -> float:
+        return self.prior_ms if self.latency_ms is None else self.latency_ms
+
+    def _sample(self, ms):
+        with self._lock:
+            if self.latency_ms is None:
+                self.latency_ms = ms
+            else:
+                self.latency_ms += EWMA_WEIGHT * (ms - self.latency_ms)
+
+    def record_success(self, ms):
+        self._sample(ms)
+        with self._lock:
+            self.stats["jobs"] += 1
+            self.strikes = 0
+            self.down_until = 0.0
+
+    def record_strike(self, kind, ms=None):
+        """A miss (deadline passed) or a failure; enough in a row rests the engine."""
+        if ms is not None:
+            self._sample(ms)
+        with self._lock:
+            self.stats[kind] += 1
+            self.strikes += 1
+            if self.strikes >= MAX_STRIKES:
+                self.down_until = time.monotonic() + RETRY_AFTER
+
+    def wrap(self, data) -> SynthesizedAudio:
+        return SynthesizedAudio(data, self.name, self.format, self.cacheable)
+
+    def report(self) -> str:
+        state = "up" if self.available() else "resting"
+        return (f"{self.name}: {self.expected_ms():.0f} ms avg, {self.stats['jobs']} ok, "
+                f"{self.stats['misses']} missed, {self.stats['failed']} failed ({state})")
+
+
+class EdgeEngine(SpeechEngine):
+    name = "edge-tts"
+    format = "mp3"
+
+    def submit(self, text, voice, rate, pitch):
+        return get_speech_service().submit(text, voice, rate, pitch)
+
+
+class Pyttsx3Engine(SpeechEngine):
+    name = "pyttsx3"
+    format = "wav"
+    cacheable = False   # keep the cache for the remote voice
+
+    def __init__(self):
+        super().__init__()
+        self._installed = None
+        self._pool = None
+
+    def available(self) -> bool:
+        if self._installed is None:
+            try:
+                import pyttsx3  # noqa: F401
+                self._installed = True
+            except ImportError:
+                self._installed = False
+        return self._installed and super().available()
+
+    def submit(self, text, voice, rate, pitch):
+        # pyttsx3 only renders to files and isn't thread-safe: the channel's
+        # own thread does the work, this executor just hands back a Future
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="local-tts")
+        return self._pool.submit(get_speech_channel().render, text)
+
+
+class EngineRouter:
+    def __init__(self, remote=None, local=None):
+        self.remote = remote or EdgeEngine()
+        self.local = local or Pyttsx3Engine()
+        self.engines = [self.remote, self.local]
+        self.stats = {"fallbacks": 0, "fast_picks": {}}
+
+    @staticmethod
+    def deadline(text) -> float:
+        return DEADLINE_BASE + DEADLINE_PER_CHAR * len(text)
+
+    def _run(self, engine, text, voice, rate, pitch, timeout=None):
+        start = time.perf_counter()
+        future = engine.submit(text, voice, rate, pitch)
+        try:
+            data = future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            engine.record_strike("misses", (time.perf_counter() - start) * 1000)
+            # Let it finish in the background so its real latency is still learned
+            future.add_done_callback(lambda f, s=start: self._late(engine, f, s))
+            raise
+        except Exception:
+            engine.record_strike("failed")
+            raise
+        engine.record_success((time.perf_counter() - start) * 1000)
+        return engine.wrap(data)
+
+    @staticmethod
+    def _late(engine, future, start):
+        if not future.cancelled() and future.exception() is None:
+            engine._sample((time.perf_counter() - start) * 1000)
+
+    def fastest(self):
+        ready = [e for e in self.engines if e.available()] or [self.remote]
+        return min(ready, key=lambda e: e.expected_ms())
+
+    def synthesize(self, text, voice, rate, pitch, fastest=False) -> SynthesizedAudio:
+        """
+        Audio for one chunk. fastest=True (acknowledgements) uses whichever
+        engine is quickest right now; otherwise the remote voice is used
+        unless it is resting, misses its deadline or fails.
+        """
+        if fastest:
+            engine = self.fastest()
+            picks = self.stats["fast_picks"]
+            picks[engine.name] = picks.get(engine.name, 0) + 1
+            order = [engine] + [e for e in self.engines if e is not engine]
+        else:
+            order = self.engines
+
+        # Resting engines are skipped; if every engine rests, try them all anyway
+        candidates = [e for e in order if e.available()] or order
+        error = None
+        for engine in candidates:
+            timeout = self.deadline(text) if engine is not candidates[-1] else SYNTH_TIMEOUT
+            try:
+                audio = self._run(engine, text, voice, rate, pitch, timeout)
+                if engine is not order[0]:
+                    self.stats["fallbacks"] += 1
+                return audio
+            except Exception as e:
+                kind = "missed its deadline" if isinstance(e, concurrent.futures.TimeoutError) else f"failed: {e}"
+                print(f"⚠️ {engine.name} {kind}")
+                error = e
+        raise error or RuntimeError("no speech engine available")
+
+    def report(self) -> str:
+        picks = ", ".join(f"{k} {v}" for k, v in self.stats["fast_picks"].items()) or "none"
+        return (f"🎙 Speech engines: {' | '.join(e.report() for e in self.engines)} | "
+                f"{self.stats['fallbacks']} fallbacks | acks: {picks}")
+
+
+_router = None
+_router_lock = threading.Lock()
+
+def get_engine_router() -> EngineRouter:
+    """Process-wide router shared by SpeechToSpeech and TextToSpeech."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = EngineRouter()
+        return _router
+
+# -------------- CLI (simulated slow / down network) --------------
+if __name__ == "__main__":
+    import sys
+
+    class _Stub(SpeechEngine):
+        def __init__(self, name, ms, format="mp3", cacheable=True):
+            super().__init__()
+            self.name, self.ms, self.format, self.cacheable = name, ms, format, cacheable
+            self.prior_ms = ms
+            self.down = False
+            self._pool = concurrent.futures.ThreadPoolExecutor(4)
+
+        def submit(self, text, voice, rate, pitch):
+            def work():
+                time.sleep(self.ms / 1000)
+                if self.down:
+                    raise ConnectionError("network unreachable")
+                return b"\0" * len(text)
+            return self._pool.submit(work)
+
+    remote = _Stub("edge-tts", 400)
+    local = _Stub("pyttsx3", 120, "wav", cacheable=False)
+    router = EngineRouter(remote, local)
+    sentence = "The weather today is sunny with a light breeze."
+
+    def run(label, n=6, fastest=False):
+        start = time.perf_counter()
+        used = [router.synthesize(sentence, "voice", "+0%", "+0Hz", fastest=fastest).engine for _ in range(n)]
+        avg = (time.perf_counter() - start) / n
+        print(f"   {label:<40} {avg * 1000:6.0f} ms/chunk  engines: {', '.join(used)}")
+
+    print("⏱ Chunk latency by network condition:")
+    run("normal network")
+    run("acknowledgements", fastest=True)
+    remote.ms = 4000                      # slow: misses the ~2.5 s deadline
+    run(f"slow network (edge-tts alone: {remote.ms} ms)", n=3)
+    remote.ms, remote.down = 50, True     # down: fails fast, then rests
+    remote.down_until = 0.0               # rest over, try the remote again
+    run("network down")
+    print(router.report())
+
+    # Acks follow the measured averages: slow edge-tts EWMA -> pyttsx3, fast -> edge-tts
+    check = EngineRouter(_Stub("edge-tts", 10), _Stub("pyttsx3", 10, "wav", cacheable=False))
+    check.remote.prior_ms = check.local.prior_ms = PRIOR_MS
+    first_ack = check.fastest().name      # nothing measured yet
+    check.remote.latency_ms, check.local.latency_ms = 1500.0, 300.0
+    slow_ack = check.synthesize("Okay.", "voice", "+0%", "+0Hz", fastest=True).engine
+    answer = check.synthesize(sentence, "voice", "+0%", "+0Hz").engine
+    check.remote.latency_ms, check.local.latency_ms = 100.0, 300.0
+    fast_ack = check.synthesize("Okay.", "voice", "+0%", "+0Hz", fastest=True).engine
+    failures = [msg for ok, msg in (
+        (first_ack == "edge-tts", f"first ack before any samples went to {first_ack}"),
+        (slow_ack == "pyttsx3", f"ack with slow edge-tts went to {slow_ack}"),
+        (answer == "edge-tts", f"answer went to {answer}"),
+        (fast_ack == "edge-tts", f"ack with fast edge-tts went to {fast_ack}"),
+    ) if not ok]
+    for msg in failures:
+        print(f"❌ {msg}")
+    if failures:
+        sys.exit(1)
+    print("✅ Acks go to the fastest engine")
@@ -0,0 +1,241 @@
+# Backend/SpeechPipeline.py
+"""
+Sentence-pipelined speech
+-------------------------
+Text is cut into sentence/clause chunks; a synth thread prepares chunk N+1
+(and up to LOOKAHEAD chunks ahead) while chunk N plays, so the user hears
+the first sentence after one short synthesis instead of after the whole
+answer. Chunks always play in order. Input can be a finished string or an
+iterable of streamed deltas (see TextFeed), which lets speech start while
+the LLM is still writing.
+"""
+
+import re
+import time
+import queue
+import threading
+
+LOOKAHEAD = 2             # chunks synthesized ahead of playback
+FIRST_CHUNK_CHARS = 90    # keep the first chunk short: it decides time-to-first-audio
+MIN_CHUNK_CHARS = 40      # merge tiny sentences ("Sure.") with the next one
+MAX_CHUNK_CHARS = 240
+
+_BOUNDARY = re.compile(r"(?<=[.!?;:])\s+|\n+")
+_CLAUSE = re.compile(r"(?<=[,;:])\s+")
+
+_DONE = object()
+
+
+def _split_long(text, limit):
+    """Cut an over-long sentence at clause boundaries, then at spaces."""
+    out = []
+    while len(text) > limit:
+        window = text[:limit]
+        cuts = [m.end() for m in _CLAUSE.finditer(window)]
+        cut = cuts[-1] if cuts and cuts[-1] > limit // 3 else (window.rfind(" ") + 1 or limit)
+        out.append(text[:cut].strip())
+        text = text[cut:]
+    if text.strip():
+        out.append(text.strip())
+    return out
+
+def iter_chunks(source, first_max=FIRST_CHUNK_CHARS, min_chars=MIN_CHUNK_CHARS, max_chars=MAX_CHUNK_CHARS):
+    """Yield speakable chunks from a string or from an iterable of text deltas."""
+    deltas = [source] if isinstance(source, str) else source
+    buf, pending, emitted = "", "", 0
+
+    def ready(text):
+        nonlocal emitted
+        limit = first_max if emitted == 0 else max_chars
+        for part in _split_long(text, limit):
+            emitted += 1
+            yield part
+            limit = max_chars
+
+    for delta in deltas:
+        buf += delta
+        while True:
+            m = _BOUNDARY.search(buf)
+            if not m:
+                break
+            sentence, buf = buf[:m.start()].strip(), buf[m.end():]
+            if not sentence:
+                continue
+            pending = f"{pending} {sentence}".strip()
+            # The first sentence goes out at once; later ones are merged up to min_chars
+            if emitted == 0 or len(pending) >= min_chars:
+                yield from ready(pending)
+                pending = ""
+    rest = f"{pending} {buf.strip()}".strip()
+    if rest:
+        yield from ready(rest)
+
+
+class TextFeed:
+    """Iterable fed from another thread: put(delta) ... close()."""
+
+    def __init__(self):
+        self._q = queue.Queue()
+
+    def put(self, delta):
+        if delta:
+            self._q.put(delta)
+
+    def close(self):
+        self._q.put(_DONE)
+
+    def __iter__(self):
+        while True:
+            item = self._q.get()
+            if item is _DONE:
+                return
+            yield item
+
+
+class ClipPrefetcher:
+    """
+    Synthesizes chunks of `source` on a helper thread, at most `lookahead`
+    clips ahead of the reader. get() returns clips in order, None on timeout
+    and raises StopIteration once everything was read. on_ready() is called
+    whenever a clip (or the end) becomes available.
+    """
+
+    def __init__(self, source, synth, should_stop=lambda: False, lookahead=LOOKAHEAD, on_ready=None):
+        self.synth = synth
+        self.should_stop = should_stop
+        self.on_ready = on_ready or (lambda: None)
+        self._ready = queue.Queue(maxsize=lookahead)
+        self._closed = threading.Event()
+        self._finished = False
+        threading.Thread(target=self._produce, args=(source,), name="tts-synth", daemon=True).start()
+
+    def _put(self, item):
+        while not self._closed.is_set():
+            try:
+                self._ready.put(item, timeout=0.1)
+                self.on_ready()
+                return True
+            except queue.Full:
+                if self.should_stop():
+                    return False
+        return False
+
+    def _produce(self, source):
+        try:
+            for chunk in iter_chunks(source):
+                if self.should_stop() or self._closed.is_set():
+                    break
+                try:
+                    audio = self.synth(chunk)
+                except Exception as e:
+                    print(f"⚠️ TTS chunk failed: {e}")
+                    continue
+                if not self._put(audio):
+                    return
+        finally:
+            self._put(_DONE)
+
+    def get(self, timeout=None):
+        if self._finished:
+            raise StopIteration
+        try:
+            audio = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if audio is _DONE:
+            self._finished = True
+            raise StopIteration
+        return audio
+
+    def close(self):
+        self._closed.set()
+
+
+def run_pipeline(source, synth, play, should_stop=lambda: False, lookahead=LOOKAHEAD, timings=None):
+    """
+    synth(chunk) -> audio runs on a helper thread; play(audio, should_stop)
+    runs here and returns False when it was interrupted. Returns True if
+    everything was spoken. timings (dict) gets first_audio / total / chunks.
+    """
+    start = time.perf_counter()
+    clips = ClipPrefetcher(source, synth, should_stop, lookahead)
+    completed = True
+    played = 0
+    try:
+        while True:
+            try:
+                audio = clips.get(timeout=0.1)
+            except StopIteration:
+                break
+            if should_stop():
+                completed = False
+                break
+            if audio is None:
+                continue
+            if played == 0 and timings is not None:
+                timings["first_audio"] = time.perf_counter() - start
+            played += 1
+            if play(audio, should_stop) is False:
+                completed = False
+                break
+    finally:
+        clips.close()
+    if timings is not None:
+        timings["total"] = time.perf_counter() - start
+        timings["chunks"] = played
+    return completed
+
+# -------------- CLI (time-to-first-audio benchmark) --------------
+if __name__ == "__main__":
+    import sys
+
+    answer = (
+        "The Eiffel Tower is a wrought-iron lattice tower on the Champ de Mars in Paris. "
+        "It is named after the engineer Gustave Eiffel, whose company designed and built it. "
+        "Locally nicknamed the Iron Lady, it was constructed from 1887 to 1889 as the centerpiece "
+        "of the 1889 World's Fair. Although initially criticised by some of France's leading artists "
+        "and intellectuals for its design, it has since become a global cultural icon of France. "
+        "The tower is 330 metres tall, about the same height as an 81-storey building. "
+        "It was the tallest man-made structure in the world until the Chrysler Building was finished in 1930."
+    )
+
+    if "--edge" in sys.argv:
+        # Real edge-tts synthesis (needs network); playback is simulated
+        import asyncio
+        import edge_tts
+
+        async def _edge(text):
+            data = bytearray()
+            async for chunk in edge_tts.Communicate(text, "en-US-JennyNeural").stream():
+                if chunk["type"] == "audio":
+                    data += chunk["data"]
+            return bytes(data)
+        synth = lambda text: (len(text), asyncio.run(_edge(text)))
+    else:
+        # Stand-in: ~250 ms round trip + ~4 ms per character
+        synth = lambda text: (len(text), time.sleep(0.25 + 0.004 * len(text)))
+
+    def play(audio, should_stop, chars_per_second=150.0):
+        # Speech runs ~15 chars/s; scaled 10x so the benchmark stays short
+        end = time.perf_counter() + audio[0] / chars_per_second
+        while time.perf_counter() < end:
+            if should_stop():
+                return False
+            time.sleep(0.005)
+        return True
+
+    t = time.perf_counter()
+    audio = synth(answer)
+    single_first = time.perf_counter() - t
+    play(audio, lambda: False)
+    single_total = time.perf_counter() - t
+
+    timings = {}
+    run_pipeline(answer, synth, play, timings=timings)
+    print(f"🧩 {len(list(iter_chunks(answer)))} chunks: {[len(c) for c in iter_chunks(answer)]}")
+    print(f"⏱ Single file: first audio {single_first * 1000:.0f} ms, done {single_total:.2f}s")
+    print(f"⏱ Pipelined:   first audio {timings['first_audio'] * 1000:.0f} ms, done {timings['total']:.2f}s")
+
+    stop_at = time.perf_counter() + 0.5
+    spoken = run_pipeline(answer, synth, play, should_stop=lambda: time.perf_counter() > stop_at)
+    print(f"🛑 Stop after 0.5s honoured: {not spoken}")
@@ -0,0 +1,229 @@
+# Backend/SpeechService.py
+"""
+Long-lived edge-tts synthesis service
+-------------------------------------
+One background thread owns one asyncio event loop for all synthesis, so an
+utterance no longer pays for creating and tearing down a loop (asyncio.run)
+and, where edge-tts accepts a `connector`, reuses one aiohttp connector
+(DNS cache, SSL setup) across requests. Jobs are handed to the loop
+thread-safely and come back as concurrent.futures.Future objects:
+
+    audio = get_speech_service().submit("Hello", voice, rate, pitch).result()
+
+edge-tts still opens one WebSocket per utterance; that is its protocol.
+"""
+
+import time
+import asyncio
+import inspect
+import threading
+
+import edge_tts
+
+DEFAULT_VOICE = "en-US-JennyNeural"
+MAX_CONCURRENT = 3     # synth jobs in flight at once (pipeline lookahead + acks)
+SYNTH_TIMEOUT = 30
+
+
+def _connector_supported() -> bool:
+    try:
+        return "connector" in inspect.signature(edge_tts.Communicate.__init__).parameters
+    except (TypeError, ValueError):
+        return False
+
+def _make_shared_connector():
+    """
+    aiohttp connector that survives edge-tts closing its per-utterance
+    ClientSession (sessions close the connector they were given).
+    """
+    import aiohttp
+
+    class SharedConnector(aiohttp.TCPConnector):
+        def close(self, *args, **kwargs):
+            done = asyncio.get_event_loop().create_future()
+            done.set_result(None)
+            return done
+
+        def close_for_real(self):
+            return super().close()
+
+    return SharedConnector(limit=MAX_CONCURRENT * 2, ttl_dns_cache=300)
+
+
+class SpeechService:
+    def __init__(self, max_concurrent=MAX_CONCURRENT, share_connector=True):
+        self.max_concurrent = max_concurrent
+        self.share_connector = share_connector and _connector_supported()
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._connector = None
+        self._slots = None
+        self.stats = {"jobs": 0, "failed": 0, "ms": [], "chars": []}
+
+    # ---------- Loop thread ----------
+    def start(self):
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return self
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="speech-service", daemon=True)
+            self._thread.start()
+        self._ready.wait()
+        return self
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def stop(self):
+        if self._loop is None:
+            return
+        async def _close():
+            if self._connector is not None:
+                await self._connector.close_for_real()
+                self._connector = None
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(5)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop = None
+
+    # ---------- Jobs ----------
+    async def _synth(self, text, voice, rate, pitch):
+        async with self._slots:
+            start = time.perf_counter()
+            kwargs = {"rate": rate, "pitch": pitch}
+            if self.share_connector:
+                if self._connector is None:
+                    self._connector = _make_shared_connector()
+                kwargs["connector"] = self._connector
+            try:
+                chunks = []
+                async for chunk in edge_tts.Communicate(text, voice, **kwargs).stream():
+                    if chunk["type"] == "audio":
+                        chunks.append(chunk["data"])
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+            self.stats["jobs"] += 1
+            self.stats["ms"].append((time.perf_counter() - start) * 1000)
+            self.stats["chars"].append(len(text))
+            del self.stats["ms"][:-200], self.stats["chars"][:-200]
+            return b"".join(chunks)
+
+    def submit(self, text, voice=DEFAULT_VOICE, rate="+0%", pitch="+0Hz"):
+        """Queue a synthesis job from any thread; returns a Future of mp3 bytes."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._synth(text, voice, rate, pitch), self._loop)
+
+    def synthesize(self, text, voice=DEFAULT_VOICE, rate="+0%", pitch="+0Hz", timeout=SYNTH_TIMEOUT) -> bytes:
+        future = self.submit(text, voice, rate, pitch)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def ms_per_char(self):
+        """Measured synthesis cost per character (None until something was synthesized)."""
+        chars = sum(self.stats["chars"])
+        return sum(self.stats["ms"]) / chars if chars else None
+
+    def report(self) -> str:
+        ms = self.stats["ms"]
+        avg = sum(ms) / len(ms) if ms else 0.0
+        return (f"🗣 Speech service: {self.stats['jobs']} jobs, {self.stats['failed']} failed, "
+                f"avg {avg:.0f} ms, shared connector: {self.share_connector}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_speech_service() -> SpeechService:
+    """Process-wide service shared by SpeechToSpeech and TextToSpeech."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SpeechService()
+        return _service
+
+# -------------- CLI (setup cost against a local WebSocket stand-in) --------------
+def _serve_stand_in(port, audio=b"\xff\xf3" * 4000):
+    """Tiny edge-tts-shaped service: turn.start, one audio frame, turn.end."""
+    from aiohttp import web
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        received = 0
+        async for _ in ws:
+            received += 1
+            if received == 2:  # speech.config, then the SSML request
+                await ws.send_str("X-RequestId:1\r\nPath:turn.start\r\n\r\n{}")
+                header = b"X-RequestId:1\r\nContent-Type:audio/mpeg\r\nPath:audio"
+                await ws.send_bytes((len(header) + 2).to_bytes(2, "big") + header + b"\r\n" + audio)
+                await ws.send_str("X-RequestId:1\r\nPath:turn.end\r\n\r\n{}")
+        return ws
+
+    def run():
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/tts", handler)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+
+if __name__ == "__main__":
+    import sys
+    import socket
+    import edge_tts.communicate as communicate
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    _serve_stand_in(port)
+    time.sleep(0.3)
+    communicate.WSS_URL = f"ws://127.0.0.1:{port}/tts?TrustedClientToken=local"
+
+    async def _old(text):
+        chunks = []
+        async for chunk in edge_tts.Communicate(text, DEFAULT_VOICE).stream():
+            if chunk["type"] == "audio":
+                chunks.append(chunk["data"])
+        return b"".join(chunks)
+
+    t = time.perf_counter()
+    for i in range(n):
+        asyncio.run(_old(f"Reply {i}."))
+    old = (time.perf_counter() - t) / n
+    print(f"⏱ asyncio.run per utterance (old): {old * 1000:6.2f} ms")
+
+    for share in (False, True):
+        service = SpeechService(share_connector=share).start()
+        t = time.perf_counter()
+        for i in range(n):
+            service.synthesize(f"Reply {i}.")
+        each = (time.perf_counter() - t) / n
+        t = time.perf_counter()
+        futures = [service.submit(f"Burst {i}.") for i in range(n)]
+        for f in futures:
+            f.result()
+        burst = (time.perf_counter() - t) / n
+        label = "persistent loop + shared connector" if share else "persistent loop"
+        print(f"⏱ {label}: {each * 1000:6.2f} ms sequential, {burst * 1000:6.2f} ms/job in a burst")
+        service.stop()
@@ -1,16 +1,28 @@
 import speech_recognition as sr
-import mtranslate as mt
 import re
 import pygame
-import asyncio
-import edge_tts
 import os
-import tempfile
 import random
 import threading
+from io import BytesIO
 from dotenv import dotenv_values
 import time
 
+try:
+    from Backend.SpeechCache import get_speech_cache
+    from Backend.AudioEngine import get_audio_engine, ACK, ANSWER
+    from Backend.SpeechService import get_speech_service
+    from Backend.SpeechEngines import get_engine_router
+    from Backend.Translation import get_translator
+    from Backend.Recognizers import get_recognizer_backend
+except ImportError:  # run as a script from Backend/
+    from SpeechCache import get_speech_cache
+    from AudioEngine import get_audio_engine, ACK, ANSWER
+    from SpeechService import get_speech_service
+    from SpeechEngines import get_engine_router
+    from Translation import get_translator
+    from Recognizers import get_recognizer_backend
+
 # -------------------- Load Environment --------------------
 env_vars = dotenv_values(".env")
 AssistantVoice = env_vars.get("AssistantVoice", "en-US-JennyNeural")
@@ -24,11 +36,12 @@ pygame.mixer.init()
 # -------------------- Global Stop Flag --------------------
 TTS_STOP_FLAG = False  # ✅ Interrupt TTS if needed
 
-# Manage playback + resume
+# Manage playback + resume (all audio goes through the one AudioEngine)
 _PLAY_LOCK = threading.Lock()
-_PLAY_THREAD = None
+_CURRENT = None               # PlaybackItem of the latest reply
 LAST_REPLY = ""               # ✅ will store last spoken reply
 LAST_WAS_INTERRUPTED = False  # ✅ true if we stopped mid-utterance
+LAST_TIMINGS = {}             # first_audio / total / chunks of the last reply
 
 # -------------------- Helper Functions --------------------
 def QueryModifier(query: str) -> str:
@@ -45,11 +58,16 @@ def QueryModifier(query: str) -> str:
             query += "."
     return query[0].upper() + query[1:] if query else query
 
+PAUSE_KEYWORDS = ("pause", "hold on", "wait a second", "wait a minute", "wait a moment")
+
+def is_pause_command(text: str) -> bool:
+    """Whole words/phrases only: "hold on" or a bare "wait" pause, "await the results" doesn't."""
+    low = text.lower().strip(" .!?")
+    return low == "wait" or any(re.search(rf"\b{re.escape(k)}\b", low) for k in PAUSE_KEYWORDS)
+
 def UniversalTranslator(text: str) -> str:
-    try:
-        return mt(text, "en", "auto").capitalize()
-    except Exception:
-        return text
+    # English skips the round trip; other phrases are translated once (LRU cache)
+    return get_translator().to_english(text)
 
 def clean_text_for_speech(text):
     emoji_pattern = re.compile(
@@ -69,7 +87,9 @@ def clean_text_for_speech(text):
 def SpeechToText(recognizer, source) -> str:
     try:
         audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
-        recognized_text = recognizer.recognize_google(audio)
+        recognized_text = get_recognizer_backend().recognize_audio(audio)
+        if not recognized_text:
+            return ""
         translated_text = UniversalTranslator(recognized_text)
         final_text = QueryModifier(translated_text)
         return final_text
@@ -82,96 +102,169 @@ def SpeechToText(recognizer, source) -> str:
         return ""
 
 # -------------------- Text-to-Speech (Edge + pygame, interruptible) --------------------
-async def text_to_audio_file(text, file_path):
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-        except Exception:
-            pass
-    communicate = edge_tts.Communicate(text, AssistantVoice, pitch=AssistantPitch, rate=AssistantRate)
-    await communicate.save(file_path)
-
-def _play_audio(file_path):
-    global TTS_STOP_FLAG, LAST_WAS_INTERRUPTED
-    try:
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.play()
-    except Exception as e:
-        print(f"⚠️ Audio play error: {e}")
-        return
-
-    interrupted = False
-    while pygame.mixer.music.get_busy():
-        if TTS_STOP_FLAG:
-            try:
-                pygame.mixer.music.stop()
-            except Exception:
-                pass
-            interrupted = True
-            break
-        pygame.time.Clock().tick(20)
-
-    # mark state for resume logic
-    LAST_WAS_INTERRUPTED = interrupted
-
-def stop_tts():
+# Audio never touches the temp directory: edge-tts streams into memory and
+# the mixer decodes straight from a BytesIO.
+def _synthesize(text, fastest=False):
+    """edge-tts mp3 bytes, or the offline pyttsx3 voice when the network is slow/down."""
+    return get_engine_router().synthesize(text, AssistantVoice, AssistantRate, AssistantPitch, fastest)
+
+def _synth_chunk(chunk):
+    # Repeated phrases (greeting, canned replies) play from the disk cache
+    return get_speech_cache().get_bytes(chunk, AssistantVoice, AssistantRate, AssistantPitch, _synthesize)
+
+def _synth_ack_chunk(chunk):
+    # Acknowledgements go to whichever engine is fastest right now
+    return get_speech_cache().get_bytes(chunk, AssistantVoice, AssistantRate, AssistantPitch,
+                                        lambda text: _synthesize(text, fastest=True))
+
+def _on_reply_done(item):
+    """Mark state for resume logic (only for the latest reply)."""
+    global LAST_WAS_INTERRUPTED, LAST_TIMINGS
+    if item is _CURRENT:
+        LAST_WAS_INTERRUPTED = not item.completed
+        LAST_TIMINGS = item.timings
+
+def _remember_stream(deltas):
+    """Record a streamed reply in LAST_REPLY as it is spoken."""
+    global LAST_REPLY
+    LAST_REPLY = ""
+    for delta in deltas:
+        LAST_REPLY += delta
+        yield clean_text_for_speech(delta)
+
+def stop_tts(everything=False):
     """
-    Immediately stop current speech playback.
+    Immediately stop the current answer (and drop queued answers). Queued
+    acknowledgements and alerts still play unless everything=True, as when
+    the user says "stop" or the app exits.
     """
     global TTS_STOP_FLAG, LAST_WAS_INTERRUPTED
     TTS_STOP_FLAG = True
     LAST_WAS_INTERRUPTED = True
-    try:
-        pygame.mixer.music.stop()
-    except Exception:
-        pass
-    time.sleep(0.02)  # let mixer settle
-
-def TTS(text):
-    """Interruptible TTS using edge-tts + pygame, non-blocking."""
-    global TTS_STOP_FLAG, _PLAY_THREAD, LAST_REPLY, LAST_WAS_INTERRUPTED
-
-    if not text or not text.strip():
-        return
-
-    # Remember last reply for resume
-    LAST_REPLY = text
-    LAST_WAS_INTERRUPTED = False
+    get_audio_engine().cancel_all(priority=None if everything else ANSWER)
+    get_audio_engine().resume()  # a stop also ends a pause
+
+def pause_tts():
+    """Pause speech at the current position."""
+    get_audio_engine().pause()
+
+def resume_tts() -> bool:
+    """Continue paused speech where it stopped; False if nothing was paused."""
+    engine = get_audio_engine()
+    if engine.paused:
+        engine.resume()
+        return True
+    return False
+
+def TTS(text, priority=ANSWER):
+    """
+    Interruptible TTS using edge-tts + pygame, non-blocking. Speech starts
+    after the first sentence is synthesized. `text` may also be a TextFeed
+    (or any iterable of deltas) to speak an answer while it streams in.
+    A new answer replaces the current one; ACK/ALERT priorities are queued
+    ahead of it instead. Returns the PlaybackItem.
+    """
+    global TTS_STOP_FLAG, _CURRENT, LAST_REPLY, LAST_WAS_INTERRUPTED
 
-    # Clean text for audio (remove emojis etc.)
-    text_for_speech = clean_text_for_speech(text)
+    if isinstance(text, str):
+        if not text.strip():
+            return None
+        source = clean_text_for_speech(text)
+    else:
+        source = None
+    engine = get_audio_engine()
+    if priority != ANSWER:
+        return engine.speak(text if source is None else source, _synth_ack_chunk, priority,
+                            label="ack" if priority == ACK else "alert")
 
-    # Stop any ongoing playback before starting new
     with _PLAY_LOCK:
         stop_tts()
         TTS_STOP_FLAG = False
+        # Remember last reply for resume
+        if source is None:
+            source = _remember_stream(text)
+        else:
+            LAST_REPLY = text
+        LAST_WAS_INTERRUPTED = False
+        _CURRENT = engine.speak(source, _synth_chunk, ANSWER, label="answer", on_done=_on_reply_done)
+        return _CURRENT
+
+# -------------------- Soak test --------------------
+def _rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmRSS")) / 1024
 
-    # Temp mp3 path
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-        file_path = temp_file.name
+SOAK_RSS_GROWTH_MB = 20   # allowed RSS growth after the warm-up replies
 
-    # Generate audio file (robust to nested event loop)
+def _soak(replies=300):
+    """
+    Speak `replies` distinct replies through the real mixer and check that
+    the temp directory and RSS stay flat. Synthesis is replaced by a short
+    in-memory WAV so no network is needed (SDL_AUDIODRIVER=dummy works too).
+    Returns the list of failed checks.
+    """
+    global _synthesize
+    import wave
+    import tempfile
     try:
-        asyncio.run(text_to_audio_file(text_for_speech, file_path))
-    except RuntimeError:
-        # If we're already inside an event loop (e.g., GUI), use a fresh loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(text_to_audio_file(text_for_speech, file_path))
-        loop.close()
-
-    # Play audio in separate thread
-    with _PLAY_LOCK:
-        _PLAY_THREAD = threading.Thread(target=_play_audio, args=(file_path,), daemon=True)
-        _PLAY_THREAD.start()
+        import Backend.SpeechCache as cache_module
+    except ImportError:
+        import SpeechCache as cache_module
+
+    def wav_synth(text):
+        buf = BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(22050)
+            w.writeframes(b"\0\0" * int(22050 * 0.05))
+        return buf.getvalue()
+
+    _synthesize = wav_synth
+    get_audio_engine().audio_format = "wav"
+    tmp_root = tempfile.gettempdir()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_module._shared = cache_module.SpeechCache(root=cache_dir, max_bytes=2 * 1024 * 1024)
+        before_files = len(os.listdir(tmp_root))
+        rss = []
+        start = time.perf_counter()
+        for i in range(replies):
+            TTS(f"Soak reply number {i}. It has two sentences.").wait()
+            if i % 50 == 0:
+                rss.append(_rss_mb())
+        rss.append(_rss_mb())
+        after_files = len(os.listdir(tmp_root))
+        print(f"🧪 {replies} replies in {time.perf_counter() - start:.1f}s | temp dir entries "
+              f"{before_files} -> {after_files} | RSS MB {' '.join(f'{r:.0f}' for r in rss)}")
+        print(get_speech_cache().report())
+
+    growth = rss[-1] - rss[min(1, len(rss) - 1)]   # the first 50 replies warm the caches
+    return [msg for ok, msg in (
+        (after_files == before_files, f"temp dir entries changed: {before_files} -> {after_files}"),
+        (growth <= SOAK_RSS_GROWTH_MB, f"RSS grew {growth:.0f} MB (limit {SOAK_RSS_GROWTH_MB} MB)"),
+    ) if not ok]
 
 # -------------------- Main Loop --------------------
 if __name__ == "__main__":
+    import sys
+    if "--soak" in sys.argv:
+        failures = _soak()
+        for msg in failures:
+            print(f"❌ {msg}")
+        if failures:
+            sys.exit(1)
+        print("✅ Temp dir and RSS stayed flat")
+        sys.exit(0)
+
     recognizer = sr.Recognizer()
     microphone = sr.Microphone()
 
     exit_keywords = ["exit", "quit", "bye"]
-    stop_keywords = ["stop", "pause", "be quiet", "chup", "mute"]
+    stop_keywords = ["stop", "be quiet", "chup", "mute"]
     resume_keywords = ["resume", "continue", "bol", "speak"]
     last_text = ""
 
@@ -207,21 +300,33 @@ if __name__ == "__main__":
             # Exit
             if any(word in low for word in exit_keywords):
                 TTS_STOP_FLAG = True
-                stop_tts()
+                stop_tts(everything=True)
+                print(get_speech_cache().report())
+                print(get_speech_service().report())
+                print(get_engine_router().report())
+                print(get_translator().report())
                 break
 
-            # Pause current TTS immediately
+            # Pause at the current position
+            if is_pause_command(low):
+                print("⏸ TTS paused. Say 'resume' to continue.")
+                pause_tts()
+                continue
+
+            # Stop current TTS immediately
             if any(word in low for word in stop_keywords):
-                print("⏸ TTS paused. Say 'resume' to replay last reply.")
-                stop_tts()
+                print("⏹ TTS stopped. Say 'resume' to replay last reply.")
+                stop_tts(everything=True)
                 continue  # keep listening
 
             # Resume (replay last reply if it was interrupted)
             if any(word in low for word in resume_keywords):
                 print("▶️ Resuming.")
-                # clear stop and replay last reply only if it was interrupted
+                # clear stop; continue a pause, or replay last reply if it was interrupted
                 TTS_STOP_FLAG = False
-                if LAST_WAS_INTERRUPTED and LAST_REPLY:
+                if resume_tts():
+                    pass
+                elif LAST_WAS_INTERRUPTED and LAST_REPLY:
                     TTS(LAST_REPLY)
                 else:
                     TTS("Resumed.")
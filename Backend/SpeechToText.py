@@ -1,8 +1,14 @@
 # SpeechToText.py
 import speech_recognition as sr
-import mtranslate as mt
 import re
 
+try:
+    from Backend.Translation import get_translator
+    from Backend.Recognizers import get_recognizer_backend
+except ImportError:  # run as a script from Backend/
+    from Translation import get_translator
+    from Recognizers import get_recognizer_backend
+
 # -------------------- Helper Functions --------------------
 def QueryModifier(query: str) -> str:
     """
@@ -23,12 +29,9 @@ def QueryModifier(query: str) -> str:
 
 def UniversalTranslator(text: str) -> str:
     """
-    Translate any text to English.
+    Translate any text to English (English input skips the network round trip).
     """
-    try:
-        return mt(text, "en", "auto").capitalize()
-    except Exception:
-        return text
+    return get_translator().to_english(text)
 
 # -------------------- Speech-to-Text Function --------------------
 def SpeechToText(recognizer, source) -> str:
@@ -37,7 +40,10 @@ def SpeechToText(recognizer, source) -> str:
     """
     try:
         audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
-        recognized_text = recognizer.recognize_google(audio)
+        # Google, a local engine or both, depending on SpeechRecognizer in .env
+        recognized_text = get_recognizer_backend().recognize_audio(audio)
+        if not recognized_text:
+            return ""
         translated_text = UniversalTranslator(recognized_text)
         final_text = QueryModifier(translated_text)
         return final_text
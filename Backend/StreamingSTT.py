@@ -0,0 +1,495 @@
+# Backend/StreamingSTT.py
+"""
+Streaming speech-to-text front-end
+----------------------------------
+recognizer.listen() waits for pause_threshold of energy-silence, and no
+audio is captured while recognize_google() runs. Here three threads keep
+those apart:
+
+    capture   mic / WAV replay -> RingBuffer (fixed-size PCM frames)
+    segment   RingBuffer -> frame VAD -> endpointer -> utterance queue
+    recognize utterance queue -> recognizer -> results
+
+The VAD is webrtcvad when installed, otherwise an adaptive energy detector.
+An utterance starts after START_FRAMES voiced frames (with PRE_ROLL_MS of
+audio before them) and ends after END_SILENCE_MS of unvoiced frames.
+Every result carries its end-of-speech -> text latency.
+"""
+
+import math
+import time
+import wave
+import queue
+import threading
+from array import array
+from collections import deque
+
+import speech_recognition as sr
+
+try:
+    from Backend.Recognizers import get_recognizer_backend, make_backend
+except ImportError:  # run as a script from Backend/
+    from Recognizers import get_recognizer_backend, make_backend
+
+# ---------- Audio / endpointing settings ----------
+SAMPLE_RATE = 16000
+FRAME_MS = 30               # webrtcvad accepts 10, 20 or 30 ms frames
+RING_SECONDS = 30
+PRE_ROLL_MS = 300           # audio kept from before the detected start
+START_FRAMES = 3            # voiced frames (within START_WINDOW) that start an utterance
+START_WINDOW = 5
+END_SILENCE_MS = 400        # trailing non-speech that ends it (listen() uses 800 ms)
+MAX_UTTERANCE_S = 10
+VAD_MODE = 2                # webrtcvad aggressiveness 0-3
+
+ENERGY_RATIO = 3.0          # energy VAD: voiced when RMS > noise floor * ratio ...
+ENERGY_MIN_RMS = 300        # ... and above this absolute level
+NOISE_ADAPT = 0.05
+
+
+def frame_bytes(rate=SAMPLE_RATE, frame_ms=FRAME_MS):
+    return rate * frame_ms // 1000 * 2
+
+
+# ---------- Ring buffer ----------
+class RingBuffer:
+    """
+    Fixed-size PCM ring with absolute byte positions. The writer never
+    blocks; a reader that falls more than `capacity` behind skips ahead
+    (counted in overruns).
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._cond = threading.Condition()
+        self._stamps = deque(maxlen=4096)   # (end position, capture time) per write
+        self.head = 0
+        self.closed = False
+        self.overruns = 0
+
+    def write(self, data, stamp=None):
+        data = bytes(data)[-self.capacity:]
+        with self._cond:
+            start = self.head % self.capacity
+            first = min(len(data), self.capacity - start)
+            self._buf[start:start + first] = data[:first]
+            self._buf[:len(data) - first] = data[first:]
+            self.head += len(data)
+            self._stamps.append((self.head, time.perf_counter() if stamp is None else stamp))
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def read(self, pos, size, timeout=None):
+        """(data, pos) for [pos, pos+size); data is None on timeout or once closed and drained."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.head >= pos + size or self.closed, timeout):
+                return None, pos
+            if self.head - pos > self.capacity:
+                self.overruns += 1
+                pos = self.head - self.capacity
+                pos -= pos % size
+            if self.head < pos + size:
+                return None, pos
+            start = pos % self.capacity
+            chunk = self._buf[start:start + size]
+            if len(chunk) < size:
+                chunk += self._buf[:size - len(chunk)]
+            return bytes(chunk), pos + size
+
+    def time_of(self, pos):
+        """Capture time of the write that contained byte `pos`."""
+        with self._cond:
+            found = None
+            for end, stamp in reversed(self._stamps):
+                if end <= pos:
+                    break
+                found = stamp
+            if found is None:
+                found = self._stamps[-1][1] if self._stamps else time.perf_counter()
+            return found
+
+
+# ---------- Voice activity detection ----------
+class EnergyVad:
+    """Adaptive RMS detector (fallback when webrtcvad isn't installed)."""
+    name = "energy"
+
+    def __init__(self, ratio=ENERGY_RATIO, min_rms=ENERGY_MIN_RMS, adapt=NOISE_ADAPT):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.adapt = adapt
+        self.noise = None
+
+    def is_speech(self, frame, rate):
+        samples = array("h", frame)
+        rms = math.sqrt(sum(s * s for s in samples) / len(samples)) if samples else 0.0
+        if self.noise is None:
+            self.noise = rms
+        voiced = rms > max(self.min_rms, self.noise * self.ratio)
+        if not voiced:
+            self.noise += self.adapt * (rms - self.noise)
+        return voiced
+
+
+class WebRtcVad:
+    name = "webrtcvad"
+
+    def __init__(self, mode=VAD_MODE):
+        import webrtcvad
+        self._vad = webrtcvad.Vad(mode)
+
+    def is_speech(self, frame, rate):
+        return self._vad.is_speech(frame, rate)
+
+
+def make_vad(mode=VAD_MODE):
+    try:
+        return WebRtcVad(mode)
+    except ImportError:
+        return EnergyVad()
+
+
+# ---------- Endpointing ----------
+class Utterance:
+    def __init__(self, pcm, rate, speech_end, endpoint):
+        self.pcm = pcm
+        self.rate = rate
+        self.speech_end = speech_end   # capture time of the last voiced frame
+        self.endpoint = endpoint       # when the endpointer closed the utterance
+
+    @property
+    def seconds(self):
+        return len(self.pcm) / 2 / self.rate
+
+
+class Endpointer:
+    """Feed (frame, voiced, capture_time); returns an Utterance when one ends."""
+
+    def __init__(self, rate=SAMPLE_RATE, frame_ms=FRAME_MS):
+        self.rate = rate
+        self.frame_ms = frame_ms
+        self._pre = deque(maxlen=max(1, PRE_ROLL_MS // frame_ms))
+        self._window = deque(maxlen=START_WINDOW)
+        self._frames = None
+        self._silence_ms = 0
+        self._last_voiced = None
+
+    @property
+    def active(self):
+        return self._frames is not None
+
+    def feed(self, frame, voiced, stamp):
+        if self._frames is None:
+            self._pre.append(frame)
+            self._window.append(voiced)
+            if sum(self._window) >= START_FRAMES:
+                self._frames = list(self._pre)
+                self._pre.clear()
+                self._window.clear()
+                self._silence_ms = 0
+                self._last_voiced = stamp
+            return None
+
+        self._frames.append(frame)
+        if voiced:
+            self._silence_ms = 0
+            self._last_voiced = stamp
+        else:
+            self._silence_ms += self.frame_ms
+        too_long = len(self._frames) * self.frame_ms >= MAX_UTTERANCE_S * 1000
+        if self._silence_ms >= END_SILENCE_MS or too_long:
+            return self.flush()
+        return None
+
+    def flush(self):
+        if self._frames is None:
+            return None
+        utterance = Utterance(b"".join(self._frames), self.rate, self._last_voiced, time.perf_counter())
+        self._frames = None
+        return utterance
+
+
+# ---------- Audio sources ----------
+class MicrophoneSource:
+    """Default microphone through speech_recognition / PyAudio."""
+
+    def __init__(self, device_index=None, rate=SAMPLE_RATE):
+        self.device_index = device_index
+        self.rate = rate
+
+    def frames(self, size, should_stop):
+        with sr.Microphone(device_index=self.device_index, sample_rate=self.rate,
+                           chunk_size=size // 2) as source:
+            while not should_stop():
+                yield source.stream.read(size // 2)
+
+
+def to_pcm16_mono(data, channels, width, rate, target_rate):
+    """Little-endian PCM of any width/channel count -> 16-bit mono at target_rate (no audioop)."""
+    if width == 1:
+        samples = [(b - 128) << 8 for b in data]          # 8-bit WAV is unsigned
+    elif width == 2:
+        samples = array("h", data)
+    else:
+        samples = [int.from_bytes(data[i + width - 2:i + width], "little", signed=True)
+                   for i in range(0, len(data) - width + 1, width)]   # keep the top 16 bits
+    if channels > 1:
+        samples = [sum(samples[i:i + channels]) // channels
+                   for i in range(0, len(samples) - channels + 1, channels)]
+    if rate != target_rate and samples:
+        step = rate / target_rate
+        n = int(len(samples) / step)
+        last = len(samples) - 1
+        out = []
+        for k in range(n):
+            pos = k * step
+            i = int(pos)
+            j = min(i + 1, last)
+            out.append(int(samples[i] + (samples[j] - samples[i]) * (pos - i)))
+        samples = out
+    return array("h", samples).tobytes()
+
+
+class WavSource:
+    """Replays a WAV file in real time (or `speed` times faster), as if spoken."""
+
+    def __init__(self, path, rate=SAMPLE_RATE, speed=1.0, tail_silence=1.0):
+        self.path = path
+        self.rate = rate
+        self.speed = speed
+        self.tail_silence = tail_silence
+
+    def pcm(self):
+        with wave.open(self.path, "rb") as w:
+            channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+            data = w.readframes(w.getnframes())
+        if (channels, width, rate) != (1, 2, self.rate):
+            data = to_pcm16_mono(data, channels, width, rate, self.rate)
+        return data + b"\0\0" * int(self.rate * self.tail_silence)
+
+    def frames(self, size, should_stop):
+        data = self.pcm()
+        frame_s = size / 2 / self.rate / self.speed
+        start = time.perf_counter()
+        for i in range(0, len(data) - size + 1, size):
+            if should_stop():
+                return
+            delay = start + (i // size + 1) * frame_s - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            yield data[i:i + size]
+
+
+# ---------- Pipeline ----------
+class Transcript:
+    def __init__(self, text, utterance, done):
+        self.text = text
+        self.seconds = utterance.seconds
+        self.endpoint_ms = (utterance.endpoint - utterance.speech_end) * 1000
+        self.recognize_ms = (done - utterance.endpoint) * 1000
+        self.latency_ms = (done - utterance.speech_end) * 1000   # end of speech -> text
+
+
+class StreamingRecognizer:
+    def __init__(self, source=None, recognize=None, vad=None, rate=SAMPLE_RATE, frame_ms=FRAME_MS,
+                 on_text=None):
+        self.source = source or MicrophoneSource(rate=rate)
+        self.recognize = recognize or get_recognizer_backend().recognize   # SpeechRecognizer in .env
+        self.vad = vad or make_vad()
+        self.rate = rate
+        self.frame_size = frame_bytes(rate, frame_ms)
+        self.frame_ms = frame_ms
+        self.on_text = on_text
+        self.ring = RingBuffer(rate * 2 * RING_SECONDS)
+        self.utterances = queue.Queue()
+        self.results = queue.Queue()
+        self.transcripts = deque(maxlen=200)
+        self.error = None
+        self._stop = threading.Event()
+        self._threads = []
+        self.finished = threading.Event()
+
+    def start(self):
+        for name, target in (("stt-capture", self._capture), ("stt-segment", self._segment),
+                             ("stt-recognize", self._recognize)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.ring.close()
+        for thread in self._threads:
+            thread.join(2)
+
+    # ---------- Threads ----------
+    def _capture(self):
+        try:
+            for frame in self.source.frames(self.frame_size, self._stop.is_set):
+                self.ring.write(frame)
+        except Exception as e:
+            self.error = e
+            print(f"⚠️ Audio capture error: {e}")
+        finally:
+            self.ring.close()
+
+    def _segment(self):
+        endpointer = Endpointer(self.rate, self.frame_ms)
+        pos = 0
+        try:
+            while True:
+                frame, pos = self.ring.read(pos, self.frame_size, timeout=0.5)
+                if frame is None:
+                    if self.ring.closed:
+                        break
+                    continue
+                voiced = self.vad.is_speech(frame, self.rate)
+                utterance = endpointer.feed(frame, voiced, self.ring.time_of(pos - 1))
+                if utterance:
+                    self.utterances.put(utterance)
+            utterance = endpointer.flush()
+            if utterance:
+                self.utterances.put(utterance)
+        finally:
+            self.utterances.put(None)
+
+    def _recognize(self):
+        while True:
+            utterance = self.utterances.get()
+            if utterance is None:
+                break
+            try:
+                text = self.recognize(utterance.pcm, utterance.rate)
+            except Exception as e:
+                print(f"⚠️ Could not request results; {e}")
+                continue
+            result = Transcript(text, utterance, time.perf_counter())
+            self.transcripts.append(result)
+            if not text:
+                continue
+            self.results.put(result)
+            if self.on_text:
+                self.on_text(result)
+        self.finished.set()
+
+    # ---------- Public API ----------
+    def get(self, timeout=None):
+        """Next Transcript with text, or None on timeout. Re-raises capture errors."""
+        try:
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            if self.error is not None:
+                raise self.error
+            return None
+
+    def report(self) -> str:
+        done = list(self.transcripts)
+        if not done:
+            return f"🎤 Streaming STT ({self.vad.name} VAD): no utterances"
+        lat = sorted(t.latency_ms for t in done)
+        pct = lambda p: lat[min(len(lat) - 1, int(p * len(lat)))]
+        avg = lambda xs: sum(xs) / len(xs)
+        return (f"🎤 Streaming STT ({self.vad.name} VAD): {len(done)} utterances | end of speech -> text "
+                f"p50 {pct(0.5):.0f} ms, p95 {pct(0.95):.0f} ms (endpoint {avg([t.endpoint_ms for t in done]):.0f} ms "
+                f"+ recognize {avg([t.recognize_ms for t in done]):.0f} ms) | ring overruns {self.ring.overruns}")
+
+
+# -------------- CLI (replay WAV fixtures; synthetic speech when none are given) --------------
+def _synthetic_speech(bursts, rate=SAMPLE_RATE, seed=7):
+    """Voice-like bursts (150 Hz harmonics, 4 Hz syllables) in low noise: [(gap_s, speech_s), ...]."""
+    import random
+    rnd = random.Random(seed)
+    out, marks, t = array("h"), [], 0.0
+    for gap, speech in bursts:
+        out.extend(int(rnd.gauss(0, 60)) for _ in range(int(rate * gap)))
+        t += gap
+        n = int(rate * speech)
+        for i in range(n):
+            x = i / rate
+            env = 0.55 + 0.45 * math.sin(2 * math.pi * 4 * x)
+            tone = sum(math.sin(2 * math.pi * 150 * k * x) / k for k in (1, 2, 3, 4))
+            out.append(int(4000 * env * tone / 2 + rnd.gauss(0, 60)))
+        marks.append((t, t + speech))
+        t += speech
+    out.extend(int(rnd.gauss(0, 60)) for _ in range(int(rate * 1.5)))
+    return out.tobytes(), marks
+
+def _listen_baseline(pcm, marks, recognize_s, rate=SAMPLE_RATE):
+    """Old loop on the same audio: listen(), then no capture while recognizing."""
+    class _Stream:
+        def __init__(self):
+            self.pos = 0
+
+        def read(self, frames):
+            data = pcm[self.pos:self.pos + frames * 2]
+            self.pos += len(data)
+            return data
+
+    class _Replay(sr.AudioSource):
+        def __init__(self):
+            self.SAMPLE_RATE, self.SAMPLE_WIDTH, self.CHUNK = rate, 2, 1024
+            self.stream = _Stream()
+
+    source, recognizer = _Replay(), sr.Recognizer()
+    recognizer.energy_threshold = ENERGY_MIN_RMS
+    delays, heard = [], 0
+    while source.stream.pos < len(pcm):
+        try:
+            recognizer.listen(source, timeout=5, phrase_time_limit=10)
+        except sr.WaitTimeoutError:
+            break
+        now = source.stream.pos / 2 / rate
+        ended = [end for start, end in marks if end <= now]
+        if ended and now - ended[-1] < 2:
+            delays.append((now - ended[-1]) * 1000 + recognize_s * 1000)
+            heard += 1
+        source.stream.pos += int(recognize_s * rate) * 2   # mic not read while recognizing
+    return delays, heard
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+
+    fake_s = 0.5
+    paths = [a for a in sys.argv[1:] if not a.startswith("--")]
+    use_google = "--google" in sys.argv
+
+    def fake_recognize(pcm, rate):
+        time.sleep(fake_s)   # stand-in for one recognize_google round trip
+        return f"utterance of {len(pcm) / 2 / rate:.1f}s"
+
+    recognize = make_backend("google").recognize if use_google else fake_recognize
+    marks = None
+    if not paths:
+        pcm, marks = _synthetic_speech([(1.0, 1.2), (0.9, 0.8), (0.5, 2.0), (1.2, 0.6), (0.6, 1.5)])
+        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        with wave.open(tmp, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            w.writeframes(pcm)
+        tmp.close()
+        paths = [tmp.name]
+
+    for path in paths:
+        stream = StreamingRecognizer(WavSource(path), recognize,
+                                     on_text=lambda t: print(f"   📝 {t.text!r} after {t.latency_ms:.0f} ms"))
+        print(f"▶ Replaying {os.path.basename(path)}")
+        stream.start()
+        stream.finished.wait()
+        stream.stop()
+        print(stream.report())
+
+    if marks is not None:
+        delays, heard = _listen_baseline(WavSource(paths[0]).pcm(), marks, fake_s)
+        avg = sum(delays) / len(delays) if delays else 0.0
+        print(f"🎤 Old listen() loop: {heard} phrases for {len(marks)} utterances (merged or cut while "
+              f"recognizing) | end of speech -> text avg {avg:.0f} ms")
+        os.remove(paths[0])
@@ -1,16 +1,25 @@
 import pygame
 import random
-import asyncio
-import edge_tts
-import os
-import tempfile
 import re
 from dotenv import dotenv_values
 
+try:
+    from Backend.SpeechCache import get_speech_cache
+    from Backend.SpeechEngines import get_engine_router
+    from Backend.AudioEngine import get_audio_engine, ANSWER
+    from Backend.SpeechBudget import condense_for_speech
+except ImportError:  # run as a script from Backend/
+    from SpeechCache import get_speech_cache
+    from SpeechEngines import get_engine_router
+    from AudioEngine import get_audio_engine, ANSWER
+    from SpeechBudget import condense_for_speech
+
 # Load environment variables
 env_vars = dotenv_values(".env")
 AssistantVoice = env_vars.get("AssistantVoice", "en-US-AriaNeural")
 AssistantMode = env_vars.get("AssistantMode", "friendly").lower()  # friendly | echo
+AssistantPitch = '+5Hz'
+AssistantRate = '+13%'
 
 # Initialize pygame once
 pygame.mixer.init()
@@ -30,29 +39,24 @@ def clean_text_for_speech(text):
     )
     return emoji_pattern.sub(r'', text)
 
-# Async TTS to audio file
-async def text_to_audio_file(text, file_path):
-    if os.path.exists(file_path):
-        os.remove(file_path)  # Remove old file
-    communicate = edge_tts.Communicate(text, AssistantVoice, pitch='+5Hz', rate='+13%')
-    await communicate.save(file_path)
+# TTS straight into memory: edge-tts, or the offline voice when the network is slow/down
+def text_to_audio_bytes(text):
+    return get_engine_router().synthesize(text, AssistantVoice, AssistantRate, AssistantPitch)
+
+def _synth_chunk(chunk):
+    # Canned lines ("check the chat screen", greetings) come from the disk cache
+    return get_speech_cache().get_bytes(chunk, AssistantVoice, AssistantRate, AssistantPitch, text_to_audio_bytes)
 
-# Core TTS function
+# Core TTS function (blocking; func() returning False stops it)
 def TTS(text, func=lambda r=None: True):
+    item = None
     try:
         text_for_speech = clean_text_for_speech(text)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-            file_path = temp_file.name
-
-        asyncio.run(text_to_audio_file(text_for_speech, file_path))
+        item = get_audio_engine().speak(text_for_speech, _synth_chunk, ANSWER, label="answer")
 
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.play()
-
-        while pygame.mixer.music.get_busy():
+        while not item.wait(0.1):
             if func() is False:
                 break
-            pygame.time.Clock().tick(10)
 
         return True
     except Exception as e:
@@ -61,25 +65,16 @@ def TTS(text, func=lambda r=None: True):
     finally:
         try:
             func(False)
-            pygame.mixer.music.stop()
+            if item is not None and not item.done.is_set():
+                item.cancel()
         except Exception:
             pass
 
 # Smarter TextToSpeech manager
 def TextToSpeech(text, func=lambda r=None: True):
-    sentences = str(text).split(".")
-    responses = [
-        "The rest of the result has been printed to the chat screen, kindly check it out sir.",
-        "Please check the chat screen for the remaining text, sir.",
-        "You'll find the rest of the answer on the chat screen, sir.",
-        "The continuation of the text is available on the chat screen, sir."
-    ]
-
-    if len(sentences) > 4 and len(text) >= 250:
-        partial_text = ". ".join(sentences[:2]) + ". " + random.choice(responses)
-        TTS(partial_text, func)
-    else:
-        TTS(text, func)
+    # Over the speech budget: speak a summary and point to the chat screen
+    spoken, _ = condense_for_speech(str(text))
+    TTS(spoken, func)
 
 
 # Alias so GUI.py can still import `speak`
@@ -137,4 +132,5 @@ if __name__ == "__main__":
             break
 
     pygame.mixer.quit()
+    print(get_speech_cache().report())
     print("Goodbye 👋")
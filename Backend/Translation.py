@@ -0,0 +1,254 @@
+# Backend/Translation.py
+"""
+Translate-to-English with a local fast path
+-------------------------------------------
+Most voice turns are already English, yet every one used to make an
+mtranslate round trip. detect_language() is a small character n-gram
+(1-3) naive Bayes model trained at import from the sample sentences below,
+plus a script check (Devanagari is Hindi, other non-Latin scripts are
+"other"). English text is returned as-is; anything else goes through
+mtranslate behind an LRU cache. Uncertain results are translated, so the
+fast path never skips a phrase that needed it.
+"""
+
+import re
+import math
+import time
+import threading
+from collections import Counter, OrderedDict
+
+# ---------- Settings ----------
+CACHE_SIZE = 256        # translated phrases kept (LRU)
+MIN_MARGIN = 2.0        # log-prob lead English needs over the runner-up
+NGRAM_SIZES = (1, 2, 3)
+
+# ---------- Training sentences (a few per language is enough for short commands) ----------
+SAMPLES = {
+    "en": """
+        what is the weather like today. open youtube and play some music. tell me a joke.
+        can you write an application for a leave from school. who is the prime minister of india.
+        set a reminder for tomorrow morning. how are you doing today. send a message to my brother.
+        close chrome and open notepad. what time is it right now. search for the latest news about cricket.
+        please create a presentation on climate change. thank you very much, that was helpful.
+        I want to know more about the history of the internet. where is the nearest hospital.
+        turn up the volume a little bit. make a pdf of these images. generate an image of a sunset over the sea.
+        which movie should I watch tonight. explain how a computer works in simple words.
+    """,
+    "hi": """
+        aaj mausam kaisa hai. mujhe ek gaana sunao. kya haal hai tumhara. mera naam riya hai.
+        youtube kholo aur gaana chalao. mujhe kal subah jaldi uthna hai. bhai ko message bhej do.
+        yeh kya ho raha hai. mujhe samajh nahi aaya, phir se batao. tum kahan ho abhi.
+        khana kab banega. chalo bahar ghoomne chalte hain. mujhe neend aa rahi hai.
+        kitne baje hain abhi. aaj ki taaza khabar sunao. thoda awaaz badhao. bahut accha kaam kiya tumne.
+        meri madad karo please. ek kahani sunao mujhe. kya tum mere liye ek application likh sakti ho.
+    """,
+    "es": """
+        que tiempo hace hoy. abre youtube y pon algo de musica. cuentame un chiste por favor.
+        como estas hoy. envia un mensaje a mi hermano. que hora es ahora mismo.
+        busca las ultimas noticias sobre futbol. muchas gracias, eso fue muy util.
+        quiero saber mas sobre la historia de internet. donde esta el hospital mas cercano.
+        sube un poco el volumen. crea una presentacion sobre el cambio climatico.
+    """,
+    "fr": """
+        quel temps fait il aujourd'hui. ouvre youtube et mets de la musique. raconte moi une blague.
+        comment vas tu aujourd'hui. envoie un message a mon frere. quelle heure est il maintenant.
+        cherche les dernieres nouvelles sur le football. merci beaucoup, c'etait tres utile.
+        je veux en savoir plus sur l'histoire d'internet. ou est l'hopital le plus proche.
+        monte un peu le volume. fais une presentation sur le changement climatique.
+    """,
+    "de": """
+        wie ist das wetter heute. offne youtube und spiel etwas musik. erzahl mir einen witz.
+        wie geht es dir heute. schick eine nachricht an meinen bruder. wie spat ist es jetzt.
+        suche die neuesten nachrichten uber fussball. vielen dank, das war sehr hilfreich.
+        ich mochte mehr uber die geschichte des internets wissen. wo ist das nachste krankenhaus.
+        mach die musik etwas lauter. erstelle eine prasentation uber den klimawandel.
+    """,
+}
+
+_DEVANAGARI = re.compile(r"[ऀ-ॿ]")
+_LATIN = re.compile(r"[A-Za-zÀ-ɏ]")
+_LETTER = re.compile(r"[^\W\d_]", re.UNICODE)
+_CLEAN = re.compile(r"[^a-zÀ-ɏ' ]+")
+
+
+def _ngrams(text):
+    text = " " + _CLEAN.sub(" ", text.lower()).strip() + " "
+    text = re.sub(r"\s+", " ", text)
+    for n in NGRAM_SIZES:
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if gram != " " * n:
+                yield gram
+
+
+class NgramLanguageModel:
+    """Character n-gram naive Bayes with add-one smoothing."""
+
+    def __init__(self, samples=SAMPLES):
+        self.counts = {lang: Counter(_ngrams(text)) for lang, text in samples.items()}
+        self.totals = {lang: sum(c.values()) for lang, c in self.counts.items()}
+        self.vocab = len(set().union(*self.counts.values()))
+
+    def scores(self, text):
+        grams = list(_ngrams(text))
+        out = {}
+        for lang, counts in self.counts.items():
+            denom = math.log(self.totals[lang] + self.vocab)
+            out[lang] = sum(math.log(counts[g] + 1) - denom for g in grams)
+        return out
+
+    def detect(self, text):
+        """(language, margin over the runner-up in log-prob)."""
+        scores = self.scores(text)
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return ranked[0], scores[ranked[0]] - scores[ranked[1]]
+
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_language_model() -> NgramLanguageModel:
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = NgramLanguageModel()
+        return _model
+
+def detect_language(text):
+    """(language code or "other", confidence margin); script decides before the model."""
+    letters = _LETTER.findall(text)
+    if not letters:
+        return "other", 0.0
+    if len(_DEVANAGARI.findall(text)) * 2 >= len(letters):
+        return "hi", math.inf
+    if len(_LATIN.findall(text)) * 2 < len(letters):
+        return "other", math.inf
+    return get_language_model().detect(text)
+
+def is_english(text) -> bool:
+    lang, margin = detect_language(text)
+    return lang == "en" and margin >= MIN_MARGIN
+
+
+class TranslationCache:
+    """Small LRU of source text -> English translation."""
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text):
+        with self._lock:
+            if text in self._items:
+                self._items.move_to_end(text)
+                return self._items[text]
+        return None
+
+    def put(self, text, translated):
+        with self._lock:
+            self._items[text] = translated
+            self._items.move_to_end(text)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+
+def _mtranslate(text):
+    import mtranslate
+    return mtranslate.translate(text, "en", "auto")
+
+
+class Translator:
+    def __init__(self, translate=_mtranslate, cache_size=CACHE_SIZE, fast_path=True):
+        self.translate = translate
+        self.cache = TranslationCache(cache_size)
+        self.fast_path = fast_path
+        self._lock = threading.Lock()
+        self.stats = {"english": [], "cached": [], "translated": [], "failed": 0}
+
+    def _record(self, kind, start):
+        with self._lock:
+            bucket = self.stats[kind]
+            bucket.append((time.perf_counter() - start) * 1000)
+            del bucket[:-200]
+
+    def to_english(self, text: str) -> str:
+        """English text as-is; anything else translated (cached). Failures return the input."""
+        start = time.perf_counter()
+        text = text.strip()
+        if not text:
+            return text
+        if self.fast_path and is_english(text):
+            self._record("english", start)
+            return text
+        key = text.lower()
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._record("cached", start)
+            return cached
+        try:
+            translated = self.translate(text).capitalize()
+        except Exception as e:
+            with self._lock:
+                self.stats["failed"] += 1
+            print(f"⚠️ Translation failed: {e}")
+            return text
+        self.cache.put(key, translated)
+        self._record("translated", start)
+        return translated
+
+    def report(self) -> str:
+        with self._lock:
+            parts = []
+            for kind in ("english", "cached", "translated"):
+                ms = self.stats[kind]
+                avg = sum(ms) / len(ms) if ms else 0.0
+                parts.append(f"{kind} {len(ms)} ({avg:.1f} ms)")
+            return f"🌐 Translation: {', '.join(parts)}, failed {self.stats['failed']}"
+
+
+_translator = None
+_translator_lock = threading.Lock()
+
+def get_translator() -> Translator:
+    """Process-wide translator shared by SpeechToText and SpeechToSpeech."""
+    global _translator
+    with _translator_lock:
+        if _translator is None:
+            _translator = Translator()
+        return _translator
+
+# -------------- CLI (accuracy + latency with and without the fast path) --------------
+if __name__ == "__main__":
+    import sys
+
+    utterances = [
+        ("open youtube and play some songs", "en"), ("what is the capital of australia", "en"),
+        ("tell me today's headlines", "en"), ("create a ppt on artificial intelligence", "en"),
+        ("how old is the taj mahal", "en"), ("send hello to mom on whatsapp", "en"),
+        ("write a letter to my principal", "en"), ("stop", "en"), ("good morning riya", "en"),
+        ("mujhe ek joke sunao", "hi"), ("aaj kya khabar hai", "hi"), ("gaana band karo", "hi"),
+        ("आज मौसम कैसा है", "hi"), ("pon la musica mas alta", "es"), ("quelle est la meteo demain", "fr"),
+        ("wie heisst du", "de"),
+    ]
+    correct = sum((detect_language(t)[0] == lang) for t, lang in utterances)
+    skipped = [t for t, lang in utterances if is_english(t)]
+    wrong_skips = [t for t in skipped if dict(utterances)[t] != "en"]
+    print(f"🔤 Language ID: {correct}/{len(utterances)} correct | English fast path on "
+          f"{len(skipped)}/{sum(l == 'en' for _, l in utterances)} English phrases, "
+          f"{len(wrong_skips)} non-English skipped")
+
+    if "--mt" in sys.argv:
+        translate = _mtranslate                  # real network round trips
+    else:
+        def translate(text):                     # stand-in: ~300 ms round trip
+            time.sleep(0.3)
+            return text
+    turns = [t for t, _ in utterances] * 3       # repeated phrases hit the cache
+    for label, fast, size in (("old (always translate)", False, 0), ("fast path + LRU cache", True, CACHE_SIZE)):
+        translator = Translator(translate, cache_size=size, fast_path=fast)
+        start = time.perf_counter()
+        for t in turns:
+            translator.to_english(t)
+        per_turn = (time.perf_counter() - start) / len(turns) * 1000
+        print(f"⏱ {label:>22}: {per_turn:6.1f} ms/turn | {translator.report()}")
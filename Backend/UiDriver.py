@@ -0,0 +1,271 @@
+# Backend/UiDriver.py
+"""
+UI drivers and readiness probes for desktop automation
+------------------------------------------------------
+Instead of sleeping a fixed 8 s / 1 s / 2 s around every WhatsApp message,
+the flow polls cheap probes (is the window there, is it focused) every
+POLL_INTERVAL seconds and moves on the moment they pass, up to an overall
+deadline. Opening the chat is only probed when the driver can see the chat
+header; the pyautogui driver sees window titles only, and WhatsApp's title
+doesn't change per chat, so there the old conservative 2 s wait stays
+between selecting the contact and typing. The driver (keyboard, window list, clock) is pluggable: the
+pyautogui one drives the real desktop, FakeDriver simulates an app with a
+virtual clock so the timing logic can be exercised on Linux.
+"""
+
+import time
+import subprocess
+from abc import ABC, abstractmethod
+
+POLL_INTERVAL = 0.1      # seconds between probes
+LAUNCH_TIMEOUT = 20      # cold start on a slow machine
+FOCUS_TIMEOUT = 3
+CHAT_TIMEOUT = 5         # chat header showing the contact after Enter
+CHAT_SETTLE = 2.0        # fixed wait when the driver can't see the chat header
+WHATSAPP_TITLE = "WhatsApp"
+
+
+class ReadinessTimeout(Exception):
+    pass
+
+
+# -------------------- Drivers --------------------
+
+class UiDriver(ABC):
+    """What the flows need from the desktop. Time goes through the driver too."""
+
+    @abstractmethod
+    def launch(self, uri): ...
+    @abstractmethod
+    def active_title(self) -> str: ...
+    @abstractmethod
+    def has_window(self, title) -> bool: ...
+    @abstractmethod
+    def focus(self, title) -> bool: ...
+    @abstractmethod
+    def hotkey(self, *keys): ...
+    @abstractmethod
+    def write(self, text): ...
+    @abstractmethod
+    def press(self, key): ...
+
+    def chat_header(self):
+        """Name shown in the open chat's header, or None if this driver can't see it."""
+        return None
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class PyAutoGuiDriver(UiDriver):
+    """Real desktop: pyautogui for keys, its window helpers (pygetwindow) for titles."""
+
+    def __init__(self):
+        import pyautogui
+        self.gui = pyautogui
+
+    def launch(self, uri):
+        subprocess.Popen(["start", uri], shell=True)
+
+    def _windows(self, title):
+        try:
+            return [w for w in self.gui.getWindowsWithTitle(title) if w.title]
+        except Exception:
+            return []
+
+    def active_title(self) -> str:
+        try:
+            win = self.gui.getActiveWindow()
+            return win.title if win else ""
+        except Exception:
+            return ""
+
+    def has_window(self, title) -> bool:
+        return bool(self._windows(title))
+
+    def focus(self, title) -> bool:
+        for win in self._windows(title):
+            try:
+                if win.isMinimized:
+                    win.restore()
+                win.activate()
+                return True
+            except Exception:
+                continue
+        return False
+
+    def hotkey(self, *keys):
+        self.gui.hotkey(*keys)
+
+    def write(self, text):
+        self.gui.write(text)
+
+    def press(self, key):
+        self.gui.press(key)
+
+
+class FakeDriver(UiDriver):
+    """
+    Simulated app on a virtual clock: the window shows up `launch_delay`
+    seconds after launch() and takes focus `focus_delay` seconds after
+    focus(). Every key action is recorded in .actions.
+    """
+
+    def __init__(self, title=WHATSAPP_TITLE, running=False, launch_delay=3.0, focus_delay=0.2,
+                 never_starts=False, chat_delay=0.6, sees_chat=True):
+        self.title = title
+        self.launch_delay = launch_delay
+        self.focus_delay = focus_delay
+        self.never_starts = never_starts
+        self.chat_delay = chat_delay
+        self.sees_chat = sees_chat
+        self.clock = 0.0
+        self.actions = []
+        self._window_at = 0.0 if running else None
+        self._focused_at = None
+        self._searching = None
+        self._chat = ("", 0.0)     # (contact, shown at)
+
+    def now(self):
+        return self.clock
+
+    def sleep(self, seconds):
+        self.clock += seconds
+
+    def launch(self, uri):
+        self.actions.append(("launch", uri))
+        if self._window_at is None and not self.never_starts:
+            self._window_at = self.clock + self.launch_delay
+
+    def has_window(self, title) -> bool:
+        return self._window_at is not None and self.clock >= self._window_at and title in self.title
+
+    def focus(self, title) -> bool:
+        if not self.has_window(title):
+            return False
+        if self._focused_at is None:
+            self._focused_at = self.clock + self.focus_delay
+        return True
+
+    def active_title(self) -> str:
+        if self._focused_at is not None and self.clock >= self._focused_at:
+            return self.title
+        return "Desktop"
+
+    def hotkey(self, *keys):
+        self.actions.append(("hotkey", keys))
+        if keys == ("ctrl", "f"):
+            self._searching = ""
+
+    def write(self, text):
+        self.actions.append(("write", text))
+        if self._searching is not None:
+            self._searching += text
+
+    def press(self, key):
+        self.actions.append(("press", key))
+        if key == "enter" and self._searching is not None:
+            self._chat = (self._searching, self.clock + self.chat_delay)
+            self._searching = None
+
+    def chat_header(self):
+        if not self.sees_chat:
+            return None
+        contact, shown_at = self._chat
+        return contact if self.clock >= shown_at else ""
+
+
+_driver = None
+
+def get_ui_driver() -> UiDriver:
+    global _driver
+    if _driver is None:
+        _driver = PyAutoGuiDriver()
+    return _driver
+
+def set_ui_driver(driver: UiDriver):
+    global _driver
+    _driver = driver
+
+# -------------------- Probes --------------------
+
+def wait_until(driver, probe, timeout, what="condition", interval=POLL_INTERVAL):
+    """Poll probe() until it's truthy; returns seconds waited or raises ReadinessTimeout."""
+    start = driver.now()
+    while True:
+        if probe():
+            return driver.now() - start
+        if driver.now() - start >= timeout:
+            raise ReadinessTimeout(f"{what} not ready after {timeout:.0f}s")
+        driver.sleep(interval)
+
+def window_present(driver, title):
+    return lambda: driver.has_window(title)
+
+def window_focused(driver, title):
+    return lambda: title.lower() in driver.active_title().lower()
+
+# -------------------- Flows --------------------
+
+def whatsapp_send(contact_name, message="", driver=None, launch_timeout=LAUNCH_TIMEOUT):
+    """
+    Bring WhatsApp to the front (launching it only if needed), open the chat
+    and send. Returns {stage: seconds}; raises ReadinessTimeout.
+    """
+    driver = driver or get_ui_driver()
+    timings = {}
+    start = driver.now()
+
+    if not driver.has_window(WHATSAPP_TITLE):
+        driver.launch("whatsapp:")
+        timings["launch"] = wait_until(driver, window_present(driver, WHATSAPP_TITLE),
+                                       launch_timeout, "WhatsApp window")
+
+    # Focus can be refused while the window is still coming up, so re-ask each poll
+    focused = window_focused(driver, WHATSAPP_TITLE)
+    timings["focus"] = wait_until(driver, lambda: focused() or (driver.focus(WHATSAPP_TITLE) and focused()),
+                                  FOCUS_TIMEOUT, "WhatsApp focus")
+
+    driver.hotkey('ctrl', 'f')
+    driver.write(contact_name)
+    driver.press('enter')
+    if driver.chat_header() is None:
+        # Nothing observable: typing too early would land in the search box
+        driver.sleep(CHAT_SETTLE)
+        timings["chat"] = CHAT_SETTLE
+    else:
+        timings["chat"] = wait_until(driver, lambda: contact_name.lower() in (driver.chat_header() or "").lower(),
+                                     CHAT_TIMEOUT, f"Chat with {contact_name}")
+    if not focused():
+        raise ReadinessTimeout("WhatsApp lost focus while opening the chat")
+
+    if message:
+        driver.write(message)
+        driver.press('enter')
+    timings["total"] = driver.now() - start
+    return timings
+
+# -------------- CLI (fake-driver checks) --------------
+if __name__ == "__main__":
+    old_fixed = 8 + 1 + 2
+    cases = [
+        ("already open", FakeDriver(running=True)),
+        ("cold start 3s", FakeDriver(launch_delay=3.0)),
+        ("slow machine 14s", FakeDriver(launch_delay=14.0)),
+        ("slow chat 3s", FakeDriver(running=True, chat_delay=3.0)),
+        ("no chat header", FakeDriver(running=True, sees_chat=False)),
+        ("chat never opens", FakeDriver(running=True, chat_delay=60.0)),
+        ("never starts", FakeDriver(never_starts=True)),
+    ]
+    for label, fake in cases:
+        try:
+            t = whatsapp_send("mom", "hi", driver=fake)
+            stages = " | ".join(f"{k} {v:.1f}s" for k, v in t.items())
+            print(f"✅ {label:>16}: {stages}  (old fixed waits: {old_fixed}s)")
+            assert fake.actions[-2:] == [("write", "hi"), ("press", "enter")]
+        except ReadinessTimeout as e:
+            print(f"⚠️ {label:>16}: {e} after {fake.clock:.1f}s, message typed: "
+                  f"{('write', 'hi') in fake.actions}")
@@ -0,0 +1,305 @@
+# Backend/WebSearch.py
+"""
+Search-and-extract stage for the realtime fallback
+--------------------------------------------------
+Runs a web search, fetches the top-k result pages concurrently with a
+per-page deadline, extracts the readable text off the network threads and
+returns a compact, deduplicated snippet digest for the LLM prompt. The
+fetch stage ends as soon as all but one of the k bodies have arrived: the
+slowest page rarely adds anything the others didn't already say.
+"""
+
+import re
+import time
+import hashlib
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import requests
+
+# ---------- Defaults ----------
+TOP_K            = 5        # result pages to fetch
+PAGE_TIMEOUT     = 1.5      # seconds per page (connect + read)
+FETCH_DEADLINE   = 2.0      # seconds for the whole fetch stage
+MAX_PAGE_BYTES   = 800_000  # ignore anything past this
+SNIPPETS_PER_URL = 3
+SNIPPET_CHARS    = 320
+DIGEST_CHARS     = 2400
+EXTRACT_WORKERS  = 4
+USE_PROCESSES    = False    # True -> extract text in a process pool
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# -------------------- Backends --------------------
+
+class GoogleBackend:
+    """googlesearch-based backend, without the fixed pause between requests."""
+
+    def __init__(self):
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+
+    def search(self, query, k):
+        from googlesearch import search
+        # Only one results page is requested, so the inter-request pause is not needed.
+        return list(search(query, num=k, stop=k, pause=0))
+
+    def fetch(self, url, timeout):
+        with self._session.get(url, timeout=timeout, stream=True) as r:
+            r.raise_for_status()
+            if "html" not in r.headers.get("Content-Type", "text/html"):
+                return ""
+            body = r.raw.read(MAX_PAGE_BYTES, decode_content=True)
+            return body.decode(r.encoding or "utf-8", errors="ignore")
+
+
+class StaticBackend:
+    """
+    Local stand-in: serves canned results and pages from dicts.
+    `delays` (url -> seconds) simulates slow pages.
+    """
+
+    def __init__(self, results=None, pages=None, delays=None):
+        self.results = results or {}
+        self.pages = pages or {}
+        self.delays = delays or {}
+
+    def search(self, query, k):
+        return list(self.results.get(query, []))[:k]
+
+    def fetch(self, url, timeout):
+        delay = self.delays.get(url, 0)
+        if delay:
+            time.sleep(min(delay, timeout))
+            if delay > timeout:
+                raise requests.Timeout(f"{url} timed out")
+        if url not in self.pages:
+            raise requests.HTTPError(f"404 for {url}")
+        return self.pages[url]
+
+
+_default_backend = None
+
+def get_backend():
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = GoogleBackend()
+    return _default_backend
+
+def set_backend(backend):
+    """Swap the search backend (e.g. a StaticBackend for offline runs)."""
+    global _default_backend
+    _default_backend = backend
+
+# -------------------- Text Extraction --------------------
+
+_SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe"}
+_BLOCK_TAGS = {"p", "li", "h1", "h2", "h3", "h4", "td", "article", "section", "div", "br", "blockquote"}
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip = 0
+        self._parts = []
+        self.title = ""
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip:
+            self._skip -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self._parts.append(data)
+
+    def text(self):
+        return "".join(self._parts)
+
+
+def extract_text(html: str) -> tuple:
+    """Return (title, main_text) for an HTML page. Picklable for process pools."""
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    blocks = []
+    for block in parser.text().split("\n"):
+        block = re.sub(r"\s+", " ", block).strip()
+        # Menus, buttons and cookie banners are short; keep prose-like blocks
+        if len(block) >= 60 and block.count(" ") >= 8:
+            blocks.append(block)
+    return parser.title.strip(), "\n".join(blocks)
+
+# -------------------- Digest --------------------
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+def _terms(text):
+    return {w for w in _WORD.findall(text.lower()) if len(w) > 2}
+
+def _fingerprint(sentence):
+    words = _WORD.findall(sentence.lower())
+    return hashlib.sha1(" ".join(words[:24]).encode()).hexdigest()
+
+def build_digest(query, pages, per_url=SNIPPETS_PER_URL, max_chars=DIGEST_CHARS):
+    """
+    pages: list of (url, title, text) in search-rank order.
+    Picks the sentences that share the most terms with the query, drops
+    near-duplicates across pages and caps the total size.
+    """
+    q_terms = _terms(query)
+    seen = set()
+    lines = []
+    used = 0
+    for url, title, text in pages:
+        scored = []
+        for pos, sentence in enumerate(_SENTENCE_SPLIT.split(text)):
+            sentence = sentence.strip()
+            if len(sentence) < 40:
+                continue
+            overlap = len(q_terms & _terms(sentence))
+            # Earlier sentences win ties: leads tend to summarise the page
+            scored.append((overlap, -pos, sentence))
+        scored.sort(reverse=True)
+
+        picked = []
+        for overlap, _, sentence in scored:
+            if len(picked) >= per_url:
+                break
+            fp = _fingerprint(sentence)
+            if fp in seen:
+                continue
+            seen.add(fp)
+            picked.append(sentence[:SNIPPET_CHARS])
+
+        if not picked:
+            continue
+        entry = f"- {title or url} ({url})\n" + "".join(f"  • {s}\n" for s in picked)
+        if used + len(entry) > max_chars:
+            break
+        lines.append(entry)
+        used += len(entry)
+    return "".join(lines)
+
+# -------------------- Pipeline --------------------
+
+_fetch_pool = ThreadPoolExecutor(max_workers=TOP_K * 2, thread_name_prefix="websearch-fetch")
+_extract_pool = None
+
+def _get_extract_pool():
+    global _extract_pool
+    if _extract_pool is None:
+        if USE_PROCESSES:
+            _extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+        else:
+            _extract_pool = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix="websearch-extract")
+    return _extract_pool
+
+
+def search_and_extract(query, k=TOP_K, backend=None, page_timeout=PAGE_TIMEOUT, deadline=FETCH_DEADLINE,
+                       enough=None):
+    """
+    Fetching stops at the deadline or once `enough` pages (default k-1)
+    returned a body, whichever comes first. Returns a dict:
+      urls     - ranked result URLs
+      pages    - [(url, title, text)] for pages that made the deadline
+      digest   - compact snippet digest for the prompt
+      timings  - per-stage latency in seconds (search, fetch, extract, digest, total)
+    """
+    backend = backend or get_backend()
+    timings = {}
+    t0 = time.perf_counter()
+
+    urls = backend.search(query, k)
+    t_search = time.perf_counter()
+    timings["search"] = t_search - t0
+
+    # Fetch every page at once; extraction starts as soon as each body arrives
+    extract_pool = _get_extract_pool()
+    fetches = {_fetch_pool.submit(backend.fetch, url, page_timeout): url for url in urls}
+    extracts = {}
+    pending = set(fetches)
+    stop_at = t_search + deadline
+    enough = max(1, k - 1) if enough is None else enough
+    while pending and len(extracts) < enough:
+        remaining = stop_at - time.perf_counter()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for fut in done:
+            try:
+                html = fut.result()
+            except Exception:
+                continue
+            if html:
+                extracts[fetches[fut]] = extract_pool.submit(extract_text, html)
+    for fut in pending:
+        fut.cancel()  # late pages are dropped, not waited for
+    t_fetch = time.perf_counter()
+    timings["fetch"] = t_fetch - t_search
+
+    pages = []
+    for url in urls:
+        fut = extracts.get(url)
+        if fut is None:
+            continue
+        try:
+            title, text = fut.result(timeout=max(0.1, stop_at - time.perf_counter()))
+        except Exception:
+            continue
+        if text:
+            pages.append((url, title, text))
+    t_extract = time.perf_counter()
+    timings["extract"] = t_extract - t_fetch
+
+    digest = build_digest(query, pages)
+    t_end = time.perf_counter()
+    timings["digest"] = t_end - t_extract
+    timings["total"] = t_end - t0
+
+    return {"urls": urls, "pages": pages, "digest": digest, "timings": timings}
+
+
+def format_timings(timings: dict) -> str:
+    return " | ".join(f"{stage}: {secs * 1000:.0f} ms" for stage, secs in timings.items())
+
+# -------------- CLI (latency breakdown) --------------
+if __name__ == "__main__":
+    import sys
+
+    if "--offline" in sys.argv:
+        # Slow third page exercises the per-page deadline
+        lorem = "Pune weather today is warm with light winds and a chance of evening showers across the city. "
+        pages = {f"https://example.com/{i}": f"<html><title>Page {i}</title><p>{lorem * 3}</p><p>Extra fact number {i} about the Pune forecast and the humidity levels observed this week.</p></html>" for i in range(5)}
+        set_backend(StaticBackend(
+            results={"pune weather": list(pages)},
+            pages=pages,
+            delays={"https://example.com/2": PAGE_TIMEOUT + 1},
+        ))
+        query = "pune weather"
+    else:
+        query = input("Query: ").strip()
+
+    result = search_and_extract(query)
+    print(result["digest"] or "(no snippets)")
+    print(f"⏱ {format_timings(result['timings'])}")
+    print(f"📄 {len(result['pages'])}/{len(result['urls'])} pages made the deadline")
@@ -1,6 +1,8 @@
 # main.py
 import sys
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -25,16 +27,22 @@ except Exception:
 from PyQt5.QtCore import QObject, QThread, pyqtSignal
 from PyQt5.QtWidgets import QApplication
 
-# -------------------- External libs (mic) ------------------------------------------
-import speech_recognition as sr
-
 # -------------------- Project modules (package imports) -----------------------------
 from Frontend import GUI
-from Backend.SpeechToText import SpeechToText
+from Backend.SpeechToText import QueryModifier, UniversalTranslator
+from Backend.StreamingSTT import StreamingRecognizer
+from Backend.Recognizers import get_recognizer_backend
 from Backend.SpeechToSpeech import TTS, stop_tts
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
-from Backend.Automation import automation_commands
+from Backend.SpeechCache import get_speech_cache
+from Backend.SpeechService import get_speech_service
+from Backend.SpeechEngines import get_engine_router
+from Backend.Translation import get_translator
+from Backend.SpeechBudget import condense_for_speech
+from Backend.RealtimeSearchEngine import RealtimeSearchEngine, start_prefetch, stop_prefetch
+from Backend.Automation import automation_commands, app_index
+from Backend.CpuPool import warm_up as warm_up_cpu_pool
 from Backend.Chatbot import chat_with_ai
+from Backend.QueryDecomposer import answer_query
 
 # -------------------- STT Worker ---------------------------------------------------
 class STTWorker(QObject):
@@ -50,18 +58,23 @@ class STTWorker(QObject):
 
     def run(self):
         """Continuously listens and emits recognized text."""
-        recognizer = sr.Recognizer()
+        # Capture, VAD endpointing and recognition run on their own threads,
+        # so the mic keeps recording while an utterance is being recognized
+        stream = None
         try:
-            with sr.Microphone() as source:
-                recognizer.adjust_for_ambient_noise(source, duration=1)
-                while not self._stop:
-                    text = SpeechToText(recognizer, source)
-                    if self._stop:
-                        break
-                    if text:
-                        self.text_ready.emit(text)
+            stream = StreamingRecognizer().start()
+            while not self._stop:
+                result = stream.get(timeout=0.2)
+                if self._stop:
+                    break
+                if result is not None:
+                    self.text_ready.emit(QueryModifier(UniversalTranslator(result.text)))
         except Exception as e:
             self.error.emit(f"⚠️ Microphone error: {e}")
+        finally:
+            if stream is not None:
+                stream.stop()
+                print(stream.report())
 
 # -------------------- App Controller ----------------------------------------------
 class RiyaController(QObject):
@@ -105,6 +118,33 @@ class RiyaController(QObject):
         self._stt_thread = None
         self._stt_worker = None
 
+        # User turns are answered here, in order, off the GUI thread
+        self._turns = ThreadPoolExecutor(max_workers=1, thread_name_prefix="turn")
+
+        # Speech-budget savings, reported once at exit
+        self._speech_savings = {"turns": 0, "condensed": 0, "saved_seconds": 0.0}
+
+        # Pick the speech recognizer now (a local model starts loading if PreloadRecognizer=true)
+        try:
+            get_recognizer_backend()
+        except Exception:
+            pass
+
+        # Index installed apps in the background so "open X" is a lookup
+        try:
+            app_index.start()
+        except Exception:
+            pass
+
+        # Start the PDF/pptx worker processes now, off the GUI thread
+        threading.Thread(target=warm_up_cpu_pool, name="cpu-pool-warm-up", daemon=True).start()
+
+        # Keep watched realtime answers (weather, tickers, news...) warm
+        try:
+            start_prefetch()
+        except Exception:
+            pass
+
         # 🔔 Show greeting immediately (in UI + TTS), then load history below it, then persist greeting
         try:
             self._show_greeting_then_load_and_save()
@@ -236,6 +276,14 @@ class RiyaController(QObject):
         self._stt_thread = None
 
     def handle_user_text(self, text: str):
+        """
+        Queue a turn. Turns run one at a time on the turn thread, so PDF/pptx
+        builds, WhatsApp and network answers never block the GUI thread; the
+        chat is updated through the append_chat/set_busy signals.
+        """
+        return self._turns.submit(self._answer_turn, text)
+
+    def _answer_turn(self, text: str):
         """Append user text, route it, append answer, speak it, and persist both."""
         try:
             # show + save user message
@@ -247,35 +295,29 @@ class RiyaController(QObject):
                 pass
 
             # --------- Priority routing ----------
-            low = text.lower().strip()
-
-            # 1) Automation intents (open/close/create/ppt/whatsapp/etc.)
-            automation_triggers = (
-                "open", "launch", "close", "create a folder",
-                "create pdf from recent downloads", "whatsapp", "ppt", "presentation"
-            )
-            if any(trig in low for trig in automation_triggers):
-                answer = automation_commands(text)  # pass original text
-
-            # 2) Real-time: weather/news/stock/crypto keywords
-            elif any(k in low for k in (
-                "weather", "news", "stock", "stock price", "crypto",
-                "bitcoin", "ethereum", "solana", "dogecoin"
-            )):
-                answer = RealtimeSearchEngine(text)
-
-            # 3) Otherwise: general chat
-            else:
-                answer = chat_with_ai(text)
+            # automation (open/close/create/ppt/whatsapp/etc.) > realtime
+            # (weather/news/stock/crypto) > general chat. Compound requests are
+            # split and their parts answered concurrently.
+            answer = answer_query(text, {
+                "automation": automation_commands,
+                "realtime": RealtimeSearchEngine,
+                "chat": chat_with_ai,
+            })
 
             # show + save assistant message
             self.append_chat.emit(f"🤖 Riya: {answer}")
             self._save_message("assistant", answer)
 
-            # speak
+            # speak (long answers: a condensed version; the chat keeps the full text)
             try:
+                spoken, info = condense_for_speech(answer)
+                savings = self._speech_savings
+                savings["turns"] += 1
+                if info["condensed"]:
+                    savings["condensed"] += 1
+                    savings["saved_seconds"] += info["saved_seconds"]
                 stop_tts()  # interrupt previous speech if any
-                TTS(answer)
+                TTS(spoken)
             except Exception as e:
                 self.append_chat.emit(f"⚠️ TTS error: {e}")
 
@@ -299,7 +341,18 @@ class RiyaController(QObject):
     def cleanup(self):
         try:
             self.stop_stt()
-            stop_tts()
+            stop_tts(everything=True)
+            stop_prefetch()
+            print(get_speech_cache().report())
+            print(get_speech_service().report())
+            print(get_engine_router().report())
+            print(get_translator().report())
+            print(f"🎤 Recognizer: {get_recognizer_backend().report()}")
+            savings = self._speech_savings
+            print(f"🗣 Speech budget: {savings['condensed']}/{savings['turns']} answers condensed, "
+                  f"~{savings['saved_seconds']:.0f}s of audio saved")
+            get_speech_service().stop()
+            self._turns.shutdown(wait=False, cancel_futures=True)
         except Exception:
             pass
 
@@ -316,5 +369,74 @@ def main():
     app.aboutToQuit.connect(controller.cleanup)
     sys.exit(app.exec_())
 
+# -------------------- GUI responsiveness benchmark --------------------------------
+def _bench_event_loop(pages=30):
+    """
+    Frame lateness of the real Qt event loop while "create pdf from recent
+    downloads" runs: answered on the GUI thread (old) vs on the turn thread.
+    Uses a temporary home folder with generated screenshots and chat log.
+    """
+    import os
+    import time
+    import tempfile
+    from PIL import Image
+    from PyQt5.QtCore import QTimer, QEventLoop
+
+    global HISTORY_PATH
+    tmp = tempfile.mkdtemp()
+    downloads = os.path.join(tmp, "Downloads")
+    os.makedirs(downloads)
+    for i in range(pages):
+        Image.effect_noise((2000, 1500), 30 + i % 20).convert("RGB").save(os.path.join(downloads, f"shot_{i:03d}.png"))
+    os.environ["HOME"] = os.environ["USERPROFILE"] = tmp
+    HISTORY_PATH = Path(tmp) / "GUIChatLog.json"
+    HISTORY_PATH.write_text("[]", encoding="utf-8")
+
+    app = QApplication(sys.argv)
+    controller = RiyaController()
+    warm_up_cpu_pool()
+    command = "create pdf from recent downloads"
+
+    def measure(run_turn):
+        late, last = [], [time.perf_counter()]
+        def tick():
+            now = time.perf_counter()
+            late.append(max(0.0, now - last[0] - 0.016) * 1000)
+            last[0] = now
+        timer = QTimer()
+        timer.timeout.connect(tick)
+        timer.start(16)
+        start = time.perf_counter()
+        run_turn()
+        loop = QEventLoop()
+        QTimer.singleShot(300, loop.quit)   # let the timer catch up after a blocking turn
+        loop.exec_()
+        timer.stop()
+        late.sort()
+        return time.perf_counter() - start, late
+
+    for label, run_turn in (
+        ("GUI thread (old)", lambda: controller._answer_turn(command)),
+        ("turn thread", lambda: _wait_in_event_loop(controller.handle_user_text(command))),
+    ):
+        secs, late = measure(run_turn)
+        print(f"  {label:>16}: {secs:5.2f}s | frame lateness p50 {late[len(late) // 2]:6.1f} ms  "
+              f"p99 {late[int(len(late) * 0.99)]:7.1f} ms  max {late[-1]:7.1f} ms  ({len(late)} frames)")
+    controller.cleanup()
+
+def _wait_in_event_loop(future):
+    """Keep the Qt event loop running until the future is done."""
+    from PyQt5.QtCore import QTimer, QEventLoop
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.timeout.connect(lambda: future.done() and loop.quit())
+    poll.start(10)
+    loop.exec_()
+    poll.stop()
+    return future.result()
+
 if __name__ == "__main__":
+    if "--bench-gui" in sys.argv:
+        _bench_event_loop()
+        sys.exit(0)
     main()